@@ -7,15 +7,17 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 load_dotenv(BASE_DIR / ".env")
 
-DB_PATH = BASE_DIR / "data" / "db" / "face_authentication_access.db"
+DB_PATH = Path(os.getenv("DB_PATH", str(BASE_DIR / "data" / "db" / "face_authentication_access.db")))
 os.makedirs(DB_PATH.parent, exist_ok=True)
 DATABASE_URL = f"sqlite:///{DB_PATH}"
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", str(BASE_DIR / "uploads")))
 
 JWT_SECRET = os.getenv("JWT_SECRET", "face-authentication-access-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(
     os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "720")
 )  
+VERIFICATION_TICKET_TTL_SECONDS = int(os.getenv("VERIFICATION_TICKET_TTL_SECONDS", "30"))
 
 CORS_ORIGINS = os.getenv(
     "CORS_ORIGINS",
@@ -24,5 +26,105 @@ CORS_ORIGINS = os.getenv(
 
 API_TITLE = os.getenv("API_TITLE", "Face Authentication Access API")
 API_VERSION = os.getenv("API_VERSION", "1.0.0")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 
-ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY", "")
\ No newline at end of file
+ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY", "")
+
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "true").lower() == "true"
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() == "true"
+
+INFERENCE_BATCH_ENABLED = os.getenv("INFERENCE_BATCH_ENABLED", "true").lower() == "true"
+INFERENCE_BATCH_MAX_SIZE = int(os.getenv("INFERENCE_BATCH_MAX_SIZE", "16"))
+INFERENCE_BATCH_MAX_WAIT_MS = float(os.getenv("INFERENCE_BATCH_MAX_WAIT_MS", "5"))
+INFERENCE_BATCH_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_BATCH_TIMEOUT_SECONDS", "30"))
+
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))
+INFERENCE_WORKER_MAX_RSS_MB = int(os.getenv("INFERENCE_WORKER_MAX_RSS_MB", "2048"))
+INFERENCE_WORKER_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_WORKER_TIMEOUT_SECONDS", "30"))
+
+INFERENCE_ENGINE = os.getenv("INFERENCE_ENGINE", "deepface").lower()
+STUB_DETECT_LATENCY_MS = os.getenv("STUB_DETECT_LATENCY_MS", "0")
+STUB_EMBED_LATENCY_MS = os.getenv("STUB_EMBED_LATENCY_MS", "0")
+STUB_SEED = int(os.getenv("STUB_SEED", "0"))
+ONNX_MODEL_DIR = BASE_DIR / "models" / "onnx"
+ONNX_RECOGNIZER_PATH = os.getenv("ONNX_RECOGNIZER_PATH", str(ONNX_MODEL_DIR / "arcface.onnx"))
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+
+RECOGNIZER_PRECISION = os.getenv("RECOGNIZER_PRECISION", "fp32").lower()
+ONNX_RECOGNIZER_INT8_PATH = os.getenv("ONNX_RECOGNIZER_INT8_PATH", str(ONNX_MODEL_DIR / "arcface.int8.onnx"))
+
+FACE_DETECTOR_CASCADE = [
+    stage.strip().lower() for stage in os.getenv("FACE_DETECTOR_CASCADE", "").split(",") if stage.strip()
+]
+FACE_CASCADE_MAX_SIDE = int(os.getenv("FACE_CASCADE_MAX_SIDE", "320"))
+FACE_CASCADE_MIN_FACE_RATIO = float(os.getenv("FACE_CASCADE_MIN_FACE_RATIO", "0.2"))
+FACE_CASCADE_REJECT_EMPTY = os.getenv("FACE_CASCADE_REJECT_EMPTY", "true").lower() == "true"
+FACE_CASCADE_HAAR_ACCEPT_SCORE = float(os.getenv("FACE_CASCADE_HAAR_ACCEPT_SCORE", "4.0"))
+FACE_CASCADE_YUNET_ACCEPT_SCORE = float(os.getenv("FACE_CASCADE_YUNET_ACCEPT_SCORE", "0.9"))
+FACE_CASCADE_YUNET_MODEL_PATH = os.getenv(
+    "FACE_CASCADE_YUNET_MODEL_PATH", str(BASE_DIR / "models" / "opencv" / "face_detection_yunet_2023mar.onnx")
+)
+
+DETECTION_MAX_SIDE = int(os.getenv("DETECTION_MAX_SIDE", "640"))
+
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", "25000000"))
+MAX_IMAGE_SIDE = int(os.getenv("MAX_IMAGE_SIDE", "8192"))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+FACE_QUALITY_GATE_ENABLED = os.getenv("FACE_QUALITY_GATE_ENABLED", "true").lower() == "true"
+FACE_QUALITY_MIN_SIZE = int(os.getenv("FACE_QUALITY_MIN_SIZE", "64"))
+FACE_QUALITY_MIN_SHARPNESS = float(os.getenv("FACE_QUALITY_MIN_SHARPNESS", "20"))
+FACE_QUALITY_MIN_BRIGHTNESS = float(os.getenv("FACE_QUALITY_MIN_BRIGHTNESS", "40"))
+FACE_QUALITY_MAX_BRIGHTNESS = float(os.getenv("FACE_QUALITY_MAX_BRIGHTNESS", "220"))
+FACE_QUALITY_MAX_YAW = float(os.getenv("FACE_QUALITY_MAX_YAW", "35"))
+FACE_QUALITY_MAX_ROLL = float(os.getenv("FACE_QUALITY_MAX_ROLL", "25"))
+
+GALLERY_INDEX_PRELOAD = os.getenv("GALLERY_INDEX_PRELOAD", "true").lower() == "true"
+GALLERY_INDEX_INITIAL_CAPACITY = int(os.getenv("GALLERY_INDEX_INITIAL_CAPACITY", "1024"))
+IDENTIFY_THRESHOLD = float(os.getenv("IDENTIFY_THRESHOLD", "0.70"))
+IDENTIFY_TOP_K = int(os.getenv("IDENTIFY_TOP_K", "5"))
+
+ANN_INDEX = os.getenv("ANN_INDEX", "none").lower()
+ANN_MIN_TEMPLATES = int(os.getenv("ANN_MIN_TEMPLATES", "20000"))
+ANN_NLIST = int(os.getenv("ANN_NLIST", "0"))
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "16"))
+ANN_RERANK = int(os.getenv("ANN_RERANK", "256"))
+ANN_PQ_M = int(os.getenv("ANN_PQ_M", "64"))
+ANN_TRAIN_SAMPLES = int(os.getenv("ANN_TRAIN_SAMPLES", "50000"))
+ANN_TRAIN_ITERATIONS = int(os.getenv("ANN_TRAIN_ITERATIONS", "10"))
+
+GALLERY_SNAPSHOT_ENABLED = os.getenv("GALLERY_SNAPSHOT_ENABLED", "true").lower() == "true"
+GALLERY_SNAPSHOT_DIR = Path(os.getenv("GALLERY_SNAPSHOT_DIR", str(DB_PATH.parent / "gallery")))
+GALLERY_SNAPSHOT_DTYPE = os.getenv("GALLERY_SNAPSHOT_DTYPE", "float32").lower()
+GALLERY_SNAPSHOT_COMPACT_BYTES = int(os.getenv("GALLERY_SNAPSHOT_COMPACT_BYTES", str(16 * 1024 * 1024)))
+GALLERY_SNAPSHOT_COMPACT_DEAD_RATIO = float(os.getenv("GALLERY_SNAPSHOT_COMPACT_DEAD_RATIO", "0.2"))
+
+EMBEDDING_STORAGE_DTYPE = os.getenv("EMBEDDING_STORAGE_DTYPE", "float32").lower()
+
+TEMPLATE_CACHE_ENABLED = os.getenv("TEMPLATE_CACHE_ENABLED", "true").lower() == "true"
+TEMPLATE_CACHE_MAX_USERS = int(os.getenv("TEMPLATE_CACHE_MAX_USERS", "10000"))
+TEMPLATE_CACHE_TTL_SECONDS = float(os.getenv("TEMPLATE_CACHE_TTL_SECONDS", "300"))
+
+FACE_TRACKING_ENABLED = os.getenv("FACE_TRACKING_ENABLED", "true").lower() == "true"
+FACE_TRACKING_MIN_IOU = float(os.getenv("FACE_TRACKING_MIN_IOU", "0.6"))
+FACE_TRACKING_MAX_SCALE_CHANGE = float(os.getenv("FACE_TRACKING_MAX_SCALE_CHANGE", "0.2"))
+FACE_TRACKING_MIN_APPEARANCE = float(os.getenv("FACE_TRACKING_MIN_APPEARANCE", "0.9"))
+FACE_TRACKING_REFRESH_SECONDS = float(os.getenv("FACE_TRACKING_REFRESH_SECONDS", "2.0"))
+FACE_TRACKING_IDLE_SECONDS = float(os.getenv("FACE_TRACKING_IDLE_SECONDS", "10"))
+FACE_TRACKING_MAX_SESSIONS = int(os.getenv("FACE_TRACKING_MAX_SESSIONS", "1000"))
+
+FRAME_CACHE_ENABLED = os.getenv("FRAME_CACHE_ENABLED", "true").lower() == "true"
+FRAME_CACHE_TTL_SECONDS = float(os.getenv("FRAME_CACHE_TTL_SECONDS", "5"))
+FRAME_CACHE_MAX_ENTRIES = int(os.getenv("FRAME_CACHE_MAX_ENTRIES", "512"))
+FRAME_CACHE_MAX_BYTES = int(os.getenv("FRAME_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+FRAME_CACHE_PERCEPTUAL = os.getenv("FRAME_CACHE_PERCEPTUAL", "false").lower() == "true"
+FRAME_CACHE_PERCEPTUAL_MAX_DISTANCE = int(os.getenv("FRAME_CACHE_PERCEPTUAL_MAX_DISTANCE", "4"))
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "x-profile").lower()
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "4"))
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(BASE_DIR / "data" / "profiles")))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))
@@ -1,7 +1,7 @@
 from contextlib import contextmanager
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from .config import DATABASE_URL
@@ -36,3 +36,22 @@ def db_session() -> Generator:
     finally:
         session.close()
 
+
+
+def add_missing_columns() -> None:
+    # create_all은 기존 테이블에 컬럼을 추가하지 않으므로, 기본값이 있는 새 컬럼은 여기서 ALTER TABLE로 붙인다.
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or column.server_default is None:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                default = column.server_default.arg
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type} "
+                    f"{'' if column.nullable else 'NOT NULL '}DEFAULT {default}"
+                ))
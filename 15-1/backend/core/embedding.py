@@ -0,0 +1,76 @@
+import json
+import struct
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from .config import EMBEDDING_STORAGE_DTYPE
+
+# 헤더: 매직(2) + 포맷 버전(1) + dtype 코드(1) + 차원(4, little-endian)
+HEADER = struct.Struct("<2sBBI")
+MAGIC = b"FE"
+FORMAT_VERSION = 1
+
+DTYPE_CODES = {"float32": 1, "float16": 2}
+CODE_DTYPES = {code: np.dtype(name).newbyteorder("<") for name, code in DTYPE_CODES.items()}
+
+
+class EmbeddingFormatError(ValueError):
+    pass
+
+
+def encode_embedding(embedding, dtype: str = EMBEDDING_STORAGE_DTYPE) -> bytes:
+    if dtype not in DTYPE_CODES:
+        raise ValueError(f"Unsupported embedding storage dtype: {dtype}")
+
+    vector = np.asarray(embedding, dtype=np.dtype(dtype).newbyteorder("<")).reshape(-1)
+    return HEADER.pack(MAGIC, FORMAT_VERSION, DTYPE_CODES[dtype], len(vector)) + vector.tobytes()
+
+
+def decode_embedding(data: bytes) -> np.ndarray:
+    if len(data) < HEADER.size:
+        raise EmbeddingFormatError(f"Embedding blob is too short: {len(data)} bytes")
+
+    magic, version, code, dim = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION or code not in CODE_DTYPES:
+        raise EmbeddingFormatError(f"Unknown embedding blob header: {magic!r} v{version} dtype={code}")
+
+    dtype = CODE_DTYPES[code]
+    if len(data) != HEADER.size + dim * dtype.itemsize:
+        raise EmbeddingFormatError(f"Embedding blob size does not match dim={dim}: {len(data)} bytes")
+
+    # float32는 복사 없이 원본 바이트를 그대로 본다(읽기 전용 배열).
+    vector = np.frombuffer(data, dtype=dtype, count=dim, offset=HEADER.size)
+    if dtype != np.float32:
+        vector = vector.astype(np.float32)
+    return vector
+
+
+def is_encoded_embedding(value) -> bool:
+    return isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:2]) == MAGIC
+
+
+class EmbeddingType(TypeDecorator):
+    # 예전 JSON 실수 리스트 행도 그대로 읽을 수 있어서, 마이그레이션 전/중에도 서비스가 동작한다.
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[bytes]:
+        if value is None or is_encoded_embedding(value):
+            return value
+        return encode_embedding(value)
+
+    def process_result_value(self, value, dialect) -> Optional[np.ndarray]:
+        if value is None:
+            return None
+        if isinstance(value, (bytearray, memoryview)):
+            value = bytes(value)
+        if is_encoded_embedding(value):
+            return decode_embedding(value)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        if isinstance(value, str):
+            value = json.loads(value)
+        return np.asarray(value, dtype=np.float32)
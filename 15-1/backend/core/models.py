@@ -1,9 +1,10 @@
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, String, UniqueConstraint, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint, Boolean
 from sqlalchemy.orm import relationship
 
 from core.database import Base
+from core.embedding import EmbeddingType
 
 
 def kst_now():
@@ -20,6 +21,8 @@ class User(Base):
     user_id = Column(String(100), nullable=False, unique=True, index=True)
     password_hash = Column(String(255), nullable=False)
     role = Column(String(20), default="user", nullable=False) 
+    # 얼굴 템플릿이 바뀔 때마다 증가시켜, 워커별 템플릿 캐시가 오래된 항목을 알아챈다.
+    face_version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=kst_now, nullable=False)
     
     face_embeddings = relationship("FaceEmbedding", back_populates="user", cascade="all, delete-orphan")
@@ -34,7 +37,7 @@ class FaceEmbedding(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    embedding = Column(JSON, nullable=False)  
+    embedding = Column(EmbeddingType, nullable=False)
     image_path = Column(String(500), nullable=True)
     created_at = Column(DateTime, default=kst_now, nullable=False)
     
@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -6,7 +7,7 @@ from fastapi import Depends, Header, HTTPException, status
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
-from core.config import ACCESS_TOKEN_EXPIRE_MINUTES, JWT_ALGORITHM, JWT_SECRET
+from core.config import ACCESS_TOKEN_EXPIRE_MINUTES, JWT_ALGORITHM, JWT_SECRET, VERIFICATION_TICKET_TTL_SECONDS
 from core.database import get_db
 from core.models import User
 
@@ -36,20 +37,54 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
-def get_current_user(
-    authorization: str = Header(None), db: Session = Depends(get_db)
-) -> User:
-    if not authorization or not authorization.lower().startswith("bearer "):
+def hash_frame(image_data: bytes) -> str:
+    return hashlib.sha256(image_data).hexdigest()
+
+
+def create_verification_ticket(user: User, image_data: bytes, similarity: float) -> str:
+    # 미리보기에서 통과한 프레임을 체크인 때 다시 추론하지 않도록, 사용자·프레임 해시·유사도를 서명해 둔다.
+    return create_access_token(
+        {
+            "sub": user.user_id,
+            "typ": "face_ticket",
+            "frame": hash_frame(image_data),
+            "sim": round(float(similarity), 6),
+            "ver": user.face_version,
+        },
+        expires_delta=timedelta(seconds=VERIFICATION_TICKET_TTL_SECONDS),
+    )
+
+
+def verify_verification_ticket(ticket: str, user: User, image_data: bytes) -> Optional[float]:
+    try:
+        payload = jwt.decode(ticket, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except JWTError:
+        return None
+
+    # 다른 사용자/다른 프레임이거나 그 사이 얼굴 템플릿이 바뀌었다면 티켓을 쓰지 않는다.
+    if (
+        payload.get("typ") != "face_ticket"
+        or payload.get("sub") != user.user_id
+        or payload.get("frame") != hash_frame(image_data)
+        or payload.get("ver") != user.face_version
+    ):
+        return None
+
+    similarity = payload.get("sim")
+    return float(similarity) if isinstance(similarity, (int, float)) else None
+
+
+def get_user_from_token(token: Optional[str], db: Session) -> User:
+    if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
         )
 
-    token = authorization.split(" ")[1]
-
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         user_id: Optional[str] = payload.get("sub")
-        if user_id is None:
+        # 검증 티켓처럼 용도가 지정된 토큰은 로그인 토큰으로 받지 않는다.
+        if user_id is None or payload.get("typ") is not None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token payload",
@@ -65,3 +100,23 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User no longer exists"
         )
     return user
+
+
+def get_current_user(
+    authorization: str = Header(None), db: Session = Depends(get_db)
+) -> User:
+    if not authorization or not authorization.lower().startswith("bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
+        )
+
+    return get_user_from_token(authorization.split(" ")[1], db)
+
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 권한이 필요합니다.",
+        )
+    return current_user
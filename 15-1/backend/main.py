@@ -1,9 +1,28 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import logging
+
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
 
-from core.config import API_TITLE, API_VERSION, CORS_ORIGINS
-from core.database import Base, engine
+from core.config import (
+    API_TITLE,
+    API_VERSION,
+    CORS_ORIGINS,
+    GALLERY_INDEX_PRELOAD,
+    INFERENCE_WORKERS,
+    LOG_LEVEL,
+    METRICS_ENABLED,
+    MODEL_PRELOAD,
+)
+from core.database import Base, SessionLocal, add_missing_columns, engine
+from services.gallery_index import start_gallery_index_build
+from services.inference_workers import get_worker_pool, start_worker_pool, stop_worker_pool
+from services.instrumentation import MetricsMiddleware, instrument_database, render_metrics
+from services.metrics import PROMETHEUS_CONTENT_TYPE
+from services.model_manager import get_model_status, start_model_preload
+from services.request_profiler import ProfilingMiddleware
 
 from routers.auth import router as auth_router
 from routers.face import router as face_router
@@ -11,9 +30,27 @@ from routers.access import router as access_router
 from routers.admin import router as admin_router
 from routers.organization import router as organization_router
 
+# uvicorn은 자기 로거만 설정하므로, 서비스 모듈의 로그(인덱스 빌드, 모델 로드 실패 등)가 보이도록 루트 로거를 설정한다.
+logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
 Base.metadata.create_all(bind=engine)
+add_missing_columns()
+instrument_database(engine, SessionLocal)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if INFERENCE_WORKERS > 0:
+        start_worker_pool()
+    elif MODEL_PRELOAD:
+        start_model_preload()
+    if GALLERY_INDEX_PRELOAD:
+        start_gallery_index_build()
+    yield
+    stop_worker_pool()
 
-app = FastAPI(title=API_TITLE, version=API_VERSION)
+
+app = FastAPI(title=API_TITLE, version=API_VERSION, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +59,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 나중에 추가한 미들웨어가 바깥쪽에 놓이므로, 지연 시간 지표에는 프로파일링 오버헤드도 포함된다.
+app.add_middleware(ProfilingMiddleware)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth_router)
 app.include_router(face_router)
@@ -34,5 +75,22 @@ async def root():
     return {"message": "Face Authentication Access API is running"}
 
 
+@app.get("/ready")
+async def ready():
+    pool = get_worker_pool()
+    model_status = pool.get_status() if pool is not None else get_model_status()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if model_status["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=model_status,
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    if not METRICS_ENABLED:
+        return PlainTextResponse("", status_code=status.HTTP_404_NOT_FOUND)
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
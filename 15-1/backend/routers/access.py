@@ -1,58 +1,68 @@
-import base64
 from datetime import datetime, timezone, timedelta, time as dt_time
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-import numpy as np
 
 from core.database import get_db
-from core.models import User, FaceEmbedding, Access, OrganizationMember
-from core.security import get_current_user
+from core.config import IDENTIFY_THRESHOLD, IDENTIFY_TOP_K
+from core.models import User, Access, OrganizationMember
+from core.security import get_current_admin, get_current_user, verify_verification_ticket
 from schemas.access import (
     AccessCheckInRequest,
+    AccessIdentifyRequest,
+    AccessIdentifyResponse,
     AccessResponse,
     AccessListResponse,
     AccessStatsResponse,
     AccessStatsItem,
+    IdentifyCandidate,
 )
-from services.face_recognition import extract_face_embedding, verify_face
+from services.face_pipeline import run_face_pipeline
+from services.face_quality import QUALITY_MESSAGES
+from services.face_recognition import verify_face
+from services.gallery_index import get_gallery_index
+from services.image_upload import ImageUpload, image_upload, image_upload_openapi
+from services.template_cache import get_user_templates
 
 router = APIRouter(prefix="/access", tags=["access"])
 
 
-@router.post("/check-in", response_model=AccessResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/check-in",
+    response_model=AccessResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=image_upload_openapi(AccessCheckInRequest),
+)
 def check_in(
-    payload: AccessCheckInRequest,
     current_user: User = Depends(get_current_user),
+    upload: ImageUpload = Depends(image_upload(AccessCheckInRequest)),
     db: Session = Depends(get_db),
 ):
-    try:
-        image_data = base64.b64decode(payload.image)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="잘못된 Base64 이미지 형식입니다.",
-        )
+    payload = upload.payload
+    image_data = upload.get_image()
     
-    stored_embeddings = db.query(FaceEmbedding).filter(
-        FaceEmbedding.user_id == current_user.id
-    ).all()
+    templates = get_user_templates(db, current_user)
     
-    if len(stored_embeddings) == 0:
+    if len(templates) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="등록된 얼굴 데이터가 없습니다. 먼저 얼굴을 등록해주세요.",
         )
     
-    current_embedding = extract_face_embedding(image_data)
+    # 미리보기에서 이미 통과한 같은 프레임이면 티켓의 유사도를 그대로 쓰고 추론을 건너뛴다.
+    similarity = verify_verification_ticket(payload.ticket, current_user, image_data) if payload.ticket else None
+    if similarity is not None and similarity >= 0.70:
+        return _record_access(db, current_user, similarity)
+    
+    result = run_face_pipeline(image_data)
+    current_embedding = result.embedding
     
     if current_embedding is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="얼굴을 감지할 수 없습니다. 카메라를 정면으로 바라보세요.",
+            detail=QUALITY_MESSAGES.get(result.quality_reason, "얼굴을 감지할 수 없습니다. 카메라를 정면으로 바라보세요."),
         )
     
-    stored_embeddings_list = [np.array(emb.embedding) for emb in stored_embeddings]
-    verified, similarity = verify_face(current_embedding, stored_embeddings_list, threshold=0.70)
+    verified, similarity = verify_face(current_embedding, templates, threshold=0.70)
     
     if not verified:
         raise HTTPException(
@@ -60,13 +70,17 @@ def check_in(
             detail=f"얼굴 인증에 실패했습니다. (유사도: {similarity:.2f})",
         )
     
+    return _record_access(db, current_user, similarity)
+
+
+def _record_access(db: Session, user: User, similarity: float) -> AccessResponse:
     org_member = db.query(OrganizationMember).filter(
-        OrganizationMember.user_id == current_user.id
+        OrganizationMember.user_id == user.id
     ).first()
     
     kst = timezone(timedelta(hours=9))
     access = Access(
-        user_id=current_user.id,
+        user_id=user.id,
         organization_id=org_member.organization_id if org_member else None,
         check_in_time=datetime.now(kst),
         similarity=f"{similarity:.4f}",
@@ -79,8 +93,8 @@ def check_in(
     return AccessResponse(
         id=access.id,
         userId=access.user_id,
-        userName=current_user.name,
-        organizationType=current_user.organization_type,
+        userName=user.name,
+        organizationType=user.organization_type,
         checkInTime=access.check_in_time.isoformat(),
         similarity=float(similarity),
         status="checked_in",
@@ -88,6 +102,52 @@ def check_in(
     )
 
 
+@router.post("/identify", response_model=AccessIdentifyResponse, openapi_extra=image_upload_openapi(AccessIdentifyRequest))
+def identify(
+    current_admin: User = Depends(get_current_admin),
+    upload: ImageUpload = Depends(image_upload(AccessIdentifyRequest)),
+    db: Session = Depends(get_db),
+):
+    # 공용 출입 단말(관리자 계정으로 로그인)에서 얼굴만으로 전체 등록 사용자 중 본인을 찾는다.
+    payload = upload.payload
+    image_data = upload.get_image()
+    
+    result = run_face_pipeline(image_data)
+    current_embedding = result.embedding
+    
+    if current_embedding is None:
+        return AccessIdentifyResponse(detected=result.detected, identified=False, candidates=[])
+    
+    matches = get_gallery_index().search(current_embedding, k=payload.topK or IDENTIFY_TOP_K)
+    users = {
+        user.id: user
+        for user in db.query(User).filter(User.id.in_([match.user_id for match in matches])).all()
+    }
+    matches = [match for match in matches if match.user_id in users]
+    
+    candidates = [
+        IdentifyCandidate(
+            userId=match.user_id,
+            userName=users[match.user_id].name,
+            organizationType=users[match.user_id].organization_type,
+            similarity=match.similarity,
+        )
+        for match in matches
+    ]
+    
+    identified = bool(matches) and matches[0].similarity >= IDENTIFY_THRESHOLD
+    access = None
+    if identified and payload.checkIn:
+        access = _record_access(db, users[matches[0].user_id], matches[0].similarity)
+    
+    return AccessIdentifyResponse(
+        detected=True,
+        identified=identified,
+        candidates=candidates,
+        access=access,
+    )
+
+
 @router.get("/history", response_model=AccessListResponse)
 def get_access_history(
     current_user: User = Depends(get_current_user),
@@ -1,15 +1,14 @@
-import base64
 import os
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, PlainTextResponse
 from sqlalchemy.orm import Session
-import numpy as np
 
 from core.database import get_db
 from core.models import User, FaceEmbedding, AdminLoginLog, OrganizationMember, Access, Organization
 from datetime import datetime, date, time, timezone, timedelta
 from core.security import (
     create_access_token,
-    get_current_user,
+    get_current_admin,
     hash_password,
     verify_password,
 )
@@ -24,28 +23,28 @@ from schemas.admin import (
     AdminAttendanceHistoryResponse,
     AdminAttendanceStatsResponse,
     AdminAttendanceStatsItem,
+    AdminProfileResponse,
 )
-from services.face_recognition import extract_face_embedding, verify_face
+from services.face_pipeline import get_batcher_stats, get_detector_cascade_stats, run_face_pipeline
+from services.face_quality import QUALITY_MESSAGES
+from services.face_recognition import verify_face
+from services.face_tracker import get_face_tracker
+from services.frame_cache import get_frame_cache
+from services.gallery_index import get_gallery_index
+from services.image_upload import ImageUpload, image_upload, image_upload_openapi
+from services.request_profiler import get_profile_store, to_folded
+from services.template_cache import get_template_cache, get_user_templates, invalidate_user_templates
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
-def get_current_admin(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    if current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="관리자 권한이 필요합니다.",
-        )
-    return current_user
-
-
-@router.post("/login", response_model=TokenResponse)
+# 로그인은 비밀번호가 URL(쿼리 문자열)에 남지 않도록 원본 바이너리 본문은 받지 않는다.
+@router.post("/login", response_model=TokenResponse, openapi_extra=image_upload_openapi(AdminLoginRequest, raw=False))
 def admin_login(
-    payload: AdminLoginRequest,
+    upload: ImageUpload = Depends(image_upload(AdminLoginRequest, raw=False)),
     request: Request = None,
     db: Session = Depends(get_db),
 ):
+    payload = upload.payload
     user = db.query(User).filter(User.user_id == payload.userId).first()
     if not user or not verify_password(payload.password, user.password_hash):
         if user:
@@ -73,35 +72,27 @@ def admin_login(
     face_verified = "false"
     similarity_value = None
     
-    stored_embeddings = db.query(FaceEmbedding).filter(
-        FaceEmbedding.user_id == user.id
-    ).all()
+    templates = get_user_templates(db, user)
     
-    if len(stored_embeddings) > 0:
-        if not payload.image:
+    if len(templates) > 0:
+        if not upload.has_image:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="얼굴 인식이 필요합니다. 얼굴 이미지를 제공해주세요.",
             )
         
-        try:
-            image_data = base64.b64decode(payload.image)
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="잘못된 Base64 이미지 형식입니다.",
-            )
+        image_data = upload.get_image()
         
-        current_embedding = extract_face_embedding(image_data)
+        result = run_face_pipeline(image_data)
+        current_embedding = result.embedding
         
         if current_embedding is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="얼굴을 감지할 수 없습니다. 카메라를 정면으로 바라보세요.",
+                detail=QUALITY_MESSAGES.get(result.quality_reason, "얼굴을 감지할 수 없습니다. 카메라를 정면으로 바라보세요."),
             )
         
-        stored_embeddings_list = [np.array(emb.embedding) for emb in stored_embeddings]
-        verified, similarity = verify_face(current_embedding, stored_embeddings_list, threshold=0.70)
+        verified, similarity = verify_face(current_embedding, templates, threshold=0.70)
         
         if not verified:
             login_log = AdminLoginLog(
@@ -150,11 +141,12 @@ def admin_login(
     )
 
 
-@router.post("/face-preview", response_model=AdminFacePreviewResponse)
+@router.post("/face-preview", response_model=AdminFacePreviewResponse, openapi_extra=image_upload_openapi(AdminFacePreviewRequest))
 def admin_face_preview(
-    payload: AdminFacePreviewRequest,
+    upload: ImageUpload = Depends(image_upload(AdminFacePreviewRequest)),
     db: Session = Depends(get_db),
 ):
+    payload = upload.payload
     user = db.query(User).filter(User.user_id == payload.userId).first()
     if not user:
         raise HTTPException(
@@ -168,34 +160,26 @@ def admin_face_preview(
             detail="관리자 계정이 아닙니다.",
         )
 
-    stored_embeddings = db.query(FaceEmbedding).filter(
-        FaceEmbedding.user_id == user.id
-    ).all()
+    templates = get_user_templates(db, user)
 
-    if len(stored_embeddings) == 0:
+    if len(templates) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="등록된 얼굴 데이터가 없습니다. 먼저 얼굴을 등록해주세요.",
         )
 
-    try:
-        image_data = base64.b64decode(payload.image)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="잘못된 Base64 이미지 형식입니다.",
-        )
+    image_data = upload.get_image()
 
-    current_embedding = extract_face_embedding(image_data)
+    result = run_face_pipeline(image_data)
+    current_embedding = result.embedding
 
     if current_embedding is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="얼굴을 감지할 수 없습니다. 카메라를 정면으로 바라보세요.",
+            detail=QUALITY_MESSAGES.get(result.quality_reason, "얼굴을 감지할 수 없습니다. 카메라를 정면으로 바라보세요."),
         )
 
-    stored_embeddings_list = [np.array(emb.embedding) for emb in stored_embeddings]
-    verified, similarity = verify_face(current_embedding, stored_embeddings_list, threshold=0.70)
+    verified, similarity = verify_face(current_embedding, templates, threshold=0.70)
 
     return AdminFacePreviewResponse(
         similarity=float(similarity),
@@ -215,6 +199,45 @@ def admin_me(current_admin: User = Depends(get_current_admin)):
     )
 
 
+@router.get("/inference-stats")
+def get_inference_stats(current_admin: User = Depends(get_current_admin)):
+    return {
+        "batching": get_batcher_stats(),
+        "detectorCascade": get_detector_cascade_stats(),
+        "galleryIndex": get_gallery_index(build=False).get_stats(),
+        "templateCache": get_template_cache().get_stats(),
+        "faceTracking": get_face_tracker().get_stats(),
+        "frameCache": get_frame_cache().get_stats(),
+    }
+
+
+@router.get("/profiles", response_model=list[AdminProfileResponse])
+def list_profiles(current_admin: User = Depends(get_current_admin)):
+    return get_profile_store().list()
+
+
+@router.get("/profiles/{profile_id}")
+def download_profile(
+    profile_id: str,
+    format: str = Query("json", pattern="^(json|folded)$"),
+    current_admin: User = Depends(get_current_admin),
+):
+    store = get_profile_store()
+    path = store.path(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="프로파일을 찾을 수 없습니다.",
+        )
+
+    if format == "folded":
+        return PlainTextResponse(
+            to_folded(store.load(profile_id) or {}),
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'},
+        )
+    return FileResponse(path, media_type="application/json", filename=f"{profile_id}.json")
+
+
 @router.get("/dashboard-stats", response_model=AdminDashboardStatsResponse)
 def get_admin_dashboard_stats(
     current_admin: User = Depends(get_current_admin),
@@ -295,6 +318,8 @@ def delete_user(
         
     db.delete(user)
     db.commit()
+    get_gallery_index(build=False).remove_user(user_id)
+    get_template_cache().invalidate(user_id)
     return None
 
 
@@ -325,7 +350,9 @@ def delete_user_face_data(
                 pass
     
     db.query(FaceEmbedding).filter(FaceEmbedding.user_id == user.id).delete()
+    invalidate_user_templates(user)
     db.commit()
+    get_gallery_index(build=False).remove_user(user_id)
     return None
 
 
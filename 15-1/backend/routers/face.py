@@ -1,11 +1,14 @@
-import base64
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-import numpy as np
 
-from core.database import get_db
+from core.config import FACE_TRACKING_ENABLED
+from core.database import SessionLocal, get_db
 from core.models import User, FaceEmbedding
-from core.security import get_current_user
+from core.security import create_verification_ticket, get_current_user, get_user_from_token
 from schemas.face import (
     FaceRegisterRequest,
     FaceVerifyRequest,
@@ -16,87 +19,85 @@ from schemas.face import (
     FaceVerifyPreviewRequest,
     FaceVerifyPreviewResponse,
 )
-from services.face_recognition import (
-    extract_face_embedding,
-    verify_face,
-    save_face_image,
-    detect_face,
-)
+from services.face_pipeline import FacePipelineResult, run_face_pipeline
+from services.face_quality import QUALITY_MESSAGES, QUALITY_OK
+from services.face_recognition import verify_face, save_face_image
+from services.face_tracker import get_face_tracker
+from services.frame_stream import LatestFrameSlot
+from services.gallery_index import get_gallery_index
+from services.image_upload import ImageUpload, image_upload, image_upload_openapi
+from services.template_cache import get_user_templates, invalidate_user_templates
 
 router = APIRouter(prefix="/face", tags=["face"])
 
 
-@router.post("/detect", response_model=FaceDetectResponse)
+@router.post("/detect", response_model=FaceDetectResponse, openapi_extra=image_upload_openapi(FaceDetectRequest))
 def detect_face_endpoint(
-    payload: FaceDetectRequest,
     current_user: User = Depends(get_current_user),
+    upload: ImageUpload = Depends(image_upload(FaceDetectRequest)),
 ):
     try:
-        image_data = base64.b64decode(payload.image)
+        image_data = upload.get_image()
     except Exception:
         return FaceDetectResponse(detected=False)
     
-    facial_area = detect_face(image_data)
+    result = run_face_pipeline(image_data, embed=False)
     
-    if facial_area:
-        return FaceDetectResponse(
-            detected=True,
-            x=facial_area["x"],
-            y=facial_area["y"],
-            w=facial_area["w"],
-            h=facial_area["h"]
-        )
+    if result.detected:
+        return FaceDetectResponse(detected=True, **result.bbox)
     else:
         return FaceDetectResponse(detected=False)
 
 
-@router.post("/detect/public", response_model=FaceDetectResponse)
-def detect_face_public_endpoint(payload: FaceDetectRequest):
+@router.post("/detect/public", response_model=FaceDetectResponse, openapi_extra=image_upload_openapi(FaceDetectRequest))
+def detect_face_public_endpoint(upload: ImageUpload = Depends(image_upload(FaceDetectRequest))):
     try:
-        image_data = base64.b64decode(payload.image)
+        image_data = upload.get_image()
     except Exception:
         return FaceDetectResponse(detected=False)
     
-    facial_area = detect_face(image_data)
+    result = run_face_pipeline(image_data, embed=False)
     
-    if facial_area:
-        return FaceDetectResponse(
-            detected=True,
-            x=facial_area["x"],
-            y=facial_area["y"],
-            w=facial_area["w"],
-            h=facial_area["h"]
-        )
+    if result.detected:
+        return FaceDetectResponse(detected=True, **result.bbox)
     else:
         return FaceDetectResponse(detected=False)
 
 
 
-@router.post("/register", response_model=FaceEmbeddingResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=FaceEmbeddingResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=image_upload_openapi(FaceRegisterRequest),
+)
 def register_face(
-    file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
+    upload: ImageUpload = Depends(image_upload(FaceRegisterRequest)),
     db: Session = Depends(get_db),
 ):
-    image_data = file.file.read()
+    image_data = upload.get_image()
     
-    embedding = extract_face_embedding(image_data)
+    result = run_face_pipeline(image_data)
+    embedding = result.embedding
     if embedding is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="얼굴을 감지할 수 없습니다. 다른 사진을 시도해주세요.",
+            detail=QUALITY_MESSAGES.get(result.quality_reason, "얼굴을 감지할 수 없습니다. 다른 사진을 시도해주세요."),
         )
     
     image_path = save_face_image(current_user.id, image_data)
     
     face_embedding = FaceEmbedding(
         user_id=current_user.id,
-        embedding=embedding.tolist(),
+        embedding=embedding,
         image_path=image_path,
     )
     db.add(face_embedding)
+    invalidate_user_templates(current_user)
     db.commit()
     db.refresh(face_embedding)
+    get_gallery_index(build=False).add(face_embedding.id, face_embedding.user_id, embedding)
     
     return FaceEmbeddingResponse(
         id=face_embedding.id,
@@ -106,37 +107,39 @@ def register_face(
     )
 
 
-@router.post("/register-base64", response_model=FaceEmbeddingResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register-base64",
+    response_model=FaceEmbeddingResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=image_upload_openapi(FaceRegisterRequest),
+)
 def register_face_base64(
-    payload: FaceRegisterRequest,
     current_user: User = Depends(get_current_user),
+    upload: ImageUpload = Depends(image_upload(FaceRegisterRequest)),
     db: Session = Depends(get_db),
 ):
-    try:
-        image_data = base64.b64decode(payload.image)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="잘못된 Base64 이미지 형식입니다.",
-        )
+    image_data = upload.get_image()
     
-    embedding = extract_face_embedding(image_data)
+    result = run_face_pipeline(image_data)
+    embedding = result.embedding
     if embedding is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="얼굴을 감지할 수 없습니다. 다른 사진을 시도해주세요.",
+            detail=QUALITY_MESSAGES.get(result.quality_reason, "얼굴을 감지할 수 없습니다. 다른 사진을 시도해주세요."),
         )
     
     image_path = save_face_image(current_user.id, image_data)
     
     face_embedding = FaceEmbedding(
         user_id=current_user.id,
-        embedding=embedding.tolist(),
+        embedding=embedding,
         image_path=image_path,
     )
     db.add(face_embedding)
+    invalidate_user_templates(current_user)
     db.commit()
     db.refresh(face_embedding)
+    get_gallery_index(build=False).add(face_embedding.id, face_embedding.user_id, embedding)
     
     return FaceEmbeddingResponse(
         id=face_embedding.id,
@@ -146,33 +149,32 @@ def register_face_base64(
     )
 
 
-@router.post("/verify", response_model=FaceVerifyResponse)
+@router.post("/verify", response_model=FaceVerifyResponse, openapi_extra=image_upload_openapi(FaceVerifyRequest))
 def verify_face_endpoint(
-    file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
+    upload: ImageUpload = Depends(image_upload(FaceVerifyRequest)),
     db: Session = Depends(get_db),
 ):
-    stored_embeddings = db.query(FaceEmbedding).filter(
-        FaceEmbedding.user_id == current_user.id
-    ).all()
+    templates = get_user_templates(db, current_user)
     
-    if len(stored_embeddings) == 0:
+    if len(templates) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="등록된 얼굴 데이터가 없습니다. 먼저 얼굴을 등록해주세요.",
         )
     
-    image_data = file.file.read()
-    embedding = extract_face_embedding(image_data)
+    image_data = upload.get_image()
+    
+    result = run_face_pipeline(image_data)
+    embedding = result.embedding
     
     if embedding is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="얼굴을 감지할 수 없습니다. 다른 사진을 시도해주세요.",
+            detail=QUALITY_MESSAGES.get(result.quality_reason, "얼굴을 감지할 수 없습니다. 다른 사진을 시도해주세요."),
         )
     
-    stored_embeddings_list = [np.array(emb.embedding) for emb in stored_embeddings]
-    verified, similarity = verify_face(embedding, stored_embeddings_list, threshold=0.70)
+    verified, similarity = verify_face(embedding, templates, threshold=0.70)
     
     return FaceVerifyResponse(
         verified=verified,
@@ -181,40 +183,32 @@ def verify_face_endpoint(
     )
 
 
-@router.post("/verify-base64", response_model=FaceVerifyResponse)
+@router.post("/verify-base64", response_model=FaceVerifyResponse, openapi_extra=image_upload_openapi(FaceVerifyRequest))
 def verify_face_base64(
-    payload: FaceVerifyRequest,
     current_user: User = Depends(get_current_user),
+    upload: ImageUpload = Depends(image_upload(FaceVerifyRequest)),
     db: Session = Depends(get_db),
 ):
-    stored_embeddings = db.query(FaceEmbedding).filter(
-        FaceEmbedding.user_id == current_user.id
-    ).all()
+    templates = get_user_templates(db, current_user)
     
-    if len(stored_embeddings) == 0:
+    if len(templates) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="등록된 얼굴 데이터가 없습니다. 먼저 얼굴을 등록해주세요.",
         )
     
-    try:
-        image_data = base64.b64decode(payload.image)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="잘못된 Base64 이미지 형식입니다.",
-        )
+    image_data = upload.get_image()
     
-    embedding = extract_face_embedding(image_data)
+    result = run_face_pipeline(image_data)
+    embedding = result.embedding
     
     if embedding is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="얼굴을 감지할 수 없습니다. 다른 사진을 시도해주세요.",
+            detail=QUALITY_MESSAGES.get(result.quality_reason, "얼굴을 감지할 수 없습니다. 다른 사진을 시도해주세요."),
         )
     
-    stored_embeddings_list = [np.array(emb.embedding) for emb in stored_embeddings]
-    verified, similarity = verify_face(embedding, stored_embeddings_list, threshold=0.70)
+    verified, similarity = verify_face(embedding, templates, threshold=0.70)
     
     return FaceVerifyResponse(
         verified=verified,
@@ -223,49 +217,157 @@ def verify_face_base64(
     )
 
 
-@router.post("/verify-preview", response_model=FaceVerifyPreviewResponse)
-def verify_face_preview(
-    payload: FaceVerifyPreviewRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    stored_embeddings = db.query(FaceEmbedding).filter(
-        FaceEmbedding.user_id == current_user.id
-    ).all()
+def _preview_without_embedding(result: FacePipelineResult) -> FaceVerifyPreviewResponse:
+    # 얼굴은 찾았지만 품질 기준을 통과하지 못한 경우 사유를 함께 내려준다.
+    return FaceVerifyPreviewResponse(
+        detected=result.detected,
+        similarity=0.0,
+        verified=False,
+        qualityReason=result.quality_reason,
+        qualityMessage=QUALITY_MESSAGES.get(result.quality_reason),
+        **result.bbox,
+    )
+
+
+def _face_box(result: FacePipelineResult):
+    return tuple(result.facial_area[key] for key in ("x", "y", "w", "h"))
+
+
+def _preview_frame(db: Session, user: User, image_data: bytes, track_key=None) -> FaceVerifyPreviewResponse:
+    templates = get_user_templates(db, user)
     
-    if len(stored_embeddings) == 0:
+    if len(templates) == 0:
         return FaceVerifyPreviewResponse(
             detected=False,
             similarity=0.0,
             verified=False
         )
     
-    try:
-        image_data = base64.b64decode(payload.image)
-    except Exception:
-        return FaceVerifyPreviewResponse(
-            detected=False,
-            similarity=0.0,
-            verified=False
-        )
+    tracker = get_face_tracker() if FACE_TRACKING_ENABLED and track_key is not None else None
+    probe = None
+    if tracker is not None:
+        # 검출만 먼저 해 보고, 직전에 임베딩한 얼굴이 같은 자리에 그대로 있으면 그때의 유사도를 돌려준다.
+        probe = run_face_pipeline(image_data, embed=False)
+        if not probe.detected:
+            tracker.lose(track_key)
+            return _preview_without_embedding(probe)
+        if probe.quality_reason in (None, QUALITY_OK):
+            cached = tracker.lookup(track_key, _face_box(probe), probe.face, user.face_version)
+            if cached is not None:
+                # 이번 프레임으로 유사도를 계산하지 않았으므로 체크인 티켓은 발급하지 않는다.
+                return cached.model_copy(update={**probe.bbox, "ticket": None, "tracked": True})
+        else:
+            probe = None
+
+    # 추적이 끊기면 등록/체크인과 같은 조건(원본 해상도 디코딩, 전체 검출기, 원본 좌표 품질 검사)으로 다시 계산한다.
+    # 여기서 나온 유사도가 체크인 티켓에 서명되므로 검출 전용 결과의 얼굴을 임베딩하면 안 된다.
+    result = run_face_pipeline(image_data)
     
-    embedding = extract_face_embedding(image_data)
+    if result.embedding is None:
+        if tracker is not None:
+            tracker.drop(track_key)
+        return _preview_without_embedding(result)
     
-    if embedding is None:
+    verified, similarity = verify_face(result.embedding, templates, threshold=0.70)
+    
+    response = FaceVerifyPreviewResponse(
+        detected=True,
+        similarity=float(similarity),
+        verified=verified,
+        qualityReason=result.quality_reason,
+        ticket=create_verification_ticket(user, image_data, similarity) if verified else None,
+        **result.bbox,
+    )
+    if probe is not None:
+        tracker.update(track_key, _face_box(probe), probe.face, user.face_version, response)
+    return response
+
+
+@router.post(
+    "/verify-preview",
+    response_model=FaceVerifyPreviewResponse,
+    openapi_extra=image_upload_openapi(FaceVerifyPreviewRequest),
+)
+def verify_face_preview(
+    current_user: User = Depends(get_current_user),
+    upload: ImageUpload = Depends(image_upload(FaceVerifyPreviewRequest)),
+    db: Session = Depends(get_db),
+    device_id: Optional[str] = Header(None, alias="X-Device-Id"),
+):
+    try:
+        image_data = upload.get_image()
+    except Exception:
         return FaceVerifyPreviewResponse(
             detected=False,
             similarity=0.0,
             verified=False
         )
     
-    stored_embeddings_list = [np.array(emb.embedding) for emb in stored_embeddings]
-    verified, similarity = verify_face(embedding, stored_embeddings_list, threshold=0.70)
-    
-    return FaceVerifyPreviewResponse(
-        detected=True,
-        similarity=float(similarity),
-        verified=verified
-    )
+    # 한 사용자가 여러 카메라를 쓸 수 있으므로 단말 ID가 있으면 추적 세션을 따로 둔다.
+    return _preview_frame(db, current_user, image_data, track_key=("user", current_user.id, device_id))
+
+
+def _stream_preview(user_id: int, image_data: bytes, track_key):
+    # 프레임마다 짧은 세션을 열어 사용자 행(face_version)만 다시 읽고, 템플릿은 캐시에서 가져온다.
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        if user is None:
+            return None
+        return _preview_frame(db, user, image_data, track_key=track_key)
+
+
+@router.websocket("/stream")
+async def face_stream(websocket: WebSocket, token: Optional[str] = Query(None)):
+    # 브라우저 WebSocket은 헤더를 붙일 수 없으므로 연결 시 한 번 ?token= 으로 인증한다.
+    with SessionLocal() as db:
+        try:
+            user_id = get_user_from_token(token, db).id
+        except HTTPException as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+            return
+
+    await websocket.accept()
+    await websocket.send_json({"type": "ready"})
+
+    slot = LatestFrameSlot()
+    track_key = ("stream", id(slot))
+
+    async def receive_frames():
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                # 바이너리 JPEG 프레임만 받는다. 텍스트 메시지는 무시한다.
+                if message.get("bytes"):
+                    slot.put(message["bytes"])
+        finally:
+            slot.close()
+
+    receiver = asyncio.create_task(receive_frames())
+    try:
+        while True:
+            frame = await slot.get()
+            if frame is None:
+                break
+
+            sequence, image_data = frame
+            response = await run_in_threadpool(_stream_preview, user_id, image_data, track_key)
+            if response is None:
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="User no longer exists")
+                break
+
+            await websocket.send_json({
+                "type": "preview",
+                "frame": sequence,
+                **slot.get_stats(),
+                **response.model_dump(),
+            })
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        get_face_tracker().drop(track_key)
 
 
 @router.get("/embeddings", response_model=list[FaceEmbeddingResponse])
@@ -314,6 +416,8 @@ def delete_face_embedding(
             pass
     
     db.delete(embedding)
+    invalidate_user_templates(current_user)
     db.commit()
+    get_gallery_index(build=False).remove(embedding_id)
     
     return None
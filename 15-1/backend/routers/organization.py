@@ -4,7 +4,7 @@ from datetime import datetime, timezone, timedelta
 
 from core.database import get_db
 from core.models import User, Organization, OrganizationMember, Access
-from core.security import get_current_user
+from core.security import get_current_admin, get_current_user
 from schemas.organization import (
     OrganizationCreate,
     OrganizationResponse,
@@ -18,15 +18,6 @@ router = APIRouter(prefix="/organizations", tags=["organizations"])
 users_router = APIRouter(prefix="/users", tags=["users"])
 
 
-def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="관리자 권한이 필요합니다.",
-        )
-    return current_user
-
-
 @router.post("", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED)
 def create_organization(
     payload: OrganizationCreate,
@@ -5,6 +5,7 @@ from pydantic import BaseModel, Field
 
 class AccessCheckInRequest(BaseModel):
     image: str = Field(..., description="Base64 encoded image")
+    ticket: Optional[str] = Field(None, description="Verification ticket issued by /face/verify-preview")
 
 
 class AccessResponse(BaseModel):
@@ -21,6 +22,26 @@ class AccessResponse(BaseModel):
         from_attributes = True
 
 
+class AccessIdentifyRequest(BaseModel):
+    image: str = Field(..., description="Base64 encoded image")
+    topK: Optional[int] = Field(None, ge=1, le=50)
+    checkIn: bool = True
+
+
+class IdentifyCandidate(BaseModel):
+    userId: int
+    userName: str
+    organizationType: str
+    similarity: float
+
+
+class AccessIdentifyResponse(BaseModel):
+    detected: bool
+    identified: bool
+    candidates: list[IdentifyCandidate]
+    access: Optional[AccessResponse] = None
+
+
 class AccessListResponse(BaseModel):
     total: int
     items: list[AccessResponse]
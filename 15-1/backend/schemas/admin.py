@@ -84,4 +84,17 @@ class AdminAttendanceStatsResponse(BaseModel):
     daily: list[AdminAttendanceStatsItem]
     hourly: list[AdminAttendanceStatsItem]
     organizations: list[AdminAttendanceStatsItem]
-    userRanking: list[AdminAttendanceStatsItem]
\ No newline at end of file
+    userRanking: list[AdminAttendanceStatsItem]
+
+class AdminProfileResponse(BaseModel):
+    id: str
+    createdAt: datetime
+    method: str
+    path: str
+    route: str | None
+    status: int
+    trigger: str
+    durationMs: float
+    intervalMs: float
+    samples: int
+    sizeBytes: int
@@ -46,3 +46,11 @@ class FaceVerifyPreviewResponse(BaseModel):
     detected: bool
     similarity: float
     verified: bool
+    x: Optional[int] = None
+    y: Optional[int] = None
+    w: Optional[int] = None
+    h: Optional[int] = None
+    qualityReason: Optional[str] = None
+    qualityMessage: Optional[str] = None
+    ticket: Optional[str] = None
+    tracked: bool = False
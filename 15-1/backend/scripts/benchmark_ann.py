@@ -0,0 +1,139 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from services.ann_index import IVFIndex
+from services.face_matching import normalize_rows
+from services.gallery_index import GalleryIndex
+
+
+def synthetic_gallery(users: int, templates_per_user: int, dim: int, genuine: float, seed: int):
+    # 같은 사용자의 템플릿끼리 평균 코사인 유사도가 genuine 근처가 되도록 중심 벡터에 잡음을 섞는다.
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((users, dim), dtype=np.float32))
+    noise_scale = np.sqrt(1.0 / genuine - 1.0)
+
+    def sample(user_ids: np.ndarray) -> np.ndarray:
+        noise = rng.standard_normal((len(user_ids), dim), dtype=np.float32) / np.sqrt(dim)
+        return normalize_rows(centers[user_ids] + noise_scale * noise)
+
+    user_ids = np.repeat(np.arange(users), templates_per_user)
+    return user_ids, sample(user_ids), sample
+
+
+def exact_top(matrix: np.ndarray, probes: np.ndarray, k: int) -> np.ndarray:
+    scores = probes @ matrix.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def percentiles(timings: list[float]) -> dict:
+    values = np.asarray(timings)
+    return {
+        "p50Ms": round(float(np.percentile(values, 50)), 3),
+        "p95Ms": round(float(np.percentile(values, 95)), 3),
+    }
+
+
+def evaluate(index: GalleryIndex, probes: np.ndarray, truth: np.ndarray, probe_users: np.ndarray, k: int) -> dict:
+    timings, recalls, mate_recalls, top1_user = [], [], [], []
+    gallery_users = index.user_ids[:index.size]
+    for probe, expected, user_id in zip(probes, truth, probe_users):
+        started = time.perf_counter()
+        rows, _ = index.top_rows(probe, k)
+        timings.append((time.perf_counter() - started) * 1000)
+
+        recalls.append(len(set(rows.tolist()) & set(expected.tolist())) / k)
+        # 무작위 합성 데이터에서 상위 k의 나머지는 의미 없는 타인이므로, 본인 템플릿을 찾았는지를 따로 본다.
+        mates = np.count_nonzero(gallery_users == user_id)
+        mate_recalls.append(np.count_nonzero(gallery_users[rows] == user_id) / min(mates, k))
+        top1_user.append(len(rows) > 0 and int(index.user_ids[rows[0]]) == user_id)
+
+    return {
+        f"recall@{k}": round(float(np.mean(recalls)), 4),
+        "mateRecall": round(float(np.mean(mate_recalls)), 4),
+        "top1UserAccuracy": round(float(np.mean(top1_user)), 4),
+        **percentiles(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="근사 최근접 이웃(IVF / IVF-PQ) 검색 재현율·지연시간 벤치마크")
+    parser.add_argument("--users", type=int, default=50000, help="합성 사용자 수")
+    parser.add_argument("--templates-per-user", type=int, default=2, help="사용자당 템플릿 수")
+    parser.add_argument("--dim", type=int, default=512, help="임베딩 차원")
+    parser.add_argument("--genuine", type=float, default=0.7, help="동일인 템플릿 간 목표 평균 유사도")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수")
+    parser.add_argument("--k", type=int, default=10, help="재현율을 계산할 상위 k")
+    parser.add_argument("--types", default="ivf,ivfpq", help="평가할 인덱스 종류 (쉼표 구분)")
+    parser.add_argument("--nlist", type=int, default=0, help="IVF 리스트 수 (0이면 4*sqrt(N))")
+    parser.add_argument("--nprobe", default="4,8,16,32,64", help="평가할 nprobe 값들")
+    parser.add_argument("--rerank", default="64,256,1024", help="IVF-PQ 재정렬 후보 수들")
+    parser.add_argument("--pq-m", type=int, default=64, help="PQ 부분 공간 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="JSON 결과 저장 경로")
+    args = parser.parse_args()
+
+    user_ids, embeddings, sample = synthetic_gallery(
+        args.users, args.templates_per_user, args.dim, args.genuine, args.seed
+    )
+    probe_users = np.random.default_rng(args.seed + 1).integers(0, args.users, args.queries)
+    probes = sample(probe_users)
+
+    index = GalleryIndex()
+    index.load(list(range(len(embeddings))), user_ids.tolist(), embeddings)
+    truth = exact_top(index.matrix[:index.size], probes, args.k)
+
+    print(f"templates={index.size} dim={args.dim} queries={args.queries} k={args.k}\n")
+    results = {
+        "templates": index.size,
+        "dim": args.dim,
+        "k": args.k,
+        "exact": evaluate(index, probes, truth, probe_users, args.k),
+        "runs": [],
+    }
+
+    header = f"{'type':<8}{'nprobe':>8}{'rerank':>8}{f'recall@{args.k}':>12}{'mate recall':>13}{'top1 user':>12}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+    print(header)
+    print("-" * len(header))
+    exact = results["exact"]
+    print(
+        f"{'exact':<8}{'-':>8}{'-':>8}{exact[f'recall@{args.k}']:>12}{exact['mateRecall']:>13}"
+        f"{exact['top1UserAccuracy']:>12}{exact['p50Ms']:>10}{exact['p95Ms']:>10}"
+    )
+
+    for kind in [kind.strip() for kind in args.types.split(",") if kind.strip()]:
+        ann = IVFIndex(nlist=args.nlist, pq_m=args.pq_m if kind == "ivfpq" else 0)
+        started = time.perf_counter()
+        index.train_ann(ann)
+        train_seconds = time.perf_counter() - started
+
+        reranks = [int(v) for v in args.rerank.split(",")] if kind == "ivfpq" else [0]
+        for nprobe in [int(v) for v in args.nprobe.split(",")]:
+            for rerank in reranks:
+                ann.nprobe = nprobe
+                ann.rerank = rerank
+                run = evaluate(index, probes, truth, probe_users, args.k)
+                run.update({"type": kind, "nlist": ann.nlist, "nprobe": nprobe, "rerank": rerank or None, "trainSeconds": round(train_seconds, 2)})
+                results["runs"].append(run)
+                print(
+                    f"{kind:<8}{nprobe:>8}{rerank or '-':>8}{run[f'recall@{args.k}']:>12}{run['mateRecall']:>13}"
+                    f"{run['top1UserAccuracy']:>12}{run['p50Ms']:>10}{run['p95Ms']:>10}"
+                )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nJSON report saved to: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.config import DETECTION_MAX_SIDE
+from services.image_decode import decode_image
+
+SYNTHETIC_SIZES = ((480, 640), (720, 1280), (1080, 1920), (3024, 4032))
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+
+# 기존 load_image_array 구현 (비교 기준)
+def decode_with_pil(image_data: bytes) -> np.ndarray:
+    img_array = np.array(Image.open(BytesIO(image_data)))
+    if len(img_array.shape) == 2:
+        img_array = cv2.cvtColor(img_array, cv2.COLOR_GRAY2RGB)
+    elif img_array.shape[2] == 4:
+        img_array = cv2.cvtColor(img_array, cv2.COLOR_RGBA2RGB)
+    return img_array
+
+
+def synthetic_image(height: int, width: int, extension: str) -> bytes:
+    rng = np.random.default_rng(height * width)
+    small = (rng.random((max(1, height // 16), max(1, width // 16), 3)) * 255).astype(np.uint8)
+    img = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    return cv2.imencode(extension, img)[1].tobytes()
+
+
+def load_samples(args) -> list[tuple[str, bytes]]:
+    if args.images:
+        return [
+            (path.name, path.read_bytes())
+            for path in sorted(Path(args.images).iterdir())
+            if path.suffix.lower() in IMAGE_EXTENSIONS
+        ]
+
+    samples = [(f"{w}x{h}.jpg", synthetic_image(h, w, ".jpg")) for h, w in SYNTHETIC_SIZES]
+    samples.append(("720x1280.png", synthetic_image(720, 1280, ".png")))
+    return samples
+
+
+def time_ms(fn, image_data: bytes, iterations: int) -> float:
+    fn(image_data)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(image_data)
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PIL 디코딩 경로와 OpenCV 축소 디코딩 경로 마이크로 벤치마크")
+    parser.add_argument("--images", help="벤치마크할 이미지 디렉터리 (기본값: 합성 이미지)")
+    parser.add_argument("--iterations", type=int, default=30, help="이미지별 반복 횟수")
+    parser.add_argument("--max-side", type=int, default=DETECTION_MAX_SIDE, help="검출용 축소 디코딩 목표 해상도")
+    args = parser.parse_args()
+
+    samples = load_samples(args)
+    if not samples:
+        print("벤치마크할 이미지가 없습니다.")
+        sys.exit(1)
+
+    header = f"{'image':<20}{'PIL (ms)':>12}{'cv2 full':>12}{'cv2 reduced':>14}{'reduced size':>16}{'max |diff|':>12}"
+    print(header)
+    print("-" * len(header))
+
+    for name, image_data in samples:
+        pil_ms = time_ms(decode_with_pil, image_data, args.iterations)
+        full_ms = time_ms(lambda data: decode_image(data), image_data, args.iterations)
+        reduced_ms = time_ms(lambda data: decode_image(data, max_side=args.max_side), image_data, args.iterations)
+
+        reduced, _ = decode_image(image_data, max_side=args.max_side)
+        diff = np.abs(decode_with_pil(image_data).astype(np.int16) - decode_image(image_data)[0].astype(np.int16))
+
+        print(
+            f"{name:<20}{pil_ms:>12.2f}{full_ms:>12.2f}{reduced_ms:>14.2f}"
+            f"{f'{reduced.shape[1]}x{reduced.shape[0]}':>16}{int(diff.max()):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
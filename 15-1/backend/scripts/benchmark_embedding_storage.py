@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import JSON, Column, Integer, MetaData, Table, create_engine, select
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.embedding import EmbeddingType, encode_embedding
+
+FORMATS = ("json", "float32", "float16")
+
+
+def create_table(metadata: MetaData, fmt: str) -> Table:
+    return Table(
+        f"embeddings_{fmt}",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, index=True),
+        Column("embedding", JSON if fmt == "json" else EmbeddingType),
+    )
+
+
+def populate(engine, table: Table, fmt: str, user_ids: np.ndarray, embeddings: np.ndarray, batch: int = 2000) -> None:
+    with engine.begin() as conn:
+        for start in range(0, len(embeddings), batch):
+            rows = []
+            for offset, embedding in enumerate(embeddings[start:start + batch]):
+                value = embedding.astype(np.float64).tolist() if fmt == "json" else encode_embedding(embedding, dtype=fmt)
+                rows.append({"id": start + offset + 1, "user_id": int(user_ids[start + offset]), "embedding": value})
+            conn.execute(table.insert(), rows)
+
+
+def time_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(float(np.median(timings)), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 저장 형식(JSON / float32 / float16 BLOB)별 DB 크기·조회+디코딩 시간 벤치마크")
+    parser.add_argument("--rows", type=int, default=20000, help="임베딩 행 수")
+    parser.add_argument("--dim", type=int, default=512, help="임베딩 차원")
+    parser.add_argument("--templates-per-user", type=int, default=3, help="사용자당 템플릿 수")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--lookups", type=int, default=200, help="사용자별 조회 측정 횟수")
+    parser.add_argument("--json", dest="json_path", help="JSON 결과 저장 경로")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((args.rows, args.dim), dtype=np.float32)
+    user_ids = np.arange(args.rows) // args.templates_per_user
+    lookup_users = rng.integers(0, int(user_ids.max()) + 1, args.lookups)
+
+    print(f"rows={args.rows} dim={args.dim} templates/user={args.templates_per_user}\n")
+    header = f"{'format':<10}{'db size (MB)':>14}{'bytes/row':>11}{'full scan (ms)':>16}{'per user (ms)':>15}{'max error':>12}"
+    print(header)
+    print("-" * len(header))
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in FORMATS:
+            path = os.path.join(tmp, f"{fmt}.db")
+            engine = create_engine(f"sqlite:///{path}")
+            metadata = MetaData()
+            table = create_table(metadata, fmt)
+            metadata.create_all(engine)
+            populate(engine, table, fmt, user_ids, embeddings)
+
+            with engine.connect() as conn:
+                # 갤러리 인덱스 빌드 경로: 전체 행을 읽어 float32 행렬로 만든다.
+                def full_scan():
+                    rows = conn.execute(select(table.c.embedding)).all()
+                    return np.asarray([row.embedding for row in rows], dtype=np.float32)
+
+                # 출입 체크 경로: 한 사용자의 템플릿만 읽는다.
+                def per_user():
+                    for user_id in lookup_users:
+                        rows = conn.execute(select(table.c.embedding).where(table.c.user_id == int(user_id))).all()
+                        np.asarray([row.embedding for row in rows], dtype=np.float32)
+
+                matrix = full_scan()
+                full_ms = time_ms(full_scan, args.repeat)
+                per_user_ms = round(time_ms(per_user, 1) / args.lookups, 4)
+            engine.dispose()
+
+            size = os.path.getsize(path)
+            result = {
+                "format": fmt,
+                "dbBytes": size,
+                "bytesPerRow": round(size / args.rows),
+                "fullScanMs": full_ms,
+                "perUserMs": per_user_ms,
+                "maxAbsError": float(np.abs(matrix - embeddings).max()),
+            }
+            results.append(result)
+            print(
+                f"{fmt:<10}{size / 1024 / 1024:>14.2f}{result['bytesPerRow']:>11}{full_ms:>16}"
+                f"{per_user_ms:>15}{result['maxAbsError']:>12.2e}"
+            )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"rows": args.rows, "dim": args.dim, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\nJSON report saved to: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.config import API_VERSION, DETECTION_MAX_SIDE
+from services.face_alignment import align_face, downscale_image, resize_face
+from services.face_matching import FaceTemplates, normalize_rows
+from services.face_pipeline import (
+    normalize_embeddings,
+    preprocess_faces,
+    run_detector,
+    scale_region,
+    select_primary_face,
+    to_facial_area,
+)
+from services.image_decode import decode_image
+from services.inference_engine import create_engine
+from services.stub_engine import synthetic_face
+from services.metrics import get_peak_rss_bytes
+
+STAGES = ("decode", "detect", "align", "embed", "match", "total")
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+# engine:detector:recognizer (onnx 엔진의 recognizer 자리는 정밀도)
+DEFAULT_MATRIX = (
+    "deepface:ssd:ArcFace",
+    "deepface:opencv:ArcFace",
+    "deepface:yunet:ArcFace",
+    "deepface:mtcnn:ArcFace",
+    "deepface:retinaface:ArcFace",
+    "onnx:ssd:fp32",
+    "onnx:ssd:int8",
+    "stub:stub:stub",
+)
+
+
+def load_samples(args) -> list[tuple[str, bytes]]:
+    if args.images:
+        paths = [path for path in sorted(Path(args.images).iterdir()) if path.suffix.lower() in IMAGE_EXTENSIONS]
+        return [(path.name, path.read_bytes()) for path in paths[: args.limit or None]]
+    return [(f"synthetic_{seed}.jpg", synthetic_face(seed)) for seed in range(args.synthetic)]
+
+
+def build_engine(spec: str):
+    engine_name, detector_name, recognizer_name = spec.split(":")
+    if engine_name == "onnx":
+        if detector_name != "ssd":
+            raise ValueError("The onnx engine only ships the SSD detector.")
+        return create_engine("onnx", precision=recognizer_name)
+    if engine_name == "stub":
+        # 모델 없이 파이프라인 나머지 단계의 비용만 보는 기준선
+        return create_engine("stub")
+
+    engine = create_engine(engine_name, precision="fp32")
+    engine.detector_name = detector_name
+    engine.recognizer_name = recognizer_name
+    return engine
+
+
+def percentiles(timings: list[float]) -> dict:
+    values = np.asarray(timings) if timings else np.zeros(1)
+    return {
+        "p50Ms": round(float(np.percentile(values, 50)), 3),
+        "p95Ms": round(float(np.percentile(values, 95)), 3),
+        "p99Ms": round(float(np.percentile(values, 99)), 3),
+    }
+
+
+class PipelineRunner:
+    # 서비스와 같은 함수(face_pipeline, face_alignment)를 쓰되, 전역 엔진 대신 설정별 엔진/모델 핸들로 단계별 시간을 잰다.
+    def __init__(self, engine, detector, recognizer, templates: FaceTemplates, max_side: int):
+        self.engine = engine
+        self.detector = detector
+        self.recognizer = recognizer
+        self.templates = templates
+        self.max_side = max_side
+
+    def run(self, image_data: bytes) -> tuple[dict, bool]:
+        timings = {}
+        started = stage_started = time.perf_counter()
+
+        img, _ = decode_image(image_data)
+        timings["decode"], stage_started = _lap(stage_started)
+
+        small, scale = downscale_image(img, self.max_side)
+        regions = run_detector(self.engine, self.detector, small)
+        if scale != 1.0:
+            regions = [scale_region(region, 1.0 / scale) for region in regions]
+        facial_areas = [area for area in (to_facial_area(region, img.shape) for region in regions) if area["w"] > 0 and area["h"] > 0]
+        timings["detect"], stage_started = _lap(stage_started)
+
+        detected = bool(facial_areas)
+        if detected:
+            facial_area = select_primary_face(facial_areas)
+        else:
+            # 검출에 실패해도 정렬/임베딩 비용은 재야 하므로 가운데 영역을 얼굴로 가정한다.
+            height, width = img.shape[:2]
+            facial_area = {"x": width // 4, "y": height // 4, "w": width // 2, "h": height // 2}
+        face = resize_face(align_face(img, facial_area))
+        timings["align"], stage_started = _lap(stage_started)
+
+        embedding = normalize_embeddings(self.engine.represent(self.recognizer, preprocess_faces(face[np.newaxis])))[0]
+        timings["embed"], stage_started = _lap(stage_started)
+
+        self.templates.best(embedding)
+        timings["match"], _ = _lap(stage_started)
+        timings["total"] = (time.perf_counter() - started) * 1000
+        return timings, detected
+
+
+def _lap(started: float) -> tuple[float, float]:
+    now = time.perf_counter()
+    return (now - started) * 1000, now
+
+
+def concurrency_levels(max_concurrency: int) -> list[int]:
+    levels, level = [], 1
+    while level < max_concurrency:
+        levels.append(level)
+        level *= 2
+    return levels + [max_concurrency]
+
+
+def benchmark_config(spec: str, samples: list[tuple[str, bytes]], options: dict) -> dict:
+    result = {"config": spec}
+    try:
+        engine = build_engine(spec)
+        engine.ensure_available()
+
+        started = time.perf_counter()
+        detector = engine.load_detector()
+        recognizer = engine.load_recognizer()
+        result["loadMs"] = round((time.perf_counter() - started) * 1000, 1)
+    except Exception as e:
+        result.update({"status": "unavailable", "error": str(e), "peakRssBytes": get_peak_rss_bytes()})
+        return result
+
+    rng = np.random.default_rng(options["seed"])
+    probe = normalize_embeddings(
+        engine.represent(recognizer, preprocess_faces(np.zeros((1, 112, 112, 3), dtype=np.uint8)))
+    )
+    gallery = normalize_rows(rng.standard_normal((options["gallery_size"], probe.shape[1]), dtype=np.float32))
+    runner = PipelineRunner(engine, detector, recognizer, FaceTemplates(gallery), options["max_side"])
+
+    for _ in range(options["warmup"]):
+        runner.run(samples[0][1])
+
+    stage_timings = {stage: [] for stage in STAGES}
+    detected = 0
+    runs = 0
+    for _ in range(options["iterations"]):
+        for _, image_data in samples:
+            timings, found = runner.run(image_data)
+            detected += found
+            runs += 1
+            for stage, elapsed in timings.items():
+                stage_timings[stage].append(elapsed)
+
+    throughput = []
+    for concurrency in concurrency_levels(options["max_concurrency"]):
+        requests = max(options["throughput_requests"], concurrency * 4)
+        payloads = [samples[i % len(samples)][1] for i in range(requests)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            latencies = [timings["total"] for timings, _ in executor.map(runner.run, payloads)]
+        elapsed = time.perf_counter() - started
+        throughput.append({
+            "concurrency": concurrency,
+            "requests": requests,
+            "requestsPerSecond": round(requests / elapsed, 2),
+            **percentiles(latencies),
+        })
+
+    result.update({
+        "status": "ok",
+        "engine": engine.name,
+        "detector": engine.detector_name,
+        "recognizer": engine.recognizer_name,
+        "runs": runs,
+        "detectionRate": round(detected / runs, 4) if runs else 0.0,
+        "stages": {stage: percentiles(values) for stage, values in stage_timings.items()},
+        "throughput": throughput,
+        "peakRssBytes": get_peak_rss_bytes(),
+    })
+    return result
+
+
+def run_isolated(spec: str, samples: list[tuple[str, bytes]], options: dict) -> dict:
+    # 설정마다 새 프로세스에서 돌려 모델 메모리(최대 RSS)와 TensorFlow 전역 상태가 섞이지 않게 한다.
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as executor:
+        try:
+            return executor.submit(benchmark_config, spec, samples, options).result()
+        except Exception as e:
+            return {"config": spec, "status": "failed", "error": str(e)}
+
+
+def best_throughput(result: dict) -> float:
+    return max((run["requestsPerSecond"] for run in result.get("throughput", [])), default=0.0)
+
+
+def print_result(result: dict) -> None:
+    print(f"\n[{result['config']}] load={result['loadMs']}ms detection rate={result['detectionRate']:.0%} runs={result['runs']}")
+    header = f"{'stage':<10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}"
+    print(header)
+    print("-" * len(header))
+    for stage in STAGES:
+        values = result["stages"][stage]
+        print(f"{stage:<10}{values['p50Ms']:>10}{values['p95Ms']:>10}{values['p99Ms']:>10}")
+
+    header = f"{'concurrency':<12}{'req/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}"
+    print(header)
+    print("-" * len(header))
+    for run in result["throughput"]:
+        print(f"{run['concurrency']:<12}{run['requestsPerSecond']:>10}{run['p50Ms']:>10}{run['p95Ms']:>10}{run['p99Ms']:>10}")
+
+
+def print_matrix(results: list[dict]) -> None:
+    header = f"{'config':<30}{'status':<13}{'detect':>8}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'req/s':>10}{'peak RSS':>11}"
+    print(f"\n{header}")
+    print("-" * len(header))
+    for result in results:
+        rss = f"{result['peakRssBytes'] / (1024 * 1024):.0f}MB" if result.get("peakRssBytes") else "-"
+        if result["status"] != "ok":
+            print(f"{result['config']:<30}{result['status']:<13}{'-':>8}{'-':>10}{'-':>10}{'-':>10}{'-':>10}{rss:>11}")
+            continue
+        total = result["stages"]["total"]
+        print(
+            f"{result['config']:<30}{'ok':<13}{result['detectionRate']:>8.0%}{total['p50Ms']:>10}"
+            f"{total['p95Ms']:>10}{total['p99Ms']:>10}{best_throughput(result):>10}{rss:>11}"
+        )
+
+
+def compare_baseline(results: list[dict], baseline_path: str, threshold: float) -> list[str]:
+    # 이전 릴리스의 JSON과 비교해 지연시간/처리량이 threshold 이상 나빠진 설정을 돌려준다.
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {result["config"]: result for result in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\nbaseline: {baseline_path}")
+    header = f"{'config':<30}{'p50 Δ':>10}{'p95 Δ':>10}{'req/s Δ':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        before = baseline.get(result["config"])
+        if result["status"] != "ok" or not before or before.get("status") != "ok":
+            continue
+
+        deltas = {}
+        for key in ("p50Ms", "p95Ms"):
+            previous = before["stages"]["total"][key]
+            deltas[key] = (result["stages"]["total"][key] - previous) / previous if previous else 0.0
+        previous = best_throughput(before)
+        deltas["rps"] = (best_throughput(result) - previous) / previous if previous else 0.0
+
+        print(f"{result['config']:<30}{deltas['p50Ms']:>+10.1%}{deltas['p95Ms']:>+10.1%}{deltas['rps']:>+10.1%}")
+        if deltas["p50Ms"] > threshold or deltas["p95Ms"] > threshold or deltas["rps"] < -threshold:
+            regressions.append(result["config"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검출기/인식 모델 조합별 얼굴 파이프라인 지연시간·처리량·메모리 벤치마크")
+    parser.add_argument("--images", help="벤치마크할 얼굴 이미지 디렉터리 (기본값: 합성 얼굴)")
+    parser.add_argument("--limit", type=int, default=50, help="디렉터리에서 사용할 최대 이미지 수 (0이면 전체)")
+    parser.add_argument("--synthetic", type=int, default=8, help="합성 얼굴 이미지 수")
+    parser.add_argument("--configs", default=",".join(DEFAULT_MATRIX), help="engine:detector:recognizer 조합 (쉼표 구분)")
+    parser.add_argument("--iterations", type=int, default=5, help="이미지별 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=3, help="측정 전 워밍업 횟수")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="처리량을 잴 최대 동시 요청 수 (1, 2, 4, ... N)")
+    parser.add_argument("--throughput-requests", type=int, default=64, help="동시성 단계별 요청 수")
+    parser.add_argument("--gallery-size", type=int, default=1000, help="매칭 단계에서 비교할 합성 템플릿 수")
+    parser.add_argument("--max-side", type=int, default=DETECTION_MAX_SIDE, help="검출 입력 최대 해상도")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--in-process", action="store_true", help="설정별 프로세스 분리 없이 실행 (최대 RSS가 누적됨)")
+    parser.add_argument("--baseline", help="비교할 이전 JSON 결과 경로")
+    parser.add_argument("--regression-threshold", type=float, default=0.1, help="회귀로 판단할 상대 변화량")
+    parser.add_argument("--json", dest="json_path", help="JSON 결과 저장 경로")
+    args = parser.parse_args()
+
+    samples = load_samples(args)
+    if not samples:
+        print("벤치마크할 이미지가 없습니다.")
+        sys.exit(1)
+
+    options = {
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "max_concurrency": max(1, args.max_concurrency),
+        "throughput_requests": args.throughput_requests,
+        "gallery_size": args.gallery_size,
+        "max_side": args.max_side,
+        "seed": args.seed,
+    }
+    specs = [spec.strip() for spec in args.configs.split(",") if spec.strip()]
+    print(f"images={len(samples)} ({args.images or 'synthetic'}) configs={len(specs)} gallery={args.gallery_size}")
+
+    results = []
+    for spec in specs:
+        result = benchmark_config(spec, samples, options) if args.in_process else run_isolated(spec, samples, options)
+        results.append(result)
+        if result["status"] == "ok":
+            print_result(result)
+        else:
+            print(f"\n[{spec}] {result['status']}: {result.get('error')}")
+
+    print_matrix(results)
+
+    regressions = compare_baseline(results, args.baseline, args.regression_threshold) if args.baseline else []
+
+    if args.json_path:
+        report = {
+            "createdAt": datetime.now(timezone.utc).isoformat(),
+            "apiVersion": API_VERSION,
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "images": args.images or "synthetic",
+            "samples": len(samples),
+            "options": options,
+            "results": results,
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nJSON report saved to: {args.json_path}")
+
+    if regressions:
+        print(f"\nRegressions over {args.regression_threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
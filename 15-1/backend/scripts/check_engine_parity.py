@@ -0,0 +1,154 @@
+import argparse
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.config import UPLOAD_DIR
+from services.face_alignment import align_face, resize_face
+from services.face_pipeline import (
+    normalize_embeddings,
+    preprocess_faces,
+    run_detector,
+    select_primary_face,
+    to_facial_area,
+)
+from services.face_recognition import DETECTOR_BACKEND, MODEL_NAME, ensure_deepface, load_face_image, load_image_array
+from services.inference_engine import create_engine
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+# 파이프라인 도입 전 등록 경로(DeepFace.extract_faces + represent). 이미 저장된 템플릿은 이 경로로 만들어졌다.
+LEGACY_REFERENCE = "legacy"
+
+
+def load_images(args) -> list[tuple[str, np.ndarray]]:
+    images = []
+    if args.images:
+        for path in sorted(Path(args.images).iterdir()):
+            if path.suffix.lower() in IMAGE_EXTENSIONS:
+                images.append((path.name, load_image_array(path.read_bytes())))
+    if args.from_uploads:
+        for path in sorted((UPLOAD_DIR / "faces").glob("*.enc")):
+            images.append((path.name, load_image_array(load_face_image(str(path)))))
+    return images[: args.limit] if args.limit else images
+
+
+def run_legacy(images: list[tuple[str, np.ndarray]]) -> dict:
+    ensure_deepface()
+    from deepface import DeepFace
+
+    results = {}
+    for image_name, img in images:
+        try:
+            face_objs = DeepFace.extract_faces(
+                img_path=img,
+                detector_backend=DETECTOR_BACKEND,
+                enforce_detection=True,
+                align=True,
+                grayscale=False,
+            )
+        except ValueError:
+            results[image_name] = None
+            continue
+
+        face_obj = face_objs[0]
+        face = cv2.resize(face_obj["face"], (112, 112), interpolation=cv2.INTER_AREA)
+        representations = DeepFace.represent(
+            img_path=(face * 255).astype(np.uint8),
+            model_name=MODEL_NAME,
+            enforce_detection=False,
+            detector_backend="skip",
+            align=False,
+        )
+        embedding = normalize_embeddings(np.asarray([representations[0]["embedding"]], dtype=np.float32))[0]
+        facial_area = {key: face_obj["facial_area"][key] for key in ("x", "y", "w", "h")}
+        results[image_name] = (facial_area, embedding)
+    return results
+
+
+def run_engine(name: str, images: list[tuple[str, np.ndarray]]) -> dict:
+    if name == LEGACY_REFERENCE:
+        return run_legacy(images)
+
+    engine = create_engine(name)
+    engine.ensure_available()
+    detector = engine.load_detector()
+    recognizer = engine.load_recognizer()
+
+    results = {}
+    for image_name, img in images:
+        facial_areas = [to_facial_area(region, img.shape) for region in run_detector(engine, detector, img)]
+        if not facial_areas:
+            results[image_name] = None
+            continue
+
+        facial_area = select_primary_face(facial_areas)
+        face = resize_face(align_face(img, facial_area))
+        embedding = normalize_embeddings(engine.represent(recognizer, preprocess_faces(face[np.newaxis])))[0]
+        results[image_name] = (facial_area, embedding)
+    return results
+
+
+def bbox_iou(a: dict, b: dict) -> float:
+    x1, y1 = max(a["x"], b["x"]), max(a["y"], b["y"])
+    x2 = min(a["x"] + a["w"], b["x"] + b["w"])
+    y2 = min(a["y"] + a["h"], b["y"] + b["h"])
+    intersection = max(0, x2 - x1) * max(0, y2 - y1)
+    union = a["w"] * a["h"] + b["w"] * b["h"] - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추론 엔진 간 임베딩 일치 여부 검사")
+    parser.add_argument("--images", help="검사할 얼굴 이미지 폴더")
+    parser.add_argument("--from-uploads", action="store_true", help="등록된 얼굴 이미지(uploads/faces) 사용")
+    parser.add_argument(
+        "--reference",
+        default=LEGACY_REFERENCE,
+        help="기준 엔진. legacy는 기존 DeepFace.extract_faces+represent 등록 경로 (기본값: legacy)",
+    )
+    parser.add_argument("--candidate", default="deepface", help="비교 엔진 (기본값: deepface)")
+    parser.add_argument("--tolerance", type=float, default=0.99, help="허용 최소 코사인 유사도")
+    parser.add_argument("--min-iou", type=float, default=0.9, help="허용 최소 bbox IoU")
+    parser.add_argument("--limit", type=int, default=0, help="최대 이미지 수")
+    args = parser.parse_args()
+
+    images = load_images(args)
+    if not images:
+        print("검사할 이미지가 없습니다. --images 또는 --from-uploads 를 지정하세요.")
+        sys.exit(1)
+
+    reference = run_engine(args.reference, images)
+    candidate = run_engine(args.candidate, images)
+
+    failures = 0
+    similarities = []
+    for image_name, _ in images:
+        ref, cand = reference[image_name], candidate[image_name]
+        if ref is None and cand is None:
+            print(f"{image_name}: no face (both)")
+            continue
+        if ref is None or cand is None:
+            failures += 1
+            print(f"{image_name}: FAIL detection mismatch ({args.reference}={ref is not None}, {args.candidate}={cand is not None})")
+            continue
+
+        similarity = float(np.dot(ref[1], cand[1]))
+        iou = bbox_iou(ref[0], cand[0])
+        similarities.append(similarity)
+        ok = similarity >= args.tolerance and iou >= args.min_iou
+        failures += 0 if ok else 1
+        print(f"{image_name}: {'ok' if ok else 'FAIL'} cosine={similarity:.5f} iou={iou:.3f}")
+
+    if similarities:
+        print(f"\ncosine min={min(similarities):.5f} mean={np.mean(similarities):.5f} over {len(similarities)} faces")
+    print(f"{failures} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,85 @@
+import argparse
 import os
+import sys
 import numpy as np
 from PIL import Image
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 MODEL_DIR = BASE_DIR / "models" / "deepface"
+ONNX_DIR = BASE_DIR / "models" / "onnx"
 
 os.makedirs(MODEL_DIR, exist_ok=True)
 os.environ["DEEPFACE_HOME"] = str(MODEL_DIR)
 
-try:
-    from deepface import DeepFace
-    
+
+def download_models(DeepFace):
     print("Downloading ArcFace model...")
     print(f"Model will be saved to: {MODEL_DIR}")
-    
+
     dummy_img = np.zeros((224, 224, 3), dtype=np.uint8)
     img_pil = Image.fromarray(dummy_img)
-    
+
     DeepFace.represent(
         img_path=np.array(img_pil),
         model_name="ArcFace",
         enforce_detection=False
     )
-    
+
+    print("Downloading SSD face detector...")
+    DeepFace.build_model(model_name="ssd", task="face_detector")
+
     print("Model downloaded successfully!")
     print(f"Model files are located at: {MODEL_DIR}")
-    print("\nYou can now copy this 'models' directory to your offline deployment.")
-    
-except ImportError:
-    print("Error: deepface is not installed.")
-    print("Please install it first: pip install deepface")
-except Exception as e:
-    print(f"Error downloading model: {e}")
 
+
+def export_onnx(DeepFace, output_path: Path, opset: int):
+    try:
+        import tensorflow as tf
+        import tf2onnx
+    except ImportError:
+        print("Error: tf2onnx is not installed.")
+        print("Please install it first: pip install onnx && pip install --no-deps -r requirements-export.txt")
+        sys.exit(1)
+
+    os.makedirs(output_path.parent, exist_ok=True)
+
+    print(f"Exporting ArcFace to ONNX (opset {opset})...")
+    keras_model = DeepFace.build_model(model_name="ArcFace", task="facial_recognition").model
+    input_signature = [tf.TensorSpec((None, 112, 112, 3), tf.float32, name="input")]
+    tf2onnx.convert.from_keras(
+        keras_model,
+        input_signature=input_signature,
+        opset=opset,
+        output_path=str(output_path),
+    )
+
+    print(f"ONNX model saved to: {output_path}")
+    print("Set INFERENCE_ENGINE=onnx to use it, and run scripts/check_engine_parity.py --candidate onnx to verify.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="얼굴 인식 모델 다운로드 / ONNX 변환 스크립트")
+    parser.add_argument("--export-onnx", action="store_true", help="ArcFace 모델을 ONNX로 변환")
+    parser.add_argument("--onnx-output", default=str(ONNX_DIR / "arcface.onnx"), help="ONNX 출력 경로")
+    parser.add_argument("--opset", type=int, default=13, help="ONNX opset 버전")
+    args = parser.parse_args()
+
+    try:
+        from deepface import DeepFace
+    except ImportError:
+        print("Error: deepface is not installed.")
+        print("Please install it first: pip install deepface")
+        return
+
+    try:
+        download_models(DeepFace)
+        if args.export_onnx:
+            export_onnx(DeepFace, Path(args.onnx_output), args.opset)
+        print("\nYou can now copy this 'models' directory to your offline deployment.")
+    except Exception as e:
+        print(f"Error downloading model: {e}")
+
+
+if __name__ == "__main__":
+    main()
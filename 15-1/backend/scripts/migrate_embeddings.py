@@ -0,0 +1,91 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.config import DB_PATH, EMBEDDING_STORAGE_DTYPE
+from core.database import engine
+from core.embedding import DTYPE_CODES, encode_embedding
+
+
+def count_legacy_rows(conn) -> int:
+    return conn.execute(text("SELECT COUNT(*) FROM face_embeddings WHERE typeof(embedding) != 'blob'")).scalar()
+
+
+def migrate(batch_size: int, dtype: str, dry_run: bool) -> dict:
+    converted, text_bytes, blob_bytes = 0, 0, 0
+    last_id = 0
+    started = time.perf_counter()
+
+    while True:
+        # 배치마다 커밋해서 쓰기 잠금을 오래 잡지 않고, 중간에 멈춰도 이어서 실행할 수 있게 한다.
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, embedding FROM face_embeddings "
+                    "WHERE id > :last_id AND typeof(embedding) != 'blob' ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            ).all()
+            if not rows:
+                break
+
+            updates = []
+            for row_id, value in rows:
+                blob = encode_embedding(json.loads(value), dtype=dtype)
+                text_bytes += len(value)
+                blob_bytes += len(blob)
+                updates.append({"id": row_id, "embedding": blob})
+
+            if not dry_run:
+                conn.execute(text("UPDATE face_embeddings SET embedding = :embedding WHERE id = :id"), updates)
+
+        converted += len(rows)
+        last_id = rows[-1][0]
+        print(f"  {converted} rows converted (last id={last_id})")
+
+    return {
+        "converted": converted,
+        "textBytes": text_bytes,
+        "blobBytes": blob_bytes,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="얼굴 임베딩 JSON 컬럼을 바이너리(BLOB) 형식으로 변환하는 마이그레이션")
+    parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 변환할 행 수")
+    parser.add_argument("--dtype", default=EMBEDDING_STORAGE_DTYPE, choices=sorted(DTYPE_CODES), help="저장 dtype")
+    parser.add_argument("--dry-run", action="store_true", help="변환 결과만 계산하고 DB는 수정하지 않음")
+    parser.add_argument("--vacuum", action="store_true", help="변환 후 VACUUM으로 DB 파일 크기를 줄임")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        legacy = count_legacy_rows(conn)
+    print(f"DB: {DB_PATH}")
+    print(f"변환 대상: {legacy}행 (dtype={args.dtype}{', dry-run' if args.dry_run else ''})")
+    if legacy == 0:
+        return
+
+    result = migrate(args.batch_size, args.dtype, args.dry_run)
+    ratio = result["blobBytes"] / result["textBytes"] if result["textBytes"] else 0
+    print(
+        f"\n변환 완료: {result['converted']}행, {result['seconds']}s, "
+        f"{result['textBytes'] / 1024:.1f} KB -> {result['blobBytes'] / 1024:.1f} KB ({ratio:.1%})"
+    )
+
+    if args.vacuum and not args.dry_run:
+        size_before = DB_PATH.stat().st_size
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+        print(f"VACUUM: {size_before / 1024:.1f} KB -> {DB_PATH.stat().st_size / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
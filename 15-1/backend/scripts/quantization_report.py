@@ -0,0 +1,180 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from services.face_pipeline import normalize_embeddings, preprocess_faces
+from services.face_samples import load_registered_faces
+from services.metrics import get_process_rss_bytes
+from services.onnx_engine import OnnxEngine
+
+PRECISIONS = ("fp32", "int8")
+VERIFY_THRESHOLD = 0.70
+HISTOGRAM_BINS = np.linspace(-0.2, 1.0, 13)
+
+
+def embed_all(engine: OnnxEngine, session, faces: np.ndarray, batch_size: int = 32) -> np.ndarray:
+    chunks = [
+        engine.represent(session, preprocess_faces(faces[i:i + batch_size]))
+        for i in range(0, len(faces), batch_size)
+    ]
+    return normalize_embeddings(np.concatenate(chunks))
+
+
+def measure_latency(engine: OnnxEngine, session, faces: np.ndarray, iterations: int) -> dict:
+    timings = []
+    for i in range(iterations):
+        face = preprocess_faces(faces[i % len(faces)][np.newaxis])
+        started = time.perf_counter()
+        engine.represent(session, face)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings = np.asarray(timings[min(5, len(timings) - 1):])
+    return {
+        "p50Ms": round(float(np.percentile(timings, 50)), 3),
+        "p95Ms": round(float(np.percentile(timings, 95)), 3),
+        "meanMs": round(float(timings.mean()), 3),
+    }
+
+
+def measure_rss(precision: str, iterations: int) -> dict:
+    # 모델별 메모리를 분리해서 측정하기 위해 별도 프로세스에서 실행한다.
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure-rss", precision, "--iterations", str(iterations)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _measure_rss_child(precision: str, iterations: int) -> None:
+    before = get_process_rss_bytes()
+    engine = OnnxEngine(precision=precision)
+    session = engine.load_recognizer()
+    face = np.random.default_rng(0).random((1, 112, 112, 3), dtype=np.float32)
+    for _ in range(iterations):
+        engine.represent(session, face)
+    after = get_process_rss_bytes()
+    print(json.dumps({"rssMb": round(after / 2**20, 1), "modelRssMb": round((after - before) / 2**20, 1)}))
+
+
+def distribution(values: np.ndarray) -> dict:
+    if len(values) == 0:
+        return {"count": 0}
+
+    histogram, _ = np.histogram(values, bins=HISTOGRAM_BINS)
+    return {
+        "count": int(len(values)),
+        "mean": round(float(values.mean()), 4),
+        "std": round(float(values.std()), 4),
+        "p1": round(float(np.percentile(values, 1)), 4),
+        "p50": round(float(np.percentile(values, 50)), 4),
+        "p99": round(float(np.percentile(values, 99)), 4),
+        "histogram": {f"{lo:.1f}~{hi:.1f}": int(c) for lo, hi, c in zip(HISTOGRAM_BINS, HISTOGRAM_BINS[1:], histogram)},
+    }
+
+
+def pair_scores(embeddings: np.ndarray, labels: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    scores = embeddings @ embeddings.T
+    rows, cols = np.triu_indices(len(labels), k=1)
+    same = labels[rows] == labels[cols]
+    pair_values = scores[rows, cols]
+    return pair_values[same], pair_values[~same]
+
+
+def build_report(labels: np.ndarray, faces: np.ndarray, threshold: float, iterations: int) -> dict:
+    report = {"threshold": threshold, "faces": int(len(faces)), "users": int(len(set(labels.tolist()))), "models": {}}
+    embeddings = {}
+
+    for precision in PRECISIONS:
+        engine = OnnxEngine(precision=precision)
+        session = engine.load_recognizer()
+        embeddings[precision] = embed_all(engine, session, faces)
+        genuine, impostor = pair_scores(embeddings[precision], labels)
+
+        report["models"][precision] = {
+            "genuine": distribution(genuine),
+            "impostor": distribution(impostor),
+            "matchRate": round(float((genuine >= threshold).mean()), 4) if len(genuine) else None,
+            "falseMatchRate": round(float((impostor >= threshold).mean()), 4) if len(impostor) else None,
+            "latency": measure_latency(engine, session, faces, iterations),
+            "memory": measure_rss(precision, iterations),
+        }
+
+    fp32_genuine, fp32_impostor = pair_scores(embeddings["fp32"], labels)
+    int8_genuine, int8_impostor = pair_scores(embeddings["int8"], labels)
+    fp32_decisions = np.concatenate([fp32_genuine, fp32_impostor]) >= threshold
+    int8_decisions = np.concatenate([int8_genuine, int8_impostor]) >= threshold
+    cross = np.sum(embeddings["fp32"] * embeddings["int8"], axis=1)
+
+    report["agreement"] = {
+        "decisionAgreement": round(float((fp32_decisions == int8_decisions).mean()), 4) if len(fp32_decisions) else None,
+        "embeddingCosine": distribution(cross),
+    }
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"\n얼굴 {report['faces']}장 / 사용자 {report['users']}명, 임계값 {report['threshold']:.2f}\n")
+    header = f"{'':<24}" + "".join(f"{precision:>12}" for precision in PRECISIONS)
+    print(header)
+    print("-" * len(header))
+
+    rows = [
+        ("genuine mean", lambda m: m["genuine"].get("mean")),
+        ("genuine p1", lambda m: m["genuine"].get("p1")),
+        ("impostor mean", lambda m: m["impostor"].get("mean")),
+        ("impostor p99", lambda m: m["impostor"].get("p99")),
+        ("match rate @thr", lambda m: m["matchRate"]),
+        ("false match rate @thr", lambda m: m["falseMatchRate"]),
+        ("latency p50 (ms)", lambda m: m["latency"]["p50Ms"]),
+        ("latency p95 (ms)", lambda m: m["latency"]["p95Ms"]),
+        ("RSS (MB)", lambda m: m["memory"]["rssMb"]),
+        ("model RSS (MB)", lambda m: m["memory"]["modelRssMb"]),
+    ]
+    for label, getter in rows:
+        values = [getter(report["models"][precision]) for precision in PRECISIONS]
+        print(f"{label:<24}" + "".join(f"{'-' if v is None else v:>12}" for v in values))
+
+    agreement = report["agreement"]
+    print(f"\ndecision agreement: {agreement['decisionAgreement']}")
+    print(f"fp32↔int8 embedding cosine: mean={agreement['embeddingCosine'].get('mean')} p1={agreement['embeddingCosine'].get('p1')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FP32 / INT8 인식 모델 정확도·지연시간·메모리 비교 리포트")
+    parser.add_argument("--limit", type=int, default=0, help="사용할 최대 등록 얼굴 수")
+    parser.add_argument("--threshold", type=float, default=VERIFY_THRESHOLD, help="인증 임계값")
+    parser.add_argument("--iterations", type=int, default=100, help="지연시간 측정 반복 횟수")
+    parser.add_argument("--json", dest="json_path", help="JSON 리포트 저장 경로")
+    parser.add_argument("--measure-rss", choices=PRECISIONS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure_rss:
+        _measure_rss_child(args.measure_rss, args.iterations)
+        return
+
+    labels, faces = load_registered_faces(limit=args.limit)
+    if len(faces) < 2:
+        print("리포트를 만들려면 등록된 얼굴 이미지가 2장 이상 필요합니다. (uploads/faces)")
+        sys.exit(1)
+
+    report = build_report(labels, faces, args.threshold, args.iterations)
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nJSON report saved to: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.config import ONNX_RECOGNIZER_INT8_PATH, ONNX_RECOGNIZER_PATH
+from services.face_pipeline import preprocess_faces
+from services.face_samples import load_registered_faces
+
+try:
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_dynamic,
+        quantize_static,
+    )
+except ImportError:
+    print("Error: onnxruntime is not installed.")
+    print("Please install it first: pip install onnxruntime")
+    sys.exit(1)
+
+
+class FaceCalibrationDataReader(CalibrationDataReader):
+    def __init__(self, input_name: str, faces: np.ndarray, batch_size: int = 1):
+        self.input_name = input_name
+        self.batches = [
+            preprocess_faces(faces[i:i + batch_size]) for i in range(0, len(faces), batch_size)
+        ]
+        self._iterator = iter(self.batches)
+
+    def get_next(self):
+        batch = next(self._iterator, None)
+        return None if batch is None else {self.input_name: batch}
+
+    def rewind(self):
+        self._iterator = iter(self.batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ArcFace ONNX 모델 INT8 양자화 스크립트")
+    parser.add_argument("--mode", choices=["dynamic", "static"], default="static", help="양자화 방식")
+    parser.add_argument("--input", default=ONNX_RECOGNIZER_PATH, help="FP32 ONNX 모델 경로")
+    parser.add_argument("--output", default=ONNX_RECOGNIZER_INT8_PATH, help="INT8 ONNX 출력 경로")
+    parser.add_argument("--calibration-limit", type=int, default=200, help="보정에 사용할 최대 등록 얼굴 수")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"FP32 모델이 없습니다: {args.input}")
+        print("먼저 scripts/download_models.py --export-onnx 를 실행하세요.")
+        sys.exit(1)
+
+    os.makedirs(Path(args.output).parent, exist_ok=True)
+
+    if args.mode == "dynamic":
+        quantize_dynamic(args.input, args.output, weight_type=QuantType.QInt8, per_channel=True)
+    else:
+        import onnxruntime as ort
+
+        _, faces = load_registered_faces(limit=args.calibration_limit)
+        if len(faces) == 0:
+            print("보정에 사용할 등록 얼굴 이미지가 없습니다. (uploads/faces)")
+            print("--mode dynamic 을 사용하거나 얼굴을 먼저 등록하세요.")
+            sys.exit(1)
+
+        print(f"Calibrating with {len(faces)} registered face crops...")
+        input_name = ort.InferenceSession(args.input, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+        quantize_static(
+            args.input,
+            args.output,
+            FaceCalibrationDataReader(input_name, faces),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+        )
+
+    print(f"INT8 model saved to: {args.output}")
+    print("Run scripts/quantization_report.py before enabling RECOGNIZER_PRECISION=int8.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from core.config import (
+    ANN_INDEX,
+    ANN_NLIST,
+    ANN_NPROBE,
+    ANN_PQ_M,
+    ANN_RERANK,
+    ANN_TRAIN_ITERATIONS,
+    ANN_TRAIN_SAMPLES,
+)
+
+ANN_TYPES = ("ivf", "ivfpq")
+
+
+def kmeans(data: np.ndarray, k: int, iterations: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    k = min(k, len(data))
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+    data_sq = np.einsum("ij,ij->i", data, data)
+
+    for _ in range(iterations):
+        # ||x - c||^2 = ||x||^2 - 2<x, c> + ||c||^2, ||x||^2는 argmin에 영향이 없어 생략한다.
+        distances = (centroids ** 2).sum(axis=1)[np.newaxis] - 2 * data @ centroids.T
+        labels = np.argmin(distances, axis=1)
+
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=data[:, d], minlength=k) for d in range(data.shape[1])], axis=1)
+
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, np.newaxis]
+        if empty.any():
+            # 빈 클러스터는 현재 가장 멀리 떨어진 점들로 다시 시작한다.
+            farthest = np.argsort(distances[np.arange(len(data)), labels] + data_sq)[-int(empty.sum()):]
+            centroids[empty] = data[farthest]
+
+    return centroids.astype(np.float32)
+
+
+class ProductQuantizer:
+    def __init__(self, m: int, ksub: int = 256):
+        self.m = m
+        self.ksub = ksub
+        self.codebooks: Optional[np.ndarray] = None
+
+    def train(self, vectors: np.ndarray, iterations: int) -> None:
+        dim = vectors.shape[1]
+        if dim % self.m != 0:
+            raise ValueError(f"PQ sub-quantizer count {self.m} must divide the embedding dimension {dim}")
+
+        # 부분 코드북은 코드 하나당 수십 개의 샘플이면 충분하다.
+        max_samples = self.ksub * 40
+        if len(vectors) > max_samples:
+            vectors = vectors[np.random.default_rng(0).choice(len(vectors), max_samples, replace=False)]
+
+        subvectors = vectors.reshape(len(vectors), self.m, dim // self.m)
+        self.codebooks = np.stack(
+            [kmeans(subvectors[:, i], self.ksub, iterations, seed=i) for i in range(self.m)]
+        )
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        subvectors = vectors.reshape(len(vectors), self.m, -1)
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for i in range(self.m):
+            codebook = self.codebooks[i]
+            distances = (codebook ** 2).sum(axis=1)[np.newaxis] - 2 * subvectors[:, i] @ codebook.T
+            codes[:, i] = np.argmin(distances, axis=1)
+        return codes
+
+    def lookup_tables(self, probe: np.ndarray) -> np.ndarray:
+        # 내적은 부분 공간별로 분해되므로 프로브당 (m, ksub) 테이블 하나로 모든 코드의 점수를 근사한다.
+        return np.einsum("mkd,md->mk", self.codebooks, probe.reshape(self.m, -1))
+
+
+class IVFIndex:
+    # GalleryIndex의 행 번호와 1:1로 정렬된 보조 인덱스. 원본 float32 벡터는 GalleryIndex가 gather로 넘겨준다.
+    def __init__(
+        self,
+        nlist: int = ANN_NLIST,
+        nprobe: int = ANN_NPROBE,
+        rerank: int = ANN_RERANK,
+        pq_m: int = 0,
+        train_samples: int = ANN_TRAIN_SAMPLES,
+        train_iterations: int = ANN_TRAIN_ITERATIONS,
+    ):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.rerank = rerank
+        self.pq = ProductQuantizer(pq_m) if pq_m > 0 else None
+        self.train_samples = train_samples
+        self.train_iterations = train_iterations
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.zeros((0,), dtype=np.int32)
+        self.codes: Optional[np.ndarray] = None
+
+    @property
+    def kind(self) -> str:
+        return "ivfpq" if self.pq is not None else "ivf"
+
+    def train(self, vectors: np.ndarray, total: Optional[int] = None) -> None:
+        nlist = self.nlist or max(1, int(4 * np.sqrt(total or len(vectors))))
+
+        rng = np.random.default_rng(0)
+        if len(vectors) > self.train_samples:
+            vectors = vectors[rng.choice(len(vectors), self.train_samples, replace=False)]
+        self.centroids = kmeans(vectors, nlist, self.train_iterations)
+        self.nlist = len(self.centroids)
+
+        if self.pq is not None:
+            residuals = vectors - self.centroids[self.assign(vectors)]
+            self.pq.train(residuals, self.train_iterations)
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def resize(self, capacity: int) -> None:
+        self.assignments = np.resize(self.assignments, capacity)
+        if self.pq is not None:
+            codes = np.zeros((capacity, self.pq.m), dtype=np.uint8)
+            if self.codes is not None:
+                count = min(len(self.codes), capacity)
+                codes[:count] = self.codes[:count]
+            self.codes = codes
+
+    def set_rows(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        assignments = self.assign(vectors)
+        self.assignments[rows] = assignments
+        if self.pq is not None:
+            self.codes[rows] = self.pq.encode(vectors - self.centroids[assignments])
+
+    def search(
+        self,
+        gather: Callable[[np.ndarray], np.ndarray],
+        alive: np.ndarray,
+        size: int,
+        probe: np.ndarray,
+        count: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        coarse = self.centroids @ probe
+        nprobe = min(self.nprobe, self.nlist)
+        lists = np.argpartition(-coarse, nprobe - 1)[:nprobe]
+
+        rows = np.flatnonzero(np.isin(self.assignments[:size], lists) & alive[:size])
+        if len(rows) == 0:
+            return rows, np.zeros((0,), dtype=np.float32)
+
+        if self.pq is not None and len(rows) > max(count, self.rerank):
+            # <q, c + r> = <q, c> + <q, r>: 코어스 점수에 PQ 잔차 점수를 더해 후보를 추린다.
+            tables = self.pq.lookup_tables(probe)
+            approximate = coarse[self.assignments[rows]] + tables[np.arange(self.pq.m), self.codes[rows]].sum(axis=1)
+            shortlist = max(count, self.rerank)
+            rows = rows[np.argpartition(-approximate, shortlist - 1)[:shortlist]]
+
+        # 최종 후보는 원본 float32 벡터로 다시 정확하게 점수를 매긴다.
+        scores = gather(rows) @ probe
+        count = min(count, len(rows))
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top])]
+        return rows[top], scores[top]
+
+    def get_stats(self) -> dict:
+        return {
+            "type": self.kind,
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "rerank": self.rerank,
+            "pqM": self.pq.m if self.pq is not None else None,
+        }
+
+
+def create_ann_index(kind: str = ANN_INDEX) -> Optional[IVFIndex]:
+    if kind in ("", "none"):
+        return None
+    if kind not in ANN_TYPES:
+        raise ValueError(f"Unknown ANN index type: {kind}")
+    return IVFIndex(pq_m=ANN_PQ_M if kind == "ivfpq" else 0)
@@ -0,0 +1,171 @@
+import os
+import threading
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.config import (
+    FACE_CASCADE_HAAR_ACCEPT_SCORE,
+    FACE_CASCADE_MAX_SIDE,
+    FACE_CASCADE_MIN_FACE_RATIO,
+    FACE_CASCADE_REJECT_EMPTY,
+    FACE_CASCADE_YUNET_ACCEPT_SCORE,
+    FACE_CASCADE_YUNET_MODEL_PATH,
+    FACE_DETECTOR_CASCADE,
+)
+from services.face_alignment import downscale_image, find_eyes, load_eye_detector
+from services.inference_engine import FaceRegion
+from services.metrics import Counter
+
+
+class HaarStage:
+    name = "haar"
+
+    def __init__(self, accept_score: float = FACE_CASCADE_HAAR_ACCEPT_SCORE, max_side: int = FACE_CASCADE_MAX_SIDE):
+        self.accept_score = accept_score
+        self.max_side = max_side
+        self.face_detector = cv2.CascadeClassifier(
+            os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
+        )
+        self.eye_detector = load_eye_detector()
+
+    def detect(self, img: np.ndarray) -> List[Tuple[FaceRegion, float]]:
+        small, scale = downscale_image(img, self.max_side)
+        gray = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+        rects, _, weights = self.face_detector.detectMultiScale3(
+            gray, scaleFactor=1.1, minNeighbors=5, minSize=(24, 24), outputRejectLevels=True
+        )
+
+        detections = []
+        for (x, y, w, h), weight in zip(rects, np.ravel(weights)):
+            x, y, w, h = (int(v / scale) for v in (x, y, w, h))
+            region = FaceRegion(x, y, w, h, None, None, min(1.0, float(weight) / 10.0))
+            detections.append((region, float(weight)))
+        return detections
+
+    def add_landmarks(self, img: np.ndarray, region: FaceRegion) -> FaceRegion:
+        left_eye, right_eye = find_eyes(self.eye_detector, img[region.y:region.y + region.h, region.x:region.x + region.w])
+        if left_eye is None or right_eye is None:
+            return region
+        return region._replace(
+            left_eye=(region.x + left_eye[0], region.y + left_eye[1]),
+            right_eye=(region.x + right_eye[0], region.y + right_eye[1]),
+        )
+
+
+class YuNetStage:
+    name = "yunet"
+
+    def __init__(
+        self,
+        model_path: str = FACE_CASCADE_YUNET_MODEL_PATH,
+        accept_score: float = FACE_CASCADE_YUNET_ACCEPT_SCORE,
+        max_side: int = FACE_CASCADE_MAX_SIDE,
+    ):
+        if not os.path.exists(model_path):
+            raise RuntimeError(f"YuNet model not found at {model_path}.")
+        self.accept_score = accept_score
+        self.max_side = max_side
+        self.face_detector = cv2.FaceDetectorYN.create(model_path, "", (320, 320), score_threshold=0.5)
+        # FaceDetectorYN은 입력 크기를 상태로 들고 있어서, setInputSize와 detect 사이에 다른 스레드가 끼어들면 안 된다.
+        self._lock = threading.Lock()
+
+    def detect(self, img: np.ndarray) -> List[Tuple[FaceRegion, float]]:
+        small, scale = downscale_image(img, self.max_side)
+        bgr = cv2.cvtColor(small, cv2.COLOR_RGB2BGR)
+        with self._lock:
+            self.face_detector.setInputSize((small.shape[1], small.shape[0]))
+            _, faces = self.face_detector.detect(bgr)
+        if faces is None:
+            return []
+
+        detections = []
+        for face in faces:
+            x, y, w, h = (int(v / scale) for v in face[:4])
+            eyes = sorted(
+                [(int(face[4] / scale), int(face[5] / scale)), (int(face[6] / scale), int(face[7] / scale))]
+            )
+            score = float(face[-1])
+            # DeepFace 규칙: 이미지상 왼쪽에 있는 눈이 right_eye
+            detections.append((FaceRegion(x, y, w, h, eyes[1], eyes[0], score), score))
+        return detections
+
+    def add_landmarks(self, img: np.ndarray, region: FaceRegion) -> FaceRegion:
+        return region
+
+
+STAGES = {
+    "haar": HaarStage,
+    "yunet": YuNetStage,
+}
+
+
+class DetectorCascade:
+    def __init__(
+        self,
+        stage_names: List[str],
+        final_stage_name: str,
+        min_face_ratio: float = FACE_CASCADE_MIN_FACE_RATIO,
+        reject_empty: bool = FACE_CASCADE_REJECT_EMPTY,
+    ):
+        unknown = [name for name in stage_names if name not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown detector cascade stage(s): {', '.join(unknown)}")
+
+        self.stages = [STAGES[name]() for name in stage_names]
+        self.final_stage_name = final_stage_name
+        self.min_face_ratio = min_face_ratio
+        self.reject_empty = reject_empty
+        self.counters = {
+            stage.name: {"frames": Counter(), "rejected": Counter(), "accepted": Counter(), "escalated": Counter()}
+            for stage in self.stages
+        }
+        self.counters[final_stage_name] = {"frames": Counter()}
+
+    def _is_easy(self, img: np.ndarray, detections: List[Tuple[FaceRegion, float]], accept_score: float) -> bool:
+        if len(detections) != 1:
+            return False
+        region, score = detections[0]
+        return score >= accept_score and min(region.w, region.h) >= self.min_face_ratio * min(img.shape[:2])
+
+    def detect(
+        self,
+        img: np.ndarray,
+        final_stage: Callable[[np.ndarray], list],
+        allow_accept: bool = True,
+    ) -> list:
+        for stage in self.stages:
+            counters = self.counters[stage.name]
+            counters["frames"].inc()
+            detections = stage.detect(img)
+
+            if not detections and self.reject_empty:
+                counters["rejected"].inc()
+                return []
+
+            if allow_accept and self._is_easy(img, detections, stage.accept_score):
+                region = stage.add_landmarks(img, detections[0][0])
+                if region.left_eye is not None and region.right_eye is not None:
+                    counters["accepted"].inc()
+                    return [region]
+
+            counters["escalated"].inc()
+
+        self.counters[self.final_stage_name]["frames"].inc()
+        return final_stage(img)
+
+    def get_stats(self) -> dict:
+        return {
+            "stages": [stage.name for stage in self.stages] + [self.final_stage_name],
+            "counters": {
+                name: {key: counter.value for key, counter in counters.items()}
+                for name, counters in self.counters.items()
+            },
+        }
+
+
+def create_detector_cascade(final_stage_name: str) -> Optional[DetectorCascade]:
+    if not FACE_DETECTOR_CASCADE:
+        return None
+    return DetectorCascade(FACE_DETECTOR_CASCADE, final_stage_name)
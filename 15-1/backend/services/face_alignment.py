@@ -0,0 +1,143 @@
+import os
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+FACE_INPUT_SIZE = (112, 112)
+
+# DeepFace의 extract_face 정렬 방식과 동일하게 동작해야 기존에 등록된 임베딩과 호환된다.
+
+
+def load_eye_detector() -> cv2.CascadeClassifier:
+    return cv2.CascadeClassifier(os.path.join(cv2.data.haarcascades, "haarcascade_eye.xml"))
+
+
+def find_eyes(eye_detector: cv2.CascadeClassifier, face_img: np.ndarray) -> Tuple[Optional[tuple], Optional[tuple]]:
+    if face_img.shape[0] == 0 or face_img.shape[1] == 0:
+        return None, None
+
+    gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+    eyes = eye_detector.detectMultiScale(gray, 1.1, 10)
+    eyes = sorted(eyes, key=lambda v: abs(v[2] * v[3]), reverse=True)
+    if len(eyes) < 2:
+        return None, None
+
+    eye_1, eye_2 = eyes[0], eyes[1]
+    right_eye, left_eye = (eye_1, eye_2) if eye_1[0] < eye_2[0] else (eye_2, eye_1)
+
+    return (
+        (int(left_eye[0] + left_eye[2] / 2), int(left_eye[1] + left_eye[3] / 2)),
+        (int(right_eye[0] + right_eye[2] / 2), int(right_eye[1] + right_eye[3] / 2)),
+    )
+
+
+def extract_sub_image(img: np.ndarray, x: int, y: int, w: int, h: int) -> Tuple[np.ndarray, int, int]:
+    relative_x = int(0.5 * w)
+    relative_y = int(0.5 * h)
+
+    x1, y1 = x - relative_x, y - relative_y
+    x2, y2 = x + w + relative_x, y + h + relative_y
+
+    if x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
+        return img[y1:y2, x1:x2], relative_x, relative_y
+
+    extracted = np.zeros((y2 - y1, x2 - x1, img.shape[2]), dtype=img.dtype)
+    start_x, start_y = max(0, x1), max(0, y1)
+    end_x, end_y = min(img.shape[1], x2), min(img.shape[0], y2)
+    extracted[start_y - y1:end_y - y1, start_x - x1:end_x - x1] = img[start_y:end_y, start_x:end_x]
+
+    return extracted, relative_x, relative_y
+
+
+def align_img_wrt_eyes(
+    img: np.ndarray,
+    left_eye: Optional[Tuple[int, int]],
+    right_eye: Optional[Tuple[int, int]],
+) -> Tuple[np.ndarray, float]:
+    if left_eye is None or right_eye is None:
+        return img, 0.0
+
+    if img.shape[0] == 0 or img.shape[1] == 0:
+        return img, 0.0
+
+    angle = float(np.degrees(np.arctan2(left_eye[1] - right_eye[1], left_eye[0] - right_eye[0])))
+
+    h, w = img.shape[:2]
+    matrix = cv2.getRotationMatrix2D((w // 2, h // 2), angle, 1.0)
+    img = cv2.warpAffine(
+        img,
+        matrix,
+        (w, h),
+        flags=cv2.INTER_CUBIC,
+        borderMode=cv2.BORDER_CONSTANT,
+        borderValue=(0, 0, 0),
+    )
+    return img, angle
+
+
+def project_facial_area(
+    facial_area: Tuple[int, int, int, int], angle: float, size: Tuple[int, int]
+) -> Tuple[int, int, int, int]:
+    direction = 1 if angle >= 0 else -1
+    angle = abs(angle) % 360
+    if angle == 0:
+        return facial_area
+
+    angle = angle * np.pi / 180
+    height, width = size
+
+    x = (facial_area[0] + facial_area[2]) / 2 - width / 2
+    y = (facial_area[1] + facial_area[3]) / 2 - height / 2
+
+    x_new = x * np.cos(angle) + y * direction * np.sin(angle) + width / 2
+    y_new = -x * direction * np.sin(angle) + y * np.cos(angle) + height / 2
+
+    half_w = (facial_area[2] - facial_area[0]) / 2
+    half_h = (facial_area[3] - facial_area[1]) / 2
+
+    return (
+        max(int(x_new - half_w), 0),
+        max(int(y_new - half_h), 0),
+        min(int(x_new + half_w), width),
+        min(int(y_new + half_h), height),
+    )
+
+
+def align_face(img: np.ndarray, facial_area: dict) -> np.ndarray:
+    x, y, w, h = facial_area["x"], facial_area["y"], facial_area["w"], facial_area["h"]
+    left_eye = facial_area.get("left_eye")
+    right_eye = facial_area.get("right_eye")
+
+    if left_eye is None or right_eye is None:
+        return img[y:y + h, x:x + w]
+
+    sub_img, relative_x, relative_y = extract_sub_image(img, x, y, w, h)
+    aligned_sub_img, angle = align_img_wrt_eyes(
+        sub_img,
+        (left_eye[0] - x + relative_x, left_eye[1] - y + relative_y),
+        (right_eye[0] - x + relative_x, right_eye[1] - y + relative_y),
+    )
+
+    x1, y1, x2, y2 = project_facial_area(
+        (relative_x, relative_y, relative_x + w, relative_y + h),
+        angle,
+        aligned_sub_img.shape[:2],
+    )
+    return aligned_sub_img[y1:y2, x1:x2]
+
+
+def resize_face(face: np.ndarray, target_size: Tuple[int, int] = FACE_INPUT_SIZE) -> np.ndarray:
+    if face.shape[:2] != target_size:
+        face = cv2.resize(face, (target_size[1], target_size[0]), interpolation=cv2.INTER_AREA)
+    return face
+
+
+def downscale_image(img: np.ndarray, max_side: int) -> Tuple[np.ndarray, float]:
+    height, width = img.shape[:2]
+    if max_side <= 0 or max(height, width) <= max_side:
+        return img, 1.0
+
+    scale = max_side / max(height, width)
+    size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA), scale
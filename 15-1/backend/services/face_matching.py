@@ -0,0 +1,81 @@
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.70
+
+
+class Match(NamedTuple):
+    index: int
+    similarity: float
+
+
+def normalize_rows(embeddings) -> np.ndarray:
+    embeddings = np.array(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    embeddings /= norms
+    return embeddings
+
+
+class FaceTemplates:
+    # 한 사용자(또는 갤러리)의 템플릿을 정규화된 float32 행렬 하나로 보관한다.
+    def __init__(self, embeddings: Iterable[Sequence[float]], ids: Optional[Sequence[int]] = None):
+        matrix = normalize_rows(embeddings if isinstance(embeddings, np.ndarray) else list(embeddings))
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(0, 0) if matrix.size == 0 else matrix[np.newaxis]
+
+        self.matrix = matrix
+        self.ids = list(ids) if ids is not None else list(range(len(self.matrix)))
+
+    @classmethod
+    def from_rows(cls, rows) -> "FaceTemplates":
+        return cls([row.embedding for row in rows], ids=[row.id for row in rows])
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def score(self, probe: np.ndarray) -> np.ndarray:
+        if len(self.matrix) == 0:
+            return np.zeros((0,), dtype=np.float32)
+        return self.matrix @ normalize_rows(probe)
+
+    def score_batch(self, probes: np.ndarray) -> np.ndarray:
+        probes = normalize_rows(probes)
+        if len(self.matrix) == 0:
+            return np.zeros((len(probes), 0), dtype=np.float32)
+        return probes @ self.matrix.T
+
+    def best(self, probe: np.ndarray) -> Optional[Match]:
+        scores = self.score(probe)
+        if len(scores) == 0:
+            return None
+        index = int(np.argmax(scores))
+        return Match(index, float(scores[index]))
+
+    def top_k(self, probe: np.ndarray, k: int) -> List[Match]:
+        scores = self.score(probe)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+
+        indices = np.argpartition(-scores, k - 1)[:k]
+        indices = indices[np.argsort(-scores[indices])]
+        return [Match(int(i), float(scores[i])) for i in indices]
+
+    def best_batch(self, probes: np.ndarray) -> List[Optional[Match]]:
+        scores = self.score_batch(probes)
+        if scores.shape[1] == 0:
+            return [None] * len(scores)
+        indices = np.argmax(scores, axis=1)
+        return [Match(int(i), float(row[i])) for i, row in zip(indices, scores)]
+
+
+def match_templates(probe: np.ndarray, templates: FaceTemplates, threshold: float = DEFAULT_THRESHOLD):
+    match = templates.best(probe)
+    if match is None:
+        return False, 0.0, None
+
+    # 기존 verify_face와 동일하게 음수 유사도는 0으로 보고, float32 반올림으로 1을 살짝 넘는 값은 1로 자른다.
+    similarity = min(1.0, max(0.0, match.similarity))
+    return similarity >= threshold, similarity, match.index
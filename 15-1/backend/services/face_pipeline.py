@@ -0,0 +1,282 @@
+import threading
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from core.config import (
+    DETECTION_MAX_SIDE,
+    FACE_QUALITY_GATE_ENABLED,
+    FRAME_CACHE_ENABLED,
+    FRAME_CACHE_PERCEPTUAL,
+    INFERENCE_BATCH_ENABLED,
+)
+from services.detector_cascade import DetectorCascade, create_detector_cascade
+from services.face_alignment import align_face, downscale_image, resize_face
+from services.face_quality import QUALITY_OK, assess_face_quality
+from services.frame_cache import content_hash, difference_hash, get_frame_cache
+from services.inference_engine import FaceRegion, get_engine
+from services.inference_batcher import InferenceBatcher
+from services.image_decode import decode_image
+from services.instrumentation import observe_stages, stage
+from services.inference_workers import get_worker_pool
+from services.model_manager import get_detector, get_recognizer
+
+_batcher: Optional[InferenceBatcher] = None
+_batcher_lock = threading.Lock()
+_cascade: Optional[DetectorCascade] = None
+_cascade_initialized = False
+_cascade_lock = threading.Lock()
+
+
+@dataclass
+class FacePipelineResult:
+    detected: bool = False
+    facial_area: Optional[dict] = None
+    face: Optional[np.ndarray] = None
+    quality: float = 0.0
+    quality_reason: Optional[str] = None
+    embedding: Optional[np.ndarray] = None
+
+    @property
+    def bbox(self) -> dict:
+        if not self.facial_area:
+            return {}
+        return {key: self.facial_area[key] for key in ("x", "y", "w", "h")}
+
+
+def _scale_point(point, factor: float):
+    if point is None:
+        return None
+    return (int(round(point[0] * factor)), int(round(point[1] * factor)))
+
+
+def scale_region(region, factor: float) -> FaceRegion:
+    return FaceRegion(
+        int(round(region.x * factor)),
+        int(round(region.y * factor)),
+        int(round(region.w * factor)),
+        int(round(region.h * factor)),
+        _scale_point(region.left_eye, factor),
+        _scale_point(region.right_eye, factor),
+        region.confidence,
+    )
+
+
+def scale_facial_area(facial_area: dict, factor: float) -> dict:
+    scaled = dict(facial_area)
+    for key in ("x", "y", "w", "h"):
+        scaled[key] = int(round(facial_area[key] * factor))
+    for key in ("left_eye", "right_eye"):
+        scaled[key] = _scale_point(facial_area.get(key), factor)
+    return scaled
+
+
+def to_facial_area(region, img_shape) -> dict:
+    height, width = img_shape[:2]
+    x = max(0, int(region.x))
+    y = max(0, int(region.y))
+    return {
+        "x": x,
+        "y": y,
+        "w": min(width - x, int(region.w)),
+        "h": min(height - y, int(region.h)),
+        "left_eye": region.left_eye,
+        "right_eye": region.right_eye,
+        "confidence": float(region.confidence or 0.0),
+    }
+
+
+def get_detector_cascade() -> Optional[DetectorCascade]:
+    global _cascade, _cascade_initialized
+
+    if not _cascade_initialized:
+        with _cascade_lock:
+            if not _cascade_initialized:
+                _cascade = create_detector_cascade(get_engine().detector_name)
+                _cascade_initialized = True
+    return _cascade
+
+
+def get_detector_cascade_stats() -> Optional[dict]:
+    return _cascade.get_stats() if _cascade is not None else None
+
+
+def run_detector(engine, detector, img: np.ndarray) -> list:
+    border_y = int(engine.detection_border * img.shape[0])
+    border_x = int(engine.detection_border * img.shape[1])
+    if not border_y and not border_x:
+        return engine.detect_faces(detector, img)
+
+    # 프레임 가장자리의 얼굴도 정렬 후 잘리지 않도록 테두리를 붙여 검출하고, 좌표는 원래 프레임 기준으로 되돌린다.
+    padded = cv2.copyMakeBorder(img, border_y, border_y, border_x, border_x, cv2.BORDER_CONSTANT, value=(0, 0, 0))
+    return [_shift_region(region, -border_x, -border_y) for region in engine.detect_faces(detector, padded)]
+
+
+def _shift_region(region, dx: int, dy: int) -> FaceRegion:
+    def shift(point):
+        return None if point is None else (point[0] + dx, point[1] + dy)
+
+    return FaceRegion(
+        region.x + dx,
+        region.y + dy,
+        region.w,
+        region.h,
+        shift(region.left_eye),
+        shift(region.right_eye),
+        region.confidence,
+    )
+
+
+def _run_detector(img: np.ndarray) -> list:
+    return run_detector(get_engine(), get_detector(), img)
+
+
+def detect_faces(
+    img: np.ndarray, allow_cascade_accept: bool = True, max_side: int = DETECTION_MAX_SIDE
+) -> List[dict]:
+    # 검출은 축소된 프레임에서 하고, 좌표는 원본 해상도로 되돌린다. 정렬/임베딩은 원본 픽셀을 사용한다.
+    small, scale = downscale_image(img, max_side)
+
+    cascade = get_detector_cascade()
+    if cascade is not None:
+        regions = cascade.detect(small, _run_detector, allow_accept=allow_cascade_accept)
+    else:
+        regions = _run_detector(small)
+
+    if scale != 1.0:
+        regions = [scale_region(region, 1.0 / scale) for region in regions]
+
+    facial_areas = [to_facial_area(region, img.shape) for region in regions]
+    return [area for area in facial_areas if area["w"] > 0 and area["h"] > 0]
+
+
+def preprocess_faces(faces: np.ndarray) -> np.ndarray:
+    # 기존 경로는 PIL의 RGB 배열을 extract_faces가 한 번, represent(detector_backend="skip")가 다시 한 번
+    # 뒤집었기 때문에 ArcFace는 디코딩한 RGB 순서 그대로 받았다. 채널은 건드리지 않고 0~1 범위로만 바꾼다.
+    return faces.astype(np.float32) / 255.0
+
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
+
+
+def select_primary_face(facial_areas: List[dict]) -> dict:
+    return max(facial_areas, key=lambda area: area["w"] * area["h"])
+
+
+def embed_faces(faces: np.ndarray) -> np.ndarray:
+    embeddings = get_engine().represent(get_recognizer(), preprocess_faces(faces))
+    return normalize_embeddings(embeddings)
+
+
+def get_batcher() -> InferenceBatcher:
+    global _batcher
+
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = InferenceBatcher(embed_faces, name="arcface-batcher")
+    return _batcher
+
+
+def get_batcher_stats() -> Optional[dict]:
+    return _batcher.get_stats() if _batcher is not None else None
+
+
+def embed_face(face: np.ndarray, batched: bool = INFERENCE_BATCH_ENABLED) -> np.ndarray:
+    if batched:
+        return get_batcher().run(face)
+    return embed_faces(face[np.newaxis])[0]
+
+
+def run_face_pipeline_on_array(
+    img: np.ndarray,
+    embed: bool = True,
+    batched: bool = INFERENCE_BATCH_ENABLED,
+    quality_gate: bool = FACE_QUALITY_GATE_ENABLED,
+) -> FacePipelineResult:
+    # 임베딩까지 계산하는 요청은 정렬 품질을 위해 경량 검출기의 결과를 그대로 쓰지 않는다.
+    with stage("detect"):
+        facial_areas = detect_faces(img, allow_cascade_accept=not embed)
+    if not facial_areas:
+        return FacePipelineResult()
+
+    facial_area = select_primary_face(facial_areas)
+    with stage("align"):
+        face = resize_face(align_face(img, facial_area))
+
+    result = FacePipelineResult(
+        detected=True,
+        facial_area=facial_area,
+        face=face,
+        quality=facial_area["confidence"],
+    )
+
+    if quality_gate:
+        # 통과할 가능성이 없는 얼굴(흐림, 작음, 어두움, 측면)은 임베딩을 계산하지 않는다.
+        with stage("quality"):
+            result.quality_reason = assess_face_quality(facial_area, face).reason
+        if result.quality_reason != QUALITY_OK:
+            return result
+
+    if embed:
+        with stage("embed"):
+            result.embedding = embed_face(face, batched=batched)
+
+    return result
+
+
+def run_face_pipeline(image_data: bytes, embed: bool = True) -> FacePipelineResult:
+    # 재시도나 자동 촬영으로 같은 프레임이 다시 오면 모델을 거치지 않고 직전 결과를 돌려준다.
+    cache = get_frame_cache() if FRAME_CACHE_ENABLED else None
+    digest = None
+    if cache is not None:
+        digest = content_hash(image_data)
+        cached = cache.get(digest, embed)
+        if cached is not None:
+            return replace(cached)
+
+    pool = get_worker_pool()
+    if pool is None:
+        get_engine().ensure_available()
+
+    perceptual_hash = None
+    try:
+        # 검출만 필요한 요청은 JPEG를 검출 해상도 근처까지 줄여서 디코딩한다.
+        with stage("decode"):
+            img, scale = decode_image(image_data, max_side=DETECTION_MAX_SIDE if not embed else 0)
+
+        if cache is not None:
+            if FRAME_CACHE_PERCEPTUAL:
+                perceptual_hash = difference_hash(img)
+            if perceptual_hash is not None and not embed:
+                # 바이트는 달라도 거의 같은 장면(정지 화면, 재인코딩)이면 검출 결과만 재사용한다.
+                # dHash는 배경이 좌우하므로 같은 단말 앞의 다른 사람일 수 있다. 임베딩은 내용 해시가 같을 때만 재사용한다.
+                cached = cache.get_similar(perceptual_hash)
+                if cached is not None:
+                    return replace(cached, embedding=None)
+            else:
+                cache.miss()
+
+        if pool is not None:
+            # 워커 안에서 잰 단계별 시간은 결과와 함께 돌아오고, "worker"는 큐 대기와 전송까지 포함한 왕복 시간이다.
+            with stage("worker"):
+                payload = pool.run(img, embed=embed)
+            observe_stages(payload.pop("stage_timings", None))
+            result = FacePipelineResult(**payload)
+        else:
+            result = run_face_pipeline_on_array(img, embed=embed)
+    except Exception:
+        return FacePipelineResult()
+
+    if scale != 1.0 and result.facial_area is not None:
+        result.facial_area = scale_facial_area(result.facial_area, 1.0 / scale)
+
+    if cache is not None:
+        cache.put(digest, embed, result, perceptual_hash)
+        return replace(result)
+    return result
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from core.config import (
+    FACE_QUALITY_MAX_BRIGHTNESS,
+    FACE_QUALITY_MAX_ROLL,
+    FACE_QUALITY_MAX_YAW,
+    FACE_QUALITY_MIN_BRIGHTNESS,
+    FACE_QUALITY_MIN_SHARPNESS,
+    FACE_QUALITY_MIN_SIZE,
+)
+
+QUALITY_OK = "ok"
+QUALITY_TOO_SMALL = "too_small"
+QUALITY_BLURRY = "blurry"
+QUALITY_TOO_DARK = "too_dark"
+QUALITY_TOO_BRIGHT = "too_bright"
+QUALITY_POSE_YAW = "pose_yaw"
+QUALITY_POSE_ROLL = "pose_roll"
+
+QUALITY_MESSAGES = {
+    QUALITY_TOO_SMALL: "얼굴이 너무 작습니다. 카메라에 더 가까이 다가오세요.",
+    QUALITY_BLURRY: "이미지가 흐립니다. 움직이지 말고 잠시 멈춰주세요.",
+    QUALITY_TOO_DARK: "너무 어둡습니다. 밝은 곳에서 다시 시도해주세요.",
+    QUALITY_TOO_BRIGHT: "너무 밝습니다. 역광을 피해주세요.",
+    QUALITY_POSE_YAW: "카메라를 정면으로 바라보세요.",
+    QUALITY_POSE_ROLL: "고개를 기울이지 말고 똑바로 해주세요.",
+}
+
+
+@dataclass
+class FaceQuality:
+    reason: str
+    size: int
+    sharpness: float
+    brightness: float
+    yaw: Optional[float] = None
+    roll: Optional[float] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.reason == QUALITY_OK
+
+
+def estimate_pose(facial_area: dict) -> tuple[Optional[float], Optional[float]]:
+    left_eye = facial_area.get("left_eye")
+    right_eye = facial_area.get("right_eye")
+    if left_eye is None or right_eye is None:
+        return None, None
+
+    roll = float(np.degrees(np.arctan2(left_eye[1] - right_eye[1], left_eye[0] - right_eye[0])))
+
+    # 눈 중점이 얼굴 박스 중심에서 벗어난 정도로 yaw를 근사한다. (머리 반지름 ≈ 박스 너비의 절반)
+    eye_center_x = (left_eye[0] + right_eye[0]) / 2
+    offset = (eye_center_x - (facial_area["x"] + facial_area["w"] / 2)) / max(facial_area["w"] / 2, 1)
+    yaw = float(np.degrees(np.arcsin(np.clip(offset, -1.0, 1.0))))
+
+    return yaw, roll
+
+
+def assess_face_quality(facial_area: dict, face: np.ndarray) -> FaceQuality:
+    # face는 정렬 후 112x112로 맞춘 얼굴이므로 선명도 임계값이 원본 해상도에 영향을 받지 않는다.
+    gray = cv2.cvtColor(face, cv2.COLOR_RGB2GRAY)
+    size = int(min(facial_area["w"], facial_area["h"]))
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    brightness = float(gray.mean())
+    yaw, roll = estimate_pose(facial_area)
+
+    if size < FACE_QUALITY_MIN_SIZE:
+        reason = QUALITY_TOO_SMALL
+    elif brightness < FACE_QUALITY_MIN_BRIGHTNESS:
+        reason = QUALITY_TOO_DARK
+    elif brightness > FACE_QUALITY_MAX_BRIGHTNESS:
+        reason = QUALITY_TOO_BRIGHT
+    elif sharpness < FACE_QUALITY_MIN_SHARPNESS:
+        reason = QUALITY_BLURRY
+    elif yaw is not None and abs(yaw) > FACE_QUALITY_MAX_YAW:
+        reason = QUALITY_POSE_YAW
+    elif roll is not None and abs(roll) > FACE_QUALITY_MAX_ROLL:
+        reason = QUALITY_POSE_ROLL
+    else:
+        reason = QUALITY_OK
+
+    return FaceQuality(
+        reason=reason,
+        size=size,
+        sharpness=round(sharpness, 2),
+        brightness=round(brightness, 2),
+        yaw=None if yaw is None else round(yaw, 1),
+        roll=None if roll is None else round(roll, 1),
+    )
@@ -0,0 +1,53 @@
+import logging
+import os
+import re
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from core.config import UPLOAD_DIR
+from services.face_recognition import load_face_image, load_image_array
+
+logger = logging.getLogger(__name__)
+
+FACE_UPLOAD_DIR = os.path.join(UPLOAD_DIR, "faces")
+
+_FILENAME_PATTERN = re.compile(r"^user_(\d+)_\d+\.enc$")
+
+
+def iter_registered_face_images(limit: int = 0) -> Iterator[Tuple[int, bytes]]:
+    if not os.path.isdir(FACE_UPLOAD_DIR):
+        return
+
+    count = 0
+    for filename in sorted(os.listdir(FACE_UPLOAD_DIR)):
+        match = _FILENAME_PATTERN.match(filename)
+        if not match:
+            continue
+
+        try:
+            image_data = load_face_image(os.path.join(FACE_UPLOAD_DIR, filename))
+        except Exception as e:
+            logger.warning("Skipping %s: %s", filename, e)
+            continue
+
+        yield int(match.group(1)), image_data
+        count += 1
+        if limit and count >= limit:
+            return
+
+
+def load_registered_faces(limit: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    from services.face_pipeline import run_face_pipeline_on_array
+
+    labels, faces = [], []
+    for user_id, image_data in iter_registered_face_images(limit):
+        result = run_face_pipeline_on_array(load_image_array(image_data), embed=False, batched=False)
+        if result.face is None:
+            continue
+        labels.append(user_id)
+        faces.append(result.face)
+
+    if not faces:
+        return np.zeros((0,), dtype=np.int64), np.zeros((0, 112, 112, 3), dtype=np.uint8)
+    return np.asarray(labels, dtype=np.int64), np.stack(faces)
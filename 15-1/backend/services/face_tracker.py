@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.config import (
+    FACE_TRACKING_IDLE_SECONDS,
+    FACE_TRACKING_MAX_SCALE_CHANGE,
+    FACE_TRACKING_MAX_SESSIONS,
+    FACE_TRACKING_MIN_APPEARANCE,
+    FACE_TRACKING_MIN_IOU,
+    FACE_TRACKING_REFRESH_SECONDS,
+)
+
+# 추적이 끊긴(다시 임베딩한) 이유
+MISS_NEW = "new"
+MISS_LOST = "lost"
+MISS_MOVED = "moved"
+MISS_SCALED = "scaled"
+MISS_APPEARANCE = "appearance"
+MISS_REFRESH = "refresh"
+MISS_TEMPLATES = "templates"
+
+_SIGNATURE_SIZE = (24, 24)
+
+Box = Tuple[int, int, int, int]
+
+
+def box_iou(a: Box, b: Box) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    ih = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = iw * ih
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+
+def face_signature(face: np.ndarray) -> np.ndarray:
+    # 정렬된 얼굴을 작은 흑백 패치로 줄여 정규화 상관(NCC)으로 비교한다. 같은 자리에 다른 사람이 선 경우를 걸러낸다.
+    gray = face.mean(axis=2) if face.ndim == 3 else face
+    patch = cv2.resize(np.asarray(gray, dtype=np.float32), _SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).reshape(-1)
+    patch -= patch.mean()
+    norm = np.linalg.norm(patch)
+    return patch / norm if norm > 0 else patch
+
+
+@dataclass
+class FaceTrack:
+    box: Box
+    signature: np.ndarray
+    version: int
+    value: Any
+    embedded_at: float
+    seen_at: float
+
+
+class FaceTracker:
+    # 세션(사용자/단말/스트림)별로 마지막으로 임베딩한 얼굴의 위치·외형과 그때의 결과를 기억한다.
+    def __init__(
+        self,
+        min_iou: float = FACE_TRACKING_MIN_IOU,
+        max_scale_change: float = FACE_TRACKING_MAX_SCALE_CHANGE,
+        min_appearance: float = FACE_TRACKING_MIN_APPEARANCE,
+        refresh_seconds: float = FACE_TRACKING_REFRESH_SECONDS,
+        idle_seconds: float = FACE_TRACKING_IDLE_SECONDS,
+        max_sessions: int = FACE_TRACKING_MAX_SESSIONS,
+    ):
+        self.min_iou = min_iou
+        self.max_scale_change = max_scale_change
+        self.min_appearance = min_appearance
+        self.refresh_seconds = refresh_seconds
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self._tracks: "OrderedDict[Hashable, FaceTrack]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.tracked = 0
+        self.misses = {}
+
+    def _miss(self, reason: str) -> None:
+        self.misses[reason] = self.misses.get(reason, 0) + 1
+
+    def _check(self, track: Optional[FaceTrack], box: Box, signature: np.ndarray, version: int, now: float) -> Optional[str]:
+        if track is None:
+            return MISS_NEW
+        if now - track.seen_at > self.idle_seconds:
+            return MISS_LOST
+        if track.version != version:
+            return MISS_TEMPLATES
+        if now - track.embedded_at > self.refresh_seconds:
+            return MISS_REFRESH
+
+        # 위치/크기는 마지막으로 임베딩한 시점의 박스와 비교해서, 조금씩 움직여도 누적되면 다시 임베딩한다.
+        area, track_area = box[2] * box[3], track.box[2] * track.box[3]
+        if track_area <= 0 or abs(np.sqrt(area / track_area) - 1.0) > self.max_scale_change:
+            return MISS_SCALED
+        if box_iou(box, track.box) < self.min_iou:
+            return MISS_MOVED
+        if float(signature @ track.signature) < self.min_appearance:
+            return MISS_APPEARANCE
+        return None
+
+    def lookup(self, key: Hashable, box: Box, face: np.ndarray, version: int) -> Optional[Any]:
+        now = time.monotonic()
+        signature = face_signature(face)
+        with self._lock:
+            self.frames += 1
+            track = self._tracks.get(key)
+            reason = self._check(track, box, signature, version, now)
+            if reason is not None:
+                self._miss(reason)
+                return None
+
+            track.seen_at = now
+            self._tracks.move_to_end(key)
+            self.tracked += 1
+            return track.value
+
+    def update(self, key: Hashable, box: Box, face: np.ndarray, version: int, value: Any) -> None:
+        now = time.monotonic()
+        track = FaceTrack(box, face_signature(face), version, value, now, now)
+        with self._lock:
+            self._tracks[key] = track
+            self._tracks.move_to_end(key)
+            while len(self._tracks) > self.max_sessions:
+                self._tracks.popitem(last=False)
+
+    def lose(self, key: Hashable) -> None:
+        # 얼굴이 사라진 프레임도 전체 프레임 수에 포함한다.
+        with self._lock:
+            self.frames += 1
+            if self._tracks.pop(key, None) is not None:
+                self._miss(MISS_LOST)
+
+    def drop(self, key: Hashable) -> None:
+        with self._lock:
+            self._tracks.pop(key, None)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._tracks),
+                "frames": self.frames,
+                "trackedFrames": self.tracked,
+                "trackedFraction": round(self.tracked / self.frames, 4) if self.frames else None,
+                "misses": dict(self.misses),
+                "refreshSeconds": self.refresh_seconds,
+            }
+
+
+_tracker = FaceTracker()
+
+
+def get_face_tracker() -> FaceTracker:
+    return _tracker
@@ -0,0 +1,156 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.config import (
+    FRAME_CACHE_MAX_BYTES,
+    FRAME_CACHE_MAX_ENTRIES,
+    FRAME_CACHE_PERCEPTUAL_MAX_DISTANCE,
+    FRAME_CACHE_TTL_SECONDS,
+)
+
+# 결과 객체 자체(딕셔너리, 좌표 등)의 대략적인 크기
+_ENTRY_OVERHEAD_BYTES = 512
+
+
+def content_hash(image_data: bytes) -> bytes:
+    return hashlib.blake2b(image_data, digest_size=16).digest()
+
+
+def difference_hash(img: np.ndarray) -> int:
+    # dHash: 9x8 흑백 축소본에서 가로로 이웃한 픽셀의 밝기 대소를 64비트로 만든다.
+    gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY) if img.ndim == 3 else img
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).reshape(-1)
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def _result_bytes(result: Any) -> int:
+    size = _ENTRY_OVERHEAD_BYTES
+    for value in vars(result).values():
+        if isinstance(value, np.ndarray):
+            size += value.nbytes
+    return size
+
+
+@dataclass
+class FrameCacheEntry:
+    result: Any
+    perceptual_hash: Optional[int]
+    expires_at: float
+    size: int
+
+
+class FrameCache:
+    # 같은(또는 거의 같은) 프레임의 검출/임베딩 결과를 짧은 시간 동안 재사용한다.
+    # 키는 (내용 해시, 임베딩 포함 여부)이며, 임베딩까지 계산한 결과는 검출만 하는 요청에도 쓸 수 있다.
+    def __init__(
+        self,
+        ttl: float = FRAME_CACHE_TTL_SECONDS,
+        max_entries: int = FRAME_CACHE_MAX_ENTRIES,
+        max_bytes: int = FRAME_CACHE_MAX_BYTES,
+        max_distance: int = FRAME_CACHE_PERCEPTUAL_MAX_DISTANCE,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance
+        self._entries: "OrderedDict[Tuple[bytes, bool], FrameCacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.perceptual_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _pop_locked(self, key) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _get_locked(self, key, now: float) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self.expired += 1
+            self._pop_locked(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.result
+
+    def get(self, digest: bytes, embed: bool) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            result = self._get_locked((digest, True), now)
+            if result is None and not embed:
+                result = self._get_locked((digest, False), now)
+            if result is not None:
+                self.hits += 1
+            return result
+
+    def get_similar(self, perceptual_hash: int) -> Optional[Any]:
+        # 검출 전용 요청에만 쓴다. 다른 프레임의 결과이므로 호출하는 쪽에서 임베딩을 버려야 한다.
+        now = time.monotonic()
+        with self._lock:
+            best_key, best_distance = None, self.max_distance + 1
+            for key, entry in self._entries.items():
+                if entry.perceptual_hash is None or entry.expires_at <= now:
+                    continue
+                distance = bin(entry.perceptual_hash ^ perceptual_hash).count("1")
+                if distance < best_distance:
+                    best_key, best_distance = key, distance
+
+            if best_key is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_key)
+            self.perceptual_hits += 1
+            return self._entries[best_key].result
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def put(self, digest: bytes, embed: bool, result: Any, perceptual_hash: Optional[int] = None) -> None:
+        key = (digest, embed)
+        entry = FrameCacheEntry(result, perceptual_hash, time.monotonic() + self.ttl, _result_bytes(result))
+        with self._lock:
+            if key in self._entries:
+                self._pop_locked(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._pop_locked(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.perceptual_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "maxEntries": self.max_entries,
+                "maxBytes": self.max_bytes,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "perceptualHits": self.perceptual_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hitRate": round((self.hits + self.perceptual_hits) / lookups, 4) if lookups else None,
+            }
+
+
+_cache = FrameCache()
+
+
+def get_frame_cache() -> FrameCache:
+    return _cache
@@ -0,0 +1,42 @@
+import asyncio
+from typing import Optional, Tuple
+
+
+class LatestFrameSlot:
+    # 처리 중에 들어온 프레임은 큐에 쌓지 않고 가장 최근 것 하나만 남긴다(latest-frame-wins).
+    def __init__(self):
+        self._frame: Optional[Tuple[int, bytes]] = None
+        self._event = asyncio.Event()
+        self._closed = False
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+
+    def put(self, data: bytes) -> None:
+        self.received += 1
+        if self._frame is not None:
+            self.dropped += 1
+        self._frame = (self.received, data)
+        self._event.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._event.set()
+
+    async def get(self) -> Optional[Tuple[int, bytes]]:
+        while self._frame is None:
+            if self._closed:
+                return None
+            await self._event.wait()
+            self._event.clear()
+
+        frame, self._frame = self._frame, None
+        self.processed += 1
+        return frame
+
+    def get_stats(self) -> dict:
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,444 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import func
+
+from core.config import (
+    ANN_MIN_TEMPLATES,
+    GALLERY_INDEX_INITIAL_CAPACITY,
+    GALLERY_SNAPSHOT_COMPACT_BYTES,
+    GALLERY_SNAPSHOT_COMPACT_DEAD_RATIO,
+    GALLERY_SNAPSHOT_ENABLED,
+)
+from core.database import SessionLocal
+from core.models import FaceEmbedding
+from services.ann_index import IVFIndex, create_ann_index
+from services.face_matching import normalize_rows
+from services.gallery_snapshot import (
+    OP_ADD,
+    OP_REMOVE,
+    OP_REMOVE_USER,
+    GallerySnapshotStore,
+    decode_vector,
+    encode_vector,
+)
+
+logger = logging.getLogger(__name__)
+
+_index: Optional["GalleryIndex"] = None
+_index_lock = threading.Lock()
+
+_CHUNK_ROWS = 65536
+
+
+class Candidate(NamedTuple):
+    user_id: int
+    similarity: float
+    embedding_id: int
+
+
+class GalleryIndex:
+    # 전체 사용자의 얼굴 템플릿을 float32 행렬로 유지하는 1:N 검색용 인덱스.
+    # 행 공간 = [스냅샷 base 행(읽기 전용, memmap 가능)] + [이후 추가된 delta 행]. 삭제는 alive 마스크로 표시하고
+    # 행 번호는 바뀌지 않으므로, 빈 행은 스냅샷 압축 때 정리된다.
+    def __init__(
+        self,
+        capacity: int = GALLERY_INDEX_INITIAL_CAPACITY,
+        store: Optional[GallerySnapshotStore] = None,
+    ):
+        self.initial_capacity = capacity
+        self.store = store
+        self._lock = threading.RLock()
+        self.built = False
+        self.build_ms: Optional[float] = None
+        self.source: Optional[str] = None
+        self.ann: Optional[IVFIndex] = None
+        self.ann_train_ms: Optional[float] = None
+        self._compacting = False
+        self._reset()
+
+    def _reset(self, base: Optional[np.ndarray] = None) -> None:
+        self.dim = None if base is None else base.shape[1]
+        self.base = base
+        self.base_size = 0 if base is None else len(base)
+        self.capacity = self.initial_capacity
+        self.matrix: Optional[np.ndarray] = None
+        self.delta_size = 0
+        rows = self.base_size + self.capacity
+        self.embedding_ids = np.zeros((rows,), dtype=np.int64)
+        self.user_ids = np.zeros((rows,), dtype=np.int64)
+        self.alive = np.zeros((rows,), dtype=bool)
+        self.rows: Dict[int, int] = {}
+        self.size = 0
+        self.ann = None
+        self.generation: Optional[int] = None
+        self.log_offset = 0
+
+    @property
+    def total(self) -> int:
+        return self.base_size + self.delta_size
+
+    def _ensure_capacity(self, dim: int, required: int) -> None:
+        if self.dim is None:
+            self.dim = dim
+        elif dim != self.dim:
+            raise ValueError(f"Embedding dimension mismatch: expected {self.dim}, got {dim}")
+
+        if self.matrix is None:
+            self.matrix = np.zeros((self.capacity, dim), dtype=np.float32)
+
+        if required <= self.capacity:
+            return
+
+        capacity = max(required, self.capacity * 2)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[:self.delta_size] = self.matrix[:self.delta_size]
+        self.matrix = matrix
+        rows = self.base_size + capacity
+        self.embedding_ids = np.resize(self.embedding_ids, rows)
+        self.user_ids = np.resize(self.user_ids, rows)
+        alive = np.zeros((rows,), dtype=bool)
+        alive[:self.total] = self.alive[:self.total]
+        self.alive = alive
+        self.capacity = capacity
+        if self.ann is not None:
+            self.ann.resize(rows)
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        rows = np.asarray(rows)
+        if self.base_size == 0:
+            return self.matrix[rows]
+
+        out = np.empty((len(rows), self.dim), dtype=np.float32)
+        in_base = rows < self.base_size
+        out[in_base] = self.base[rows[in_base]]
+        if not in_base.all():
+            out[~in_base] = self.matrix[rows[~in_base] - self.base_size]
+        return out
+
+    def _iter_alive_chunks(self) -> Iterator[np.ndarray]:
+        alive_rows = np.flatnonzero(self.alive[:self.total])
+        for start in range(0, len(alive_rows), _CHUNK_ROWS):
+            yield self.vectors(alive_rows[start:start + _CHUNK_ROWS])
+
+    def _add_locked(self, embedding_ids: List[int], user_ids: List[int], embeddings: np.ndarray) -> None:
+        if len(embedding_ids) == 0:
+            return
+
+        # 템플릿은 id별로 불변이므로 이미 있는 id는 건너뛴다. (로그 재생이 중복되어도 안전)
+        embeddings = normalize_rows(embeddings)
+        keep = [i for i, embedding_id in enumerate(embedding_ids) if embedding_id not in self.rows]
+        if not keep:
+            return
+        if len(keep) != len(embedding_ids):
+            embedding_ids = [embedding_ids[i] for i in keep]
+            user_ids = [user_ids[i] for i in keep]
+            embeddings = embeddings[keep]
+
+        self._ensure_capacity(embeddings.shape[1], self.delta_size + len(embedding_ids))
+
+        start = self.delta_size
+        rows = np.arange(self.base_size + start, self.base_size + start + len(embedding_ids))
+        self.matrix[start:start + len(embedding_ids)] = embeddings
+        self.embedding_ids[rows] = embedding_ids
+        self.user_ids[rows] = user_ids
+        self.alive[rows] = True
+        self.rows.update(zip(embedding_ids, rows.tolist()))
+        self.delta_size += len(embedding_ids)
+        self.size += len(embedding_ids)
+
+        if self.ann is not None:
+            self.ann.set_rows(rows, embeddings)
+
+    def _remove_row_locked(self, row: int) -> None:
+        self.alive[row] = False
+        del self.rows[int(self.embedding_ids[row])]
+        self.size -= 1
+
+    def _remove_locked(self, embedding_id: int) -> None:
+        row = self.rows.get(embedding_id)
+        if row is not None:
+            self._remove_row_locked(row)
+
+    def _remove_user_locked(self, user_id: int) -> None:
+        rows = np.flatnonzero((self.user_ids[:self.total] == user_id) & self.alive[:self.total])
+        for row in rows.tolist():
+            self._remove_row_locked(row)
+
+    def train_ann(self, ann: Optional[IVFIndex] = None) -> None:
+        with self._lock:
+            ann = ann or create_ann_index()
+            if ann is None or self.size == 0:
+                self.ann = None
+                return
+
+            started = time.perf_counter()
+            alive_rows = np.flatnonzero(self.alive[:self.total])
+            sample = alive_rows
+            if len(sample) > ann.train_samples:
+                sample = np.sort(np.random.default_rng(0).choice(alive_rows, ann.train_samples, replace=False))
+            ann.train(self.vectors(sample), total=len(alive_rows))
+            ann.resize(len(self.alive))
+            for start in range(0, len(alive_rows), _CHUNK_ROWS):
+                rows = alive_rows[start:start + _CHUNK_ROWS]
+                ann.set_rows(rows, self.vectors(rows))
+            self.ann = ann
+            self.ann_train_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    def top_rows(self, probe: np.ndarray, count: int):
+        if self.ann is not None:
+            return self.ann.search(self.vectors, self.alive, self.total, probe, count)
+
+        scores = np.empty((self.total,), dtype=np.float32)
+        if self.base_size:
+            scores[:self.base_size] = self.base @ probe
+        if self.delta_size:
+            scores[self.base_size:] = self.matrix[:self.delta_size] @ probe
+        scores[~self.alive[:self.total]] = -np.inf
+
+        rows = np.argpartition(-scores, count - 1)[:count]
+        rows = rows[np.argsort(-scores[rows])]
+        return rows, scores[rows]
+
+    def _finish_load(self, source: str, started: float) -> None:
+        # 갤러리가 충분히 클 때만 근사 인덱스를 학습한다. 작은 갤러리는 전수 비교가 더 빠르고 정확하다.
+        if self.size >= ANN_MIN_TEMPLATES:
+            self.train_ann()
+        self.built = True
+        self.source = source
+        self.build_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    def load(self, embedding_ids: List[int], user_ids: List[int], embeddings: np.ndarray) -> None:
+        started = time.perf_counter()
+        with self._lock:
+            self._reset()
+            self._add_locked(embedding_ids, user_ids, embeddings)
+            self._finish_load("memory", started)
+
+    def load_snapshot(self) -> bool:
+        started = time.perf_counter()
+        with self._lock:
+            loaded = self.store.load()
+            if loaded is None:
+                return False
+
+            meta, embedding_ids, user_ids, matrix = loaded
+            self._reset(base=matrix if len(matrix) else None)
+            count = self.base_size
+            self.embedding_ids[:count] = embedding_ids
+            self.user_ids[:count] = user_ids
+            self.alive[:count] = True
+            self.rows = dict(zip(embedding_ids.tolist(), range(count)))
+            self.size = count
+            self.generation = meta["generation"]
+            self._replay_log_locked()
+            self._finish_load("snapshot", started)
+            return True
+
+    def build(self, db) -> None:
+        started = time.perf_counter()
+        with self._lock:
+            # 조회 이후에 커밋된 등록/삭제는 로그에 남으므로, 조회 직전 로그 위치부터 다시 반영한다.
+            log_offset = self.store.log_size() if self.store is not None else 0
+            rows = db.query(FaceEmbedding.id, FaceEmbedding.user_id, FaceEmbedding.embedding).all()
+            self._reset()
+            self.log_offset = log_offset
+            self._add_locked(
+                [row.id for row in rows],
+                [row.user_id for row in rows],
+                np.asarray([row.embedding for row in rows], dtype=np.float32),
+            )
+
+            if self.store is None:
+                self._finish_load("database", started)
+                return
+
+            self.compact()
+            self.source = "database"
+            self.build_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    def matches_database(self, db) -> bool:
+        count, max_id = db.query(func.count(FaceEmbedding.id), func.max(FaceEmbedding.id)).one()
+        with self._lock:
+            return count == self.size and (max_id or 0) == max(self.rows, default=0)
+
+    def _apply_locked(self, entry: dict) -> None:
+        if entry["op"] == OP_ADD:
+            self._add_locked([entry["id"]], [entry["userId"]], decode_vector(entry["vector"])[np.newaxis])
+        elif entry["op"] == OP_REMOVE:
+            self._remove_locked(entry["id"])
+        elif entry["op"] == OP_REMOVE_USER:
+            self._remove_user_locked(entry["userId"])
+
+    def _replay_log_locked(self) -> None:
+        entries, self.log_offset = self.store.read_log(self.log_offset)
+        for entry in entries:
+            self._apply_locked(entry)
+
+    def sync(self) -> None:
+        # 다른 워커가 남긴 로그 항목을 반영하고, 다른 워커가 압축했다면 새 스냅샷을 다시 연다.
+        if self.store is None or not self.built:
+            return
+
+        with self._lock:
+            meta = self.store.read_meta()
+            if meta is not None and meta["generation"] != self.generation:
+                self.load_snapshot()
+            elif self.store.log_size() != self.log_offset:
+                self._replay_log_locked()
+
+    def compact(self) -> None:
+        with self._lock:
+            with self.store.locked():
+                self._replay_log_locked()
+
+                alive_rows = np.flatnonzero(self.alive[:self.total])
+                meta = self.store.read_meta()
+                self.store.write(
+                    self.embedding_ids[alive_rows],
+                    self.user_ids[alive_rows],
+                    self._iter_alive_chunks(),
+                    self.dim or 0,
+                    generation=(meta["generation"] + 1) if meta else 1,
+                )
+            self.load_snapshot()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception:
+            logger.exception("Gallery snapshot compaction failed")
+        finally:
+            self._compacting = False
+
+    def _maybe_compact(self) -> None:
+        dead = self.total - self.size
+        if self._compacting:
+            return
+        if (
+            self.store.log_size() >= GALLERY_SNAPSHOT_COMPACT_BYTES
+            or (self.total and dead / self.total >= GALLERY_SNAPSHOT_COMPACT_DEAD_RATIO)
+        ):
+            self._compacting = True
+            threading.Thread(target=self._compact_in_background, name="gallery-compact", daemon=True).start()
+
+    def _record(self, entry: dict) -> None:
+        with self._lock:
+            if self.store is None:
+                if self.built:
+                    self._apply_locked(entry)
+                return
+
+            # 빌드 전에도 로그에는 남겨 둔다. 빌드 시 스냅샷 + 로그 재생으로 반영되고,
+            # 다른 워커도 같은 로그를 읽어 자신의 인덱스에 반영한다.
+            self.store.append(entry)
+            if self.built:
+                self.sync()
+                self._maybe_compact()
+
+    def add(self, embedding_id: int, user_id: int, embedding: np.ndarray) -> None:
+        self._record({"op": OP_ADD, "id": embedding_id, "userId": user_id, "vector": encode_vector(embedding)})
+
+    def remove(self, embedding_id: int) -> None:
+        self._record({"op": OP_REMOVE, "id": embedding_id})
+
+    def remove_user(self, user_id: int) -> None:
+        self._record({"op": OP_REMOVE_USER, "userId": user_id})
+
+    def search(self, probe: np.ndarray, k: int = 5) -> List[Candidate]:
+        self.sync()
+        with self._lock:
+            if self.size == 0 or k <= 0:
+                return []
+
+            # 한 사용자가 여러 템플릿을 가질 수 있으므로 여유 있게 뽑은 뒤 사용자별 최고 점수만 남긴다.
+            count = min(self.size, k * 4)
+            rows, scores = self.top_rows(normalize_rows(probe), count)
+
+            candidates: List[Candidate] = []
+            seen = set()
+            for row, score in zip(rows, scores):
+                user_id = int(self.user_ids[row])
+                if user_id in seen:
+                    continue
+                seen.add(user_id)
+                candidates.append(Candidate(user_id, float(score), int(self.embedding_ids[row])))
+                if len(candidates) >= k:
+                    break
+            return candidates
+
+    def get_stats(self) -> dict:
+        self.sync()
+        with self._lock:
+            return {
+                "built": self.built,
+                "source": self.source,
+                "buildMs": self.build_ms,
+                "templates": self.size,
+                "users": int(len(np.unique(self.user_ids[:self.total][self.alive[:self.total]]))),
+                "snapshotRows": self.base_size,
+                "deltaRows": self.delta_size,
+                "deadRows": self.total - self.size,
+                "generation": self.generation,
+                "logBytes": self.store.log_size() if self.store is not None else None,
+                "dim": self.dim,
+                "ann": self.ann.get_stats() if self.ann is not None else None,
+                "annTrainMs": self.ann_train_ms,
+            }
+
+
+def get_gallery_index(build: bool = True) -> GalleryIndex:
+    global _index
+
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = GalleryIndex(store=GallerySnapshotStore() if GALLERY_SNAPSHOT_ENABLED else None)
+
+    # 등록/삭제 경로는 build=False로 호출한다. 빌드 전이면 로그에만 남기고, 빌드 시 함께 반영된다.
+    if build and not _index.built:
+        build_gallery_index()
+    return _index
+
+
+def build_gallery_index() -> None:
+    index = get_gallery_index(build=False)
+
+    with _index_lock:
+        if index.built:
+            return
+
+        db = SessionLocal()
+        try:
+            # 스냅샷이 있으면 파일 매핑 + 로그 재생으로 시작하고, DB와 개수/최대 id가 다를 때만 전체를 다시 읽는다.
+            if index.store is not None:
+                try:
+                    if index.load_snapshot() and index.matches_database(db):
+                        logger.info("Gallery index mapped from snapshot: %d templates in %sms", index.size, index.build_ms)
+                        return
+                except Exception:
+                    logger.exception("Gallery snapshot unusable, rebuilding from database")
+                index.built = False
+
+            index.build(db)
+        finally:
+            db.close()
+
+    logger.info("Gallery index built from database: %d templates in %sms", index.size, index.build_ms)
+
+
+def _build_in_background() -> None:
+    try:
+        build_gallery_index()
+    except Exception:
+        # 첫 매칭 요청이 다시 빌드를 시도하므로 여기서는 기록만 한다.
+        logger.exception("Gallery index build failed")
+
+
+def start_gallery_index_build() -> threading.Thread:
+    thread = threading.Thread(target=_build_in_background, name="gallery-index-build", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,167 @@
+import base64
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from core.config import GALLERY_SNAPSHOT_DIR, GALLERY_SNAPSHOT_DTYPE
+
+SNAPSHOT_DTYPES = ("float32", "float16")
+
+OP_ADD = "add"
+OP_REMOVE = "remove"
+OP_REMOVE_USER = "removeUser"
+
+
+class SnapshotError(RuntimeError):
+    pass
+
+
+def encode_vector(vector: np.ndarray) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def decode_vector(data: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+
+
+class GallerySnapshotStore:
+    # 스냅샷(행렬 .npy + id 매핑 .npy + 메타) 이후의 등록/삭제는 추가 전용 로그에 쌓고, 압축 시 새 스냅샷으로 합친다.
+    def __init__(self, directory: Path = GALLERY_SNAPSHOT_DIR, dtype: str = GALLERY_SNAPSHOT_DTYPE):
+        if dtype not in SNAPSHOT_DTYPES:
+            raise ValueError(f"Unsupported gallery snapshot dtype: {dtype}")
+
+        self.directory = Path(directory)
+        self.dtype = dtype
+        self.matrix_path = self.directory / "gallery.npy"
+        self.ids_path = self.directory / "gallery_ids.npy"
+        self.meta_path = self.directory / "gallery.json"
+        self.log_path = self.directory / "gallery.log"
+        self.lock_path = self.directory / "gallery.lock"
+        self._held = threading.local()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @contextmanager
+    def locked(self, exclusive: bool = True):
+        # flock은 fd 단위라 같은 스레드가 다시 잠그면 스스로 막히므로, 이미 잡은 잠금은 그대로 쓴다.
+        if getattr(self._held, "depth", 0):
+            self._held.depth += 1
+            try:
+                yield
+            finally:
+                self._held.depth -= 1
+            return
+
+        # 여러 워커 프로세스가 같은 로그에 쓰므로 파일 잠금으로 추가/압축을 직렬화한다.
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._held.depth = 1
+            try:
+                yield
+            finally:
+                self._held.depth = 0
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read_meta(self) -> Optional[dict]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> Optional[Tuple[dict, np.ndarray, np.ndarray, np.ndarray]]:
+        with self.locked(exclusive=False):
+            meta = self.read_meta()
+            if meta is None or not self.matrix_path.exists() or not self.ids_path.exists():
+                return None
+
+            ids = np.load(self.ids_path)
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+
+        if matrix.shape != (meta["count"], meta["dim"]) or len(ids) != meta["count"]:
+            raise SnapshotError(f"Gallery snapshot is inconsistent: {matrix.shape} vs {meta}")
+
+        # float32 스냅샷은 memmap을 그대로 써서 워커 간에 페이지 캐시를 공유한다.
+        # float16 스냅샷은 디스크/로딩 비용만 줄이고, 검색용으로는 프로세스별 float32 사본을 만든다.
+        if matrix.dtype != np.float32:
+            matrix = np.asarray(matrix, dtype=np.float32)
+
+        return meta, ids[:, 0].copy(), ids[:, 1].copy(), matrix
+
+    def write(
+        self,
+        embedding_ids: np.ndarray,
+        user_ids: np.ndarray,
+        chunks: Iterable[np.ndarray],
+        dim: int,
+        generation: int,
+    ) -> dict:
+        count = len(embedding_ids)
+        matrix_tmp = self.matrix_path.with_suffix(".npy.tmp")
+        ids_tmp = self.ids_path.with_suffix(".npy.tmp")
+        meta_tmp = self.meta_path.with_suffix(".json.tmp")
+
+        matrix = np.lib.format.open_memmap(matrix_tmp, mode="w+", dtype=self.dtype, shape=(count, dim))
+        offset = 0
+        for chunk in chunks:
+            matrix[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+        matrix.flush()
+        del matrix
+
+        with open(ids_tmp, "wb") as f:
+            np.save(f, np.stack([embedding_ids, user_ids], axis=1).astype(np.int64))
+
+        meta = {
+            "generation": generation,
+            "count": count,
+            "dim": dim,
+            "dtype": self.dtype,
+            "maxId": int(embedding_ids.max()) if count else 0,
+            "createdAt": time.time(),
+        }
+        with open(meta_tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        os.replace(matrix_tmp, self.matrix_path)
+        os.replace(ids_tmp, self.ids_path)
+        os.replace(meta_tmp, self.meta_path)
+        open(self.log_path, "wb").close()
+        return meta
+
+    def append(self, entry: dict) -> None:
+        with self.locked():
+            with open(self.log_path, "ab") as f:
+                f.write(json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    def log_size(self) -> int:
+        try:
+            return os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            return 0
+
+    def read_log(self, offset: int) -> Tuple[List[dict], int]:
+        with self.locked(exclusive=False):
+            try:
+                with open(self.log_path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return [], 0
+
+        # 마지막 줄이 아직 완전히 쓰이지 않았다면 다음 번에 다시 읽는다.
+        complete = data.rfind(b"\n") + 1
+        entries = [json.loads(line) for line in data[:complete].splitlines() if line.strip()]
+        return entries, offset + complete
@@ -0,0 +1,139 @@
+import struct
+from io import BytesIO
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from core.config import MAX_IMAGE_PIXELS, MAX_IMAGE_SIDE
+
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"BM", "bmp"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# IMREAD_REDUCED_* 는 libjpeg의 DCT 단계에서 1/2, 1/4, 1/8로 줄여 디코딩한다.
+_REDUCED_FLAGS = ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2))
+
+# PIL 경로와 동일하게 EXIF 회전은 적용하지 않는다. (기존 등록 임베딩과의 호환)
+_COLOR_FLAGS = cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+
+
+class ImageDecodeError(ValueError):
+    pass
+
+
+class ImageTooLargeError(ImageDecodeError):
+    pass
+
+
+def sniff_format(image_data: bytes) -> Optional[str]:
+    for signature, image_format in _SIGNATURES:
+        if image_data.startswith(signature):
+            return image_format
+    if image_data[:4] == b"RIFF" and image_data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def _jpeg_size(image_data: bytes) -> Tuple[int, int]:
+    offset = 2
+    length = len(image_data)
+    while offset + 4 <= length:
+        if image_data[offset] != 0xFF:
+            raise ImageDecodeError("Malformed JPEG marker")
+        marker = image_data[offset + 1]
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            offset += 2
+            continue
+
+        segment_length = struct.unpack(">H", image_data[offset + 2:offset + 4])[0]
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > length:
+                break
+            height, width = struct.unpack(">HH", image_data[offset + 5:offset + 9])
+            return width, height
+        offset += 2 + segment_length
+
+    raise ImageDecodeError("JPEG frame header not found")
+
+
+def _png_size(image_data: bytes) -> Tuple[int, int]:
+    if len(image_data) < 24 or image_data[12:16] != b"IHDR":
+        raise ImageDecodeError("Malformed PNG header")
+    return struct.unpack(">II", image_data[16:24])
+
+
+def read_image_size(image_data: bytes, image_format: Optional[str] = None) -> Tuple[int, int]:
+    image_format = image_format or sniff_format(image_data)
+    if image_format == "jpeg":
+        return _jpeg_size(image_data)
+    if image_format == "png":
+        return _png_size(image_data)
+
+    # 그 외 형식은 PIL이 헤더만 읽도록 한다. (픽셀 디코딩 없음)
+    try:
+        with Image.open(BytesIO(image_data)) as img:
+            return img.size
+    except Exception as e:
+        raise ImageDecodeError(f"Unsupported or malformed image: {e}") from e
+
+
+def validate_image_header(image_data: bytes) -> Tuple[str, int, int]:
+    if not image_data:
+        raise ImageDecodeError("Empty image data")
+
+    image_format = sniff_format(image_data) or "unknown"
+    width, height = read_image_size(image_data, image_format)
+
+    if width <= 0 or height <= 0:
+        raise ImageDecodeError(f"Invalid image size: {width}x{height}")
+    if max(width, height) > MAX_IMAGE_SIDE or width * height > MAX_IMAGE_PIXELS:
+        raise ImageTooLargeError(f"Image too large: {width}x{height}")
+
+    return image_format, width, height
+
+
+def _reduced_flag(width: int, height: int, max_side: int) -> Optional[int]:
+    for factor, flag in _REDUCED_FLAGS:
+        if max(width, height) // factor >= max_side:
+            return flag
+    return None
+
+
+def _decode_with_pil(image_data: bytes) -> np.ndarray:
+    try:
+        with Image.open(BytesIO(image_data)) as img:
+            return np.asarray(img.convert("RGB"))
+    except Exception as e:
+        raise ImageDecodeError(f"Failed to decode image: {e}") from e
+
+
+# RGB uint8 배열과 원본 대비 축소 비율을 반환한다.
+def decode_image(image_data: bytes, max_side: int = 0) -> Tuple[np.ndarray, float]:
+    image_format, width, height = validate_image_header(image_data)
+
+    flags = _COLOR_FLAGS
+    if image_format == "jpeg" and max_side > 0:
+        reduced = _reduced_flag(width, height, max_side)
+        if reduced is not None:
+            flags = reduced | cv2.IMREAD_IGNORE_ORIENTATION
+
+    buffer = np.frombuffer(image_data, dtype=np.uint8)
+    img = cv2.imdecode(buffer, flags)
+    if img is None:
+        img = _decode_with_pil(image_data)
+    else:
+        # 흑백/RGBA도 IMREAD_COLOR가 바로 3채널로 디코딩하므로 채널 순서만 제자리에서 바꾼다.
+        cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img)
+
+    return img, img.shape[1] / width
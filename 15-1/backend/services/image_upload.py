@@ -0,0 +1,207 @@
+import base64
+import json
+from typing import Callable, List, Optional, Type
+
+from fastapi import HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from starlette.datastructures import UploadFile
+
+from core.config import MAX_UPLOAD_BYTES
+from services.image_decode import ImageDecodeError, ImageTooLargeError, sniff_format, validate_image_header
+from services.instrumentation import stage
+
+RAW_IMAGE_CONTENT_TYPES = ("image/jpeg", "image/jpg", "image/png", "image/webp", "application/octet-stream")
+MULTIPART_IMAGE_FIELDS = ("image", "file")
+
+# 형식 판별에 필요한 최소 바이트 수 (WEBP: RIFF....WEBP)
+_SNIFF_BYTES = 12
+# 이 크기 안에서 헤더를 찾지 못하면 본문을 다 받은 뒤에 한 번만 검사한다.
+_HEADER_WINDOW = 256 * 1024
+
+
+class ImageUpload:
+    # JSON(base64) / 원본 바이너리 / multipart 중 어떤 형식으로 받았든 라우터에서는 같은 방식으로 쓴다.
+    def __init__(self, payload: BaseModel, data: Optional[bytes] = None):
+        self.payload = payload
+        self.data = data
+
+    @property
+    def has_image(self) -> bool:
+        return self.data is not None or bool(getattr(self.payload, "image", None))
+
+    def get_image(self) -> bytes:
+        if self.data is not None:
+            return self.data
+
+        encoded = getattr(self.payload, "image", None)
+        if not encoded:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="얼굴 이미지를 제공해주세요.",
+            )
+        # 디코딩이 실패할 수 있는 경우는 JSON(base64) 요청뿐이다.
+        try:
+            with stage("base64"):
+                return base64.b64decode(encoded)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="잘못된 Base64 이미지 형식입니다.",
+            )
+
+
+def _payload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail="이미지 파일이 너무 큽니다.",
+    )
+
+
+def _check_image(data: bytes, complete: bool) -> bool:
+    # 헤더만으로 형식/해상도를 검사한다. 아직 헤더가 다 도착하지 않았으면 False를 반환한다.
+    if len(data) >= _SNIFF_BYTES and sniff_format(data) is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="지원하지 않는 이미지 형식입니다.",
+        )
+    try:
+        validate_image_header(data)
+    except ImageTooLargeError:
+        raise _payload_too_large()
+    except ImageDecodeError:
+        if complete:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="잘못된 이미지 형식입니다.",
+            )
+        return False
+    return True
+
+
+def _check_content_length(request: Request, limit: int) -> None:
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise _payload_too_large()
+
+
+async def read_body(request: Request, limit: int) -> bytes:
+    # chunked 전송처럼 Content-Length가 없는 본문도 한도를 넘는 순간 끊는다.
+    _check_content_length(request, limit)
+
+    chunks: List[bytes] = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise _payload_too_large()
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def read_image_stream(request: Request) -> bytes:
+    _check_content_length(request, MAX_UPLOAD_BYTES)
+
+    chunks: List[bytes] = []
+    size = 0
+    validated = False
+    async for chunk in request.stream():
+        if not chunk:
+            continue
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            raise _payload_too_large()
+
+        # 해상도가 한도를 넘거나 이미지가 아니면 본문을 끝까지 받기 전에 거절한다.
+        if not validated and size <= _HEADER_WINDOW:
+            head = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+            chunks = [head]
+            validated = _check_image(head, complete=False)
+
+    data = b"".join(chunks)
+    if not validated:
+        _check_image(data, complete=True)
+    return data
+
+
+async def _read_multipart_image(request: Request):
+    # multipart 오버헤드를 감안해 본문 전체 크기는 약간 여유를 둔다.
+    _check_content_length(request, MAX_UPLOAD_BYTES + 64 * 1024)
+    form = await request.form(max_files=1)
+
+    fields, data = {}, None
+    for key, value in form.multi_items():
+        if key in MULTIPART_IMAGE_FIELDS and isinstance(value, UploadFile):
+            if value.size is not None and value.size > MAX_UPLOAD_BYTES:
+                raise _payload_too_large()
+            data = await value.read()
+            _check_image(data, complete=True)
+        else:
+            fields[key] = value
+    return fields, data
+
+
+def _validate_payload(model: Type[BaseModel], fields: dict, placeholder: bool) -> BaseModel:
+    if placeholder:
+        # 이미지는 본문/파일 파트로 받았으므로 base64 필드는 검증용 빈 값으로 채운다.
+        fields = {**fields, "image": fields.get("image") or ""}
+    try:
+        return model.model_validate(fields)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+
+def image_upload(model: Type[BaseModel], raw: bool = True) -> Callable:
+    async def dependency(request: Request) -> ImageUpload:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+        if raw and content_type in RAW_IMAGE_CONTENT_TYPES:
+            # 이미지 외의 값(userId, topK, ticket 등)은 쿼리 문자열로 받는다.
+            data = await read_image_stream(request)
+            return ImageUpload(_validate_payload(model, dict(request.query_params), True), data)
+
+        if content_type == "multipart/form-data":
+            fields, data = await _read_multipart_image(request)
+            return ImageUpload(_validate_payload(model, fields, data is not None), data)
+
+        if content_type in ("", "application/json"):
+            body = await read_body(request, MAX_UPLOAD_BYTES * 4 // 3 + 64 * 1024)
+            try:
+                # Content-Type 없이 보낸 원본 이미지는 UTF-8로 읽을 수 없으므로 ValueError(UnicodeDecodeError)도 400으로 처리한다.
+                body = json.loads(body)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="잘못된 JSON 요청입니다.",
+                )
+            return ImageUpload(_validate_payload(model, body if isinstance(body, dict) else {}, False))
+
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="지원하지 않는 요청 형식입니다.",
+        )
+
+    return dependency
+
+
+def image_upload_openapi(model: Type[BaseModel], raw: bool = True) -> dict:
+    # 본문을 직접 읽으므로 문서에는 세 가지 요청 형식을 따로 적어 준다.
+    schema = model.model_json_schema()
+    binary_fields = {
+        name: field for name, field in schema.get("properties", {}).items() if name != "image"
+    }
+    content = {
+        "application/json": {"schema": schema},
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "properties": {"image": {"type": "string", "format": "binary"}, **binary_fields},
+                "required": [name for name in schema.get("required", []) if name == "image" or name in binary_fields],
+            }
+        },
+    }
+    if raw:
+        for content_type in ("image/jpeg", "image/png"):
+            content[content_type] = {"schema": {"type": "string", "format": "binary"}}
+    return {"requestBody": {"required": True, "content": content}}
@@ -0,0 +1,94 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import numpy as np
+
+from core.config import (
+    INFERENCE_BATCH_MAX_SIZE,
+    INFERENCE_BATCH_MAX_WAIT_MS,
+    INFERENCE_BATCH_TIMEOUT_SECONDS,
+)
+from services.metrics import Counter, Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+QUEUE_WAIT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250)
+
+
+class InferenceBatcher:
+    def __init__(
+        self,
+        forward_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = INFERENCE_BATCH_MAX_SIZE,
+        max_wait_ms: float = INFERENCE_BATCH_MAX_WAIT_MS,
+        name: str = "inference-batcher",
+    ):
+        self.forward_fn = forward_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+        self.forward_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+        self.errors = Counter()
+
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, face: np.ndarray) -> Future:
+        future: Future = Future()
+        self._queue.put((face, future, time.perf_counter()))
+        return future
+
+    def run(self, face: np.ndarray, timeout: Optional[float] = INFERENCE_BATCH_TIMEOUT_SECONDS) -> np.ndarray:
+        return self.submit(face).result(timeout=timeout)
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+
+            for _, _, enqueued_at in batch:
+                self.queue_wait_ms.observe((started - enqueued_at) * 1000)
+            self.batch_size.observe(len(batch))
+
+            try:
+                embeddings = self.forward_fn(np.stack([face for face, _, _ in batch]))
+                for (_, future, _), embedding in zip(batch, embeddings):
+                    future.set_result(embedding)
+            except Exception as e:
+                self.errors.inc()
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                self.forward_ms.observe((time.perf_counter() - started) * 1000)
+
+    def get_stats(self) -> dict:
+        return {
+            "maxBatchSize": self.max_batch_size,
+            "maxWaitMs": self.max_wait * 1000,
+            "queueDepth": self._queue.qsize(),
+            "errors": self.errors.value,
+            "batchSize": self.batch_size.snapshot(),
+            "queueWaitMs": self.queue_wait_ms.snapshot(),
+            "forwardMs": self.forward_ms.snapshot(),
+        }
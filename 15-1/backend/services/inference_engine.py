@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core.config import INFERENCE_ENGINE, RECOGNIZER_PRECISION
+from services.face_recognition import DETECTOR_BACKEND, MODEL_NAME, ensure_deepface
+
+
+class FaceRegion(NamedTuple):
+    x: int
+    y: int
+    w: int
+    h: int
+    left_eye: Optional[Tuple[int, int]]
+    right_eye: Optional[Tuple[int, int]]
+    confidence: float
+
+
+class InferenceEngine(ABC):
+    name = "base"
+    detector_name = DETECTOR_BACKEND
+    recognizer_name = MODEL_NAME
+    # DeepFace.extract_faces(align=True)는 검출 전에 가로/세로 50%씩 검은 테두리를 붙인다.
+    # 기존에 등록된 템플릿과 같은 박스를 얻으려면 검출기에도 똑같이 붙여야 한다.
+    detection_border = 0.5
+
+    @abstractmethod
+    def ensure_available(self) -> None:
+        ...
+
+    @abstractmethod
+    def load_detector(self) -> Any:
+        ...
+
+    @abstractmethod
+    def load_recognizer(self) -> Any:
+        ...
+
+    def detect_faces(self, detector: Any, img: np.ndarray) -> List[Any]:
+        return detector.detect_faces(img)
+
+    @abstractmethod
+    def represent(self, recognizer: Any, batch: np.ndarray) -> np.ndarray:
+        ...
+
+
+class DeepFaceEngine(InferenceEngine):
+    name = "deepface"
+
+    def ensure_available(self) -> None:
+        ensure_deepface()
+
+    def load_detector(self) -> Any:
+        from deepface import DeepFace
+
+        return DeepFace.build_model(model_name=self.detector_name, task="face_detector")
+
+    def load_recognizer(self) -> Any:
+        from deepface import DeepFace
+
+        return DeepFace.build_model(model_name=self.recognizer_name, task="facial_recognition")
+
+    def represent(self, recognizer: Any, batch: np.ndarray) -> np.ndarray:
+        return np.asarray(recognizer.forward(batch), dtype=np.float32).reshape(len(batch), -1)
+
+
+def create_engine(name: str, precision: str = RECOGNIZER_PRECISION) -> InferenceEngine:
+    if name == "deepface":
+        if precision != "fp32":
+            raise ValueError("The deepface engine only supports fp32. Use INFERENCE_ENGINE=onnx for int8.")
+        return DeepFaceEngine()
+    if name == "onnx":
+        from services.onnx_engine import OnnxEngine
+
+        return OnnxEngine(precision=precision)
+    if name == "stub":
+        from services.stub_engine import StubEngine
+
+        return StubEngine()
+    raise ValueError(f"Unknown inference engine: {name}")
+
+
+_engine: Optional[InferenceEngine] = None
+
+
+def get_engine() -> InferenceEngine:
+    global _engine
+
+    if _engine is None:
+        _engine = create_engine(INFERENCE_ENGINE)
+    return _engine
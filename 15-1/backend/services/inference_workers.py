@@ -0,0 +1,257 @@
+import itertools
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from core.config import (
+    INFERENCE_WORKER_MAX_RSS_MB,
+    INFERENCE_WORKER_TIMEOUT_SECONDS,
+    INFERENCE_WORKERS,
+)
+from services.metrics import get_process_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+MONITOR_INTERVAL_SECONDS = 1.0
+
+
+def _worker_main(worker_id: int, request_queue, response_queue, max_rss_bytes: int) -> None:
+    from services.face_pipeline import run_face_pipeline_on_array
+    from services.instrumentation import collect_stages
+    from services.model_manager import get_model_status, load_models
+
+    load_models()
+    response_queue.put(("ready", worker_id, None, get_model_status()))
+
+    recycling = False
+    while True:
+        task = request_queue.get()
+        if task is None:
+            break
+
+        task_id, shm_name, shape, dtype, embed = task
+        shm = None
+        try:
+            shm = shared_memory.SharedMemory(name=shm_name)
+            img = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            with collect_stages() as timings:
+                result = run_face_pipeline_on_array(img, embed=embed, batched=False)
+            payload = {
+                "detected": result.detected,
+                "facial_area": result.facial_area,
+                "face": None if result.face is None else np.array(result.face, copy=True),
+                "quality": result.quality,
+                "quality_reason": result.quality_reason,
+                "embedding": result.embedding,
+                "stage_timings": timings,
+            }
+            del img
+            response_queue.put(("done", worker_id, task_id, payload))
+        except Exception as e:
+            response_queue.put(("error", worker_id, task_id, str(e)))
+        finally:
+            if shm is not None:
+                shm.close()
+
+        rss = get_process_rss_bytes()
+        if max_rss_bytes and rss > max_rss_bytes and not recycling:
+            # 이미 이 워커에 배정된 작업은 마저 처리하고, 부모가 큐 끝에 넣는 종료 신호를 받으면 나간다.
+            response_queue.put(("recycle", worker_id, None, rss))
+            recycling = True
+
+
+class InferenceWorkerPool:
+    def __init__(
+        self,
+        num_workers: int = INFERENCE_WORKERS,
+        max_rss_mb: int = INFERENCE_WORKER_MAX_RSS_MB,
+        timeout: float = INFERENCE_WORKER_TIMEOUT_SECONDS,
+    ):
+        self.num_workers = max(1, num_workers)
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.timeout = timeout
+
+        self._ctx = mp.get_context("spawn")
+        self._response_queue = self._ctx.Queue()
+        self._task_ids = itertools.count()
+        self._pending: dict[int, tuple[Future, shared_memory.SharedMemory, int, tuple]] = {}
+        # 작업은 보낼 때 워커를 정해 그 워커의 큐에 넣는다. 워커가 죽으면 배정된 작업을 바로 실패시킬 수 있다.
+        self._request_queues: dict[int, mp.Queue] = {}
+        self._assigned: dict[int, set[int]] = {}
+        self._draining: set[int] = set()
+        self._processes: dict[int, mp.Process] = {}
+        self._worker_status: dict[int, dict] = {}
+        self._restarts = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> None:
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+
+        threading.Thread(target=self._collect_responses, name="inference-responses", daemon=True).start()
+        threading.Thread(target=self._monitor, name="inference-monitor", daemon=True).start()
+
+    def _spawn(self, worker_id: int, carried_task_ids=()) -> None:
+        # 종료 중에 새 워커를 띄우지 않도록 shutdown과 같은 잠금 안에서 시작하고 등록한다.
+        with self._lock:
+            if self._closed:
+                return
+            request_queue = self._ctx.Queue()
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(worker_id, request_queue, self._response_queue, self.max_rss_bytes),
+                name=f"inference-worker-{worker_id}",
+                daemon=True,
+            )
+            process.start()
+            self._request_queues[worker_id] = request_queue
+            self._assigned[worker_id] = set()
+            self._draining.discard(worker_id)
+            self._processes[worker_id] = process
+            for task_id in carried_task_ids:
+                pending = self._pending.get(task_id)
+                if pending is not None:
+                    self._assigned[worker_id].add(task_id)
+                    request_queue.put(pending[3])
+        self._worker_status[worker_id] = {"pid": process.pid, "ready": False, "rssBytes": None, "models": None}
+
+    def _finish(self, task_id: int, payload=None, error: Optional[str] = None) -> None:
+        with self._lock:
+            pending = self._pending.pop(task_id, None)
+            if pending is not None:
+                self._assigned[pending[2]].discard(task_id)
+        if pending is None:
+            return
+
+        future, shm, _, _ = pending
+        shm.close()
+        shm.unlink()
+
+        if error is not None:
+            future.set_exception(RuntimeError(error))
+        else:
+            future.set_result(payload)
+
+    def _collect_responses(self) -> None:
+        while not self._closed:
+            try:
+                kind, worker_id, task_id, payload = self._response_queue.get(timeout=MONITOR_INTERVAL_SECONDS)
+            except queue.Empty:
+                continue
+
+            if kind == "ready":
+                self._worker_status[worker_id].update({"ready": payload["ready"], "models": payload["models"]})
+            elif kind == "done":
+                self._finish(task_id, payload=payload)
+            elif kind == "error":
+                self._finish(task_id, error=payload)
+            elif kind == "recycle":
+                self._worker_status[worker_id]["rssBytes"] = payload
+                logger.info("Recycling inference worker %d (rss=%dMB)", worker_id, payload // (1024 * 1024))
+                # 새 작업은 다른 워커로 보내고, 이미 배정된 작업 뒤에 종료 신호를 넣는다.
+                with self._lock:
+                    self._draining.add(worker_id)
+                    self._request_queues[worker_id].put(None)
+
+    def _monitor(self) -> None:
+        while not self._closed:
+            time.sleep(MONITOR_INTERVAL_SECONDS)
+            for worker_id, process in list(self._processes.items()):
+                if process.is_alive() or self._closed:
+                    continue
+
+                process.join()
+                with self._lock:
+                    task_ids = list(self._assigned[worker_id])
+                    recycled = worker_id in self._draining and process.exitcode == 0
+                if recycled:
+                    # 정리 후 정상 종료한 워커는 종료 신호 뒤에 배정된 작업을 꺼내지 않았으므로 새 워커에 넘긴다.
+                    carried_task_ids = task_ids
+                else:
+                    # 죽은 워커가 처리 중이던 작업뿐 아니라 그 큐에서 기다리던 작업도 더는 처리되지 않는다.
+                    carried_task_ids = ()
+                    for task_id in task_ids:
+                        self._finish(task_id, error=f"inference worker exited with code {process.exitcode}")
+
+                self._restarts += 1
+                self._spawn(worker_id, carried_task_ids)
+
+    def run(self, img: np.ndarray, embed: bool = True) -> dict:
+        img = np.ascontiguousarray(img)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, img.nbytes))
+        np.ndarray(img.shape, dtype=img.dtype, buffer=shm.buf)[:] = img
+
+        task_id = next(self._task_ids)
+        future: Future = Future()
+        with self._lock:
+            # 정리 중이 아닌 워커 가운데 배정된 작업이 가장 적은 워커로 보낸다.
+            workers = [worker_id for worker_id in self._processes if worker_id not in self._draining] or list(self._processes)
+            worker_id = min(workers, key=lambda candidate: len(self._assigned[candidate]))
+            task = (task_id, shm.name, img.shape, img.dtype.str, embed)
+            self._pending[task_id] = (future, shm, worker_id, task)
+            self._assigned[worker_id].add(task_id)
+            self._request_queues[worker_id].put(task)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except Exception:
+            self._finish(task_id, error="inference worker timed out")
+            raise
+
+    def is_ready(self) -> bool:
+        return any(status["ready"] for status in self._worker_status.values())
+
+    def get_status(self) -> dict:
+        return {
+            "ready": self.is_ready(),
+            "workers": {str(worker_id): dict(status) for worker_id, status in self._worker_status.items()},
+            "restarts": self._restarts,
+            "pending": len(self._pending),
+        }
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            self._closed = True
+            request_queues = list(self._request_queues.values())
+            processes = list(self._processes.values())
+        for request_queue in request_queues:
+            request_queue.put(None)
+        for process in processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+
+        for task_id in list(self._pending):
+            self._finish(task_id, error="inference worker pool shut down")
+
+
+_pool: Optional[InferenceWorkerPool] = None
+
+
+def start_worker_pool() -> InferenceWorkerPool:
+    global _pool
+
+    if _pool is None:
+        _pool = InferenceWorkerPool()
+        _pool.start()
+    return _pool
+
+
+def get_worker_pool() -> Optional[InferenceWorkerPool]:
+    return _pool
+
+
+def stop_worker_pool() -> None:
+    global _pool
+
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
@@ -0,0 +1,242 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from core.config import METRICS_ENABLED
+from services.metrics import MetricsRegistry, get_process_rss_bytes, render_family
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+DB_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# 라벨 조합이 무한히 늘지 않도록 쿼리 분류 결과는 이 개수까지만 기억한다.
+_STATEMENT_CACHE_SIZE = 1024
+_TABLE_PATTERN = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+[\"`]?(\w+)", re.IGNORECASE)
+
+registry = MetricsRegistry()
+
+http_request_seconds = registry.histogram(
+    "faceauth_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+    HTTP_BUCKETS,
+)
+pipeline_stage_seconds = registry.histogram(
+    "faceauth_pipeline_stage_duration_seconds",
+    "Face pipeline latency by stage.",
+    ("stage",),
+    STAGE_BUCKETS,
+)
+db_query_seconds = registry.histogram(
+    "faceauth_db_query_duration_seconds",
+    "Database round-trip latency by operation and table.",
+    ("operation", "table"),
+    DB_BUCKETS,
+)
+
+_local = threading.local()
+_statements: Dict[str, Tuple[str, str]] = {}
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    if not METRICS_ENABLED:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        collector = getattr(_local, "collector", None)
+        if collector is not None:
+            collector[name] = collector.get(name, 0.0) + elapsed
+        else:
+            pipeline_stage_seconds.labels(name).observe(elapsed)
+
+
+@contextmanager
+def collect_stages() -> Iterator[Dict[str, float]]:
+    # 추론 워커 프로세스에서는 레지스트리가 따로 있으므로, 단계별 시간을 모아 결과와 함께 부모로 보낸다.
+    timings: Dict[str, float] = {}
+    _local.collector = timings
+    try:
+        yield timings
+    finally:
+        _local.collector = None
+
+
+def observe_stages(timings: Optional[Dict[str, float]]) -> None:
+    if not METRICS_ENABLED or not timings:
+        return
+    for name, elapsed in timings.items():
+        pipeline_stage_seconds.labels(name).observe(elapsed)
+
+
+def _classify_statement(statement: str) -> Tuple[str, str]:
+    labels = _statements.get(statement)
+    if labels is not None:
+        return labels
+
+    operation = (statement.split(None, 1) or ["OTHER"])[0].upper()
+    match = _TABLE_PATTERN.search(statement)
+    labels = (operation, match.group(1).lower() if match else "")
+    if len(_statements) < _STATEMENT_CACHE_SIZE:
+        _statements[statement] = labels
+    return labels
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    db_query_seconds.labels(*_classify_statement(statement)).observe(elapsed)
+
+
+def _handle_error(exception_context) -> None:
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def _before_commit(session) -> None:
+    session.info["commit_started"] = time.perf_counter()
+
+
+def _after_commit(session) -> None:
+    # flush(INSERT/UPDATE)와 COMMIT을 합친 시간. 개별 구문 시간은 위의 쿼리 히스토그램에 따로 남는다.
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        db_query_seconds.labels("COMMIT", "").observe(time.perf_counter() - started)
+
+
+def _after_rollback(session) -> None:
+    session.info.pop("commit_started", None)
+
+
+def instrument_database(engine, session_factory) -> None:
+    if not METRICS_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    event.listen(session_factory, "before_commit", _before_commit)
+    event.listen(session_factory, "after_commit", _after_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
+
+
+class MetricsMiddleware:
+    # BaseHTTPMiddleware를 거치지 않는 순수 ASGI 미들웨어라 요청당 오버헤드가 작다.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # 경로 파라미터가 라벨로 새지 않도록 매칭된 라우트의 템플릿을 쓴다.
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            http_request_seconds.labels(scope["method"], path, str(status_code)).observe(
+                time.perf_counter() - started
+            )
+
+
+def _collect_runtime() -> List[str]:
+    from services.face_pipeline import get_batcher_stats
+    from services.inference_workers import get_worker_pool
+    from services.model_manager import get_model_status
+
+    lines = render_family(
+        "process_resident_memory_bytes", "gauge", "Resident memory of the API process.",
+        [({}, get_process_rss_bytes())],
+    )
+
+    batcher = get_batcher_stats()
+    pool = get_worker_pool()
+    pool_status = pool.get_status() if pool is not None else None
+    lines += render_family(
+        "faceauth_inference_queue_depth", "gauge", "Face inference requests waiting in each queue.",
+        [
+            ({"queue": "batcher"}, batcher["queueDepth"] if batcher else 0),
+            ({"queue": "workers"}, pool_status["pending"] if pool_status else 0),
+        ],
+    )
+
+    if pool_status is not None:
+        workers = pool_status["workers"]
+        lines += render_family(
+            "faceauth_model_ready", "gauge", "Whether the models are loaded and warmed up.",
+            [({"worker": worker_id}, worker["ready"]) for worker_id, worker in workers.items()],
+        )
+        lines += render_family(
+            "faceauth_inference_worker_resident_memory_bytes", "gauge", "Resident memory reported by inference workers.",
+            [({"worker": worker_id}, worker["rssBytes"]) for worker_id, worker in workers.items()],
+        )
+        lines += render_family(
+            "faceauth_inference_worker_restarts_total", "counter", "Inference worker restarts.",
+            [({}, pool_status["restarts"])],
+        )
+    else:
+        model_status = get_model_status()
+        lines += render_family(
+            "faceauth_model_ready", "gauge", "Whether the models are loaded and warmed up.",
+            [({"model": key}, entry["loaded"]) for key, entry in model_status["models"].items()],
+        )
+        lines += render_family(
+            "faceauth_model_loading", "gauge", "Whether a model load is in progress.",
+            [({}, model_status["loading"])],
+        )
+    return lines
+
+
+def _collect_caches() -> List[str]:
+    from services.frame_cache import get_frame_cache
+    from services.template_cache import get_template_cache
+
+    template_stats = get_template_cache().get_stats()
+    frame_stats = get_frame_cache().get_stats()
+    return render_family(
+        "faceauth_cache_lookups_total", "counter", "Cache lookups by cache and result.",
+        [
+            ({"cache": "template", "result": "hit"}, template_stats["hits"]),
+            ({"cache": "template", "result": "miss"}, template_stats["misses"]),
+            ({"cache": "template", "result": "stale"}, template_stats["stale"]),
+            ({"cache": "template", "result": "expired"}, template_stats["expired"]),
+            ({"cache": "frame", "result": "hit"}, frame_stats["hits"]),
+            ({"cache": "frame", "result": "perceptual_hit"}, frame_stats["perceptualHits"]),
+            ({"cache": "frame", "result": "miss"}, frame_stats["misses"]),
+            ({"cache": "frame", "result": "expired"}, frame_stats["expired"]),
+        ],
+    )
+
+
+registry.register_collector(_collect_runtime)
+registry.register_collector(_collect_caches)
+
+
+def render_metrics() -> str:
+    return registry.render()
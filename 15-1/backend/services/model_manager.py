@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+from core.config import MODEL_WARMUP
+from services.inference_engine import get_engine
+
+logger = logging.getLogger(__name__)
+
+WARMUP_FRAME_SHAPE = (480, 640, 3)
+WARMUP_FACE_SHAPE = (112, 112, 3)
+
+_lock = threading.Lock()
+_loading = False
+_model_locks = {"detector": threading.Lock(), "recognizer": threading.Lock()}
+_handles: dict[str, Any] = {"detector": None, "recognizer": None}
+_status: dict[str, dict] = {
+    "detector": {"name": get_engine().detector_name, "loaded": False, "loadMs": None, "warmupMs": None, "error": None},
+    "recognizer": {"name": get_engine().recognizer_name, "loaded": False, "loadMs": None, "warmupMs": None, "error": None},
+}
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _load_detector() -> Any:
+    return get_engine().load_detector()
+
+
+def _load_recognizer() -> Any:
+    return get_engine().load_recognizer()
+
+
+def _warmup_detector(detector: Any) -> None:
+    get_engine().detect_faces(detector, np.zeros(WARMUP_FRAME_SHAPE, dtype=np.uint8))
+
+
+def _warmup_recognizer(recognizer: Any) -> None:
+    get_engine().represent(recognizer, np.zeros((1,) + WARMUP_FACE_SHAPE, dtype=np.float32))
+
+
+_LOADERS = {
+    "detector": (_load_detector, _warmup_detector),
+    "recognizer": (_load_recognizer, _warmup_recognizer),
+}
+
+
+def _load_model(key: str, warmup: bool) -> Any:
+    with _model_locks[key]:
+        if _handles[key] is not None:
+            return _handles[key]
+
+        loader, warmer = _LOADERS[key]
+        entry = _status[key]
+        try:
+            started = time.perf_counter()
+            handle = loader()
+            entry["loadMs"] = _elapsed_ms(started)
+
+            if warmup:
+                started = time.perf_counter()
+                warmer(handle)
+                entry["warmupMs"] = _elapsed_ms(started)
+
+            _handles[key] = handle
+            entry["loaded"] = True
+            entry["error"] = None
+        except Exception as e:
+            entry["error"] = str(e)
+            logger.exception("Error loading %s model", key)
+
+        return _handles[key]
+
+
+def load_models(warmup: bool = MODEL_WARMUP) -> bool:
+    global _loading
+
+    with _lock:
+        if _loading:
+            return False
+        _loading = True
+
+    try:
+        get_engine().ensure_available()
+        for key in _LOADERS:
+            _load_model(key, warmup)
+    except RuntimeError as e:
+        for entry in _status.values():
+            entry["error"] = str(e)
+    finally:
+        with _lock:
+            _loading = False
+
+    return is_ready()
+
+
+def start_model_preload() -> threading.Thread:
+    thread = threading.Thread(target=load_models, name="model-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_ready() -> bool:
+    return all(entry["loaded"] for entry in _status.values())
+
+
+def get_detector() -> Any:
+    get_engine().ensure_available()
+    return _handles["detector"] or _load_model("detector", warmup=False)
+
+
+def get_recognizer() -> Any:
+    get_engine().ensure_available()
+    return _handles["recognizer"] or _load_model("recognizer", warmup=False)
+
+
+def get_model_status() -> dict:
+    return {
+        "ready": is_ready(),
+        "engine": get_engine().name,
+        "loading": _loading,
+        "models": {key: dict(entry) for key, entry in _status.items()},
+    }
@@ -0,0 +1,111 @@
+import os
+from typing import Any, List, Optional
+
+import cv2
+import numpy as np
+
+from core.config import (
+    ONNX_INTRA_OP_THREADS,
+    ONNX_RECOGNIZER_INT8_PATH,
+    ONNX_RECOGNIZER_PATH,
+    RECOGNIZER_PRECISION,
+)
+from services.face_alignment import find_eyes, load_eye_detector
+from services.face_recognition import MODEL_BASE_DIR, MODEL_NAME
+from services.inference_engine import FaceRegion, InferenceEngine
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+WEIGHTS_DIR = os.path.join(MODEL_BASE_DIR, ".deepface", "weights")
+SSD_PROTOTXT_PATH = os.path.join(WEIGHTS_DIR, "deploy.prototxt")
+SSD_CAFFEMODEL_PATH = os.path.join(WEIGHTS_DIR, "res10_300x300_ssd_iter_140000.caffemodel")
+
+RECOGNIZER_PATHS = {
+    "fp32": ONNX_RECOGNIZER_PATH,
+    "int8": ONNX_RECOGNIZER_INT8_PATH,
+}
+
+SSD_INPUT_SIZE = (300, 300)
+SSD_CONFIDENCE_THRESHOLD = 0.90
+SSD_MARGIN = 0.01
+
+
+class SsdDetector:
+    # DeepFace의 ssd 백엔드와 같은 res10 가중치와 후처리를 TensorFlow 없이 OpenCV DNN으로 실행한다.
+    def __init__(self, prototxt_path: str = SSD_PROTOTXT_PATH, caffemodel_path: str = SSD_CAFFEMODEL_PATH):
+        if not os.path.exists(prototxt_path) or not os.path.exists(caffemodel_path):
+            raise RuntimeError(
+                f"SSD weights not found in {WEIGHTS_DIR}. Run scripts/download_models.py first."
+            )
+        self.net = cv2.dnn.readNetFromCaffe(prototxt_path, caffemodel_path)
+        self.eye_detector = load_eye_detector()
+
+    def detect_faces(self, img: np.ndarray) -> List[FaceRegion]:
+        height, width = img.shape[:2]
+        aspect_ratio_x = width / SSD_INPUT_SIZE[1]
+        aspect_ratio_y = height / SSD_INPUT_SIZE[0]
+
+        self.net.setInput(cv2.dnn.blobFromImage(image=cv2.resize(img, SSD_INPUT_SIZE)))
+        detections = self.net.forward()[0][0]
+
+        detections = detections[(detections[:, 1] == 1) & (detections[:, 2] >= SSD_CONFIDENCE_THRESHOLD)]
+        detections[:, 3:7] = np.trunc(np.clip(detections[:, 3:7], SSD_MARGIN, 1 - SSD_MARGIN) * SSD_INPUT_SIZE[0])
+
+        regions = []
+        for detection in detections:
+            left, top, right, bottom = detection[3:7]
+            x = int(left * aspect_ratio_x)
+            y = int(top * aspect_ratio_y)
+            w = int((right - left) * aspect_ratio_x)
+            h = int((bottom - top) * aspect_ratio_y)
+
+            left_eye, right_eye = find_eyes(self.eye_detector, img[y:y + h, x:x + w])
+            if left_eye is not None:
+                left_eye = (x + left_eye[0], y + left_eye[1])
+            if right_eye is not None:
+                right_eye = (x + right_eye[0], y + right_eye[1])
+
+            regions.append(FaceRegion(x, y, w, h, left_eye, right_eye, float(detection[2])))
+
+        return regions
+
+
+class OnnxEngine(InferenceEngine):
+    name = "onnx"
+
+    def __init__(self, precision: str = RECOGNIZER_PRECISION, recognizer_path: Optional[str] = None):
+        if precision not in RECOGNIZER_PATHS:
+            raise ValueError(f"Unknown recognizer precision: {precision}")
+
+        self.precision = precision
+        self.recognizer_path = recognizer_path or RECOGNIZER_PATHS[precision]
+        if precision != "fp32":
+            self.recognizer_name = f"{MODEL_NAME}-{precision}"
+
+    def ensure_available(self) -> None:
+        if not ONNXRUNTIME_AVAILABLE:
+            raise RuntimeError("onnxruntime is not installed. Please install it first.")
+
+    def load_detector(self) -> Any:
+        return SsdDetector()
+
+    def load_recognizer(self) -> Any:
+        if not os.path.exists(self.recognizer_path):
+            hint = "scripts/quantize_model.py" if self.precision == "int8" else "scripts/download_models.py --export-onnx"
+            raise RuntimeError(f"ONNX recognizer not found at {self.recognizer_path}. Run {hint} first.")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if ONNX_INTRA_OP_THREADS > 0:
+            options.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+
+        return ort.InferenceSession(self.recognizer_path, sess_options=options, providers=["CPUExecutionProvider"])
+
+    def represent(self, recognizer: Any, batch: np.ndarray) -> np.ndarray:
+        input_name = recognizer.get_inputs()[0].name
+        outputs = recognizer.run(None, {input_name: np.ascontiguousarray(batch, dtype=np.float32)})
+        return np.asarray(outputs[0], dtype=np.float32).reshape(len(batch), -1)
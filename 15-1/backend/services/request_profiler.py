@@ -0,0 +1,296 @@
+import json
+import logging
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+
+from core.config import (
+    BASE_DIR,
+    PROFILE_DIR,
+    PROFILE_HEADER,
+    PROFILE_INTERVAL_MS,
+    PROFILE_MAX_CONCURRENT,
+    PROFILE_MAX_FILES,
+    PROFILE_SAMPLE_RATE,
+)
+from core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID_PATTERN = re.compile(r"^\d{8}-\d{6}-[0-9a-f]{8}$")
+EXCLUDED_PATHS = ("/metrics", "/admin/profiles")
+TOP_FUNCTIONS = 40
+
+_SITE_PACKAGES = f"site-packages{os.sep}"
+
+
+def _label(code) -> str:
+    filename = code.co_filename
+    if _SITE_PACKAGES in filename:
+        filename = filename.split(_SITE_PACKAGES, 1)[1]
+    elif filename.startswith(str(BASE_DIR)):
+        filename = os.path.relpath(filename, BASE_DIR)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _dependency_codes(dependant, codes: Set) -> None:
+    call = getattr(dependant, "call", None)
+    code = getattr(call, "__code__", None)
+    if code is not None:
+        codes.add(code)
+    for sub_dependant in getattr(dependant, "dependencies", ()):
+        _dependency_codes(sub_dependant, codes)
+
+
+class RequestProfile:
+    # sys._current_frames()로 모든 스레드의 스택을 주기적으로 떠서, 이 요청에 속한 스택만 모은다.
+    # 동기 핸들러는 스레드풀에서, 임베딩은 배처 스레드에서 돌기 때문에 요청 스레드 하나만 보는 cProfile로는 잡히지 않는다.
+    def __init__(self, scope, root_frame, trigger: str, interval: float = PROFILE_INTERVAL_MS / 1000):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(4)}"
+        self.scope = scope
+        self.root_frame = root_frame
+        self.trigger = trigger
+        self.interval = interval
+        self.created_at = datetime.now(timezone.utc)
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._anchors: Optional[Set] = None
+        self._started = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _anchor_codes(self) -> Set:
+        # 라우팅이 끝나야 scope에 route가 생긴다. 핸들러/의존성 함수와 임베딩 함수가 스택에 있으면 이 요청의 작업으로 본다.
+        # 같은 라우트로 동시에 들어온 요청이나 배처에 함께 묶인 요청의 샘플도 섞일 수 있는 통계적 프로파일이다.
+        if self._anchors is not None:
+            return self._anchors
+
+        from services.face_pipeline import embed_faces
+
+        anchors = {embed_faces.__code__}
+        route = self.scope.get("route")
+        if route is None:
+            return anchors
+        _dependency_codes(getattr(route, "dependant", None), anchors)
+        self._anchors = anchors
+        return anchors
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            anchors = self._anchor_codes()
+            names = None
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+
+                stack = []
+                depth = None
+                while frame is not None:
+                    if frame is self.root_frame or frame.f_code in anchors:
+                        depth = len(stack) + 1
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                if depth is None:
+                    continue
+
+                if names is None:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                # 이벤트 루프/스레드풀 바깥쪽 프레임은 잘라 내고 스레드 이름을 뿌리로 둔다.
+                self._stacks[(names.get(ident, str(ident)),) + tuple(reversed(stack[:depth]))] += 1
+            self.samples += 1
+
+    def finish(self, status_code: int) -> dict:
+        duration = time.perf_counter() - self._started
+        self._stop.set()
+        self._thread.join()
+
+        labels: Dict = {}
+        folded: Counter = Counter()
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for (thread_name, *codes), count in self._stacks.items():
+            names = [labels.setdefault(code, _label(code)) for code in codes]
+            folded[";".join([f"[{thread_name}]"] + names)] += count
+            self_counts[names[-1]] += count
+            for name in set(names):
+                total_counts[name] += count
+
+        route = self.scope.get("route")
+        return {
+            "id": self.id,
+            "createdAt": self.created_at.isoformat(),
+            "method": self.scope["method"],
+            "path": self.scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status_code,
+            "trigger": self.trigger,
+            "durationMs": round(duration * 1000, 2),
+            "intervalMs": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "top": [
+                {"function": name, "self": self_counts[name], "total": total}
+                for name, total in total_counts.most_common(TOP_FUNCTIONS)
+            ],
+            "stacks": dict(folded.most_common()),
+        }
+
+
+class ProfileStore:
+    def __init__(self, directory: Path = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def _files(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        # 프로파일 ID가 생성 시각으로 시작하므로 이름순이 곧 최신순이다. stat()은 회전 중 삭제와 경합한다.
+        return sorted(self.directory.glob("*.json"), key=lambda path: path.stem, reverse=True)
+
+    def path(self, profile_id: str) -> Optional[Path]:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.json"
+        return path if path.exists() else None
+
+    def save(self, record: dict) -> Path:
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{record['id']}.json"
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(record, ensure_ascii=False))
+            os.replace(tmp_path, path)
+
+            # 오래된 프로파일부터 지워 디렉터리 크기를 일정하게 유지한다.
+            for old_path in self._files()[self.max_files:]:
+                old_path.unlink(missing_ok=True)
+        return path
+
+    def load(self, profile_id: str) -> Optional[dict]:
+        path = self.path(profile_id)
+        if path is None:
+            return None
+        return json.loads(path.read_text())
+
+    def list(self) -> List[dict]:
+        profiles = []
+        for path in self._files():
+            try:
+                record = json.loads(path.read_text())
+                size = path.stat().st_size
+            except (OSError, ValueError):
+                continue
+            record.pop("stacks", None)
+            record.pop("top", None)
+            record["sizeBytes"] = size
+            profiles.append(record)
+        return profiles
+
+
+def to_folded(record: dict) -> str:
+    # flamegraph.pl / speedscope에서 바로 열 수 있는 collapsed stack 형식
+    return "".join(f"{stack} {count}\n" for stack, count in record.get("stacks", {}).items())
+
+
+_store = ProfileStore()
+_active = 0
+_active_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    return _store
+
+
+def _acquire_slot() -> bool:
+    global _active
+
+    with _active_lock:
+        if _active >= PROFILE_MAX_CONCURRENT:
+            return False
+        _active += 1
+        return True
+
+
+def _release_slot() -> None:
+    global _active
+
+    with _active_lock:
+        _active -= 1
+
+
+def _is_admin_token(authorization: Optional[str]) -> bool:
+    from fastapi import HTTPException
+
+    from core.security import get_user_from_token
+
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return False
+    db = SessionLocal()
+    try:
+        return get_user_from_token(authorization.split(" ")[1], db).role == "admin"
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+
+class ProfilingMiddleware:
+    # 관리자가 헤더로 요청하거나 PROFILE_SAMPLE_RATE 비율로 뽑힌 요청만 프로파일링한다. 나머지 요청은 그대로 통과한다.
+    def __init__(self, app):
+        self.app = app
+
+    async def _trigger(self, scope) -> Optional[str]:
+        if scope["type"] != "http" or scope["path"].startswith(EXCLUDED_PATHS):
+            return None
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        if PROFILE_HEADER and headers.get(PROFILE_HEADER, "").lower() in ("1", "true", "yes"):
+            if await run_in_threadpool(_is_admin_token, headers.get("authorization")):
+                return "header"
+        if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        trigger = await self._trigger(scope)
+        if trigger is None or not _acquire_slot():
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope, sys._getframe(), trigger)
+        status_code = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile.id.encode("latin-1"))
+                ]
+            await send(message)
+
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            try:
+                record = await run_in_threadpool(profile.finish, status_code)
+                await run_in_threadpool(_store.save, record)
+            except Exception:
+                logger.exception("Error saving request profile")
+            finally:
+                _release_slot()
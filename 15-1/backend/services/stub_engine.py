@@ -0,0 +1,148 @@
+import threading
+import time
+from typing import Any, Callable, List
+
+import cv2
+import numpy as np
+
+from core.config import STUB_DETECT_LATENCY_MS, STUB_EMBED_LATENCY_MS, STUB_SEED
+from services.face_recognition import MODEL_NAME
+from services.inference_engine import FaceRegion, InferenceEngine
+
+EMBEDDING_DIM = 512
+# 이 크기로 줄인 회색조 얼굴을 랜덤 푸리에 특징으로 임베딩한다. 두 임베딩의 코사인 유사도는
+# 정규화된 특징 사이의 가우시안 커널 exp(-d^2 / 2σ^2)에 가까워서, 같은 프레임은 1, 다른 얼굴은 0 근처가 된다.
+FEATURE_SIZE = (16, 16)
+KERNEL_BANDWIDTH = 0.25
+# 밝기 변화가 거의 없는 프레임(빈 화면, 워밍업용 0 배열)은 얼굴이 없는 것으로 본다.
+MIN_FACE_CONTRAST = 4.0
+FACE_SIZE_RATIO = 0.4
+
+
+def parse_latency(spec: str, rng: np.random.Generator) -> Callable[[], float]:
+    # "15" (고정), "normal:15,3", "lognormal:15,0.5" (중앙값, sigma), "uniform:10,30", "exponential:15" (ms)
+    spec = (spec or "0").strip().lower()
+    kind, _, params = spec.partition(":")
+    if not params:
+        kind, params = "fixed", kind
+    try:
+        values = [float(value) for value in params.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid stub latency spec: {spec}")
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "normal" and len(values) == 2:
+        return lambda: max(0.0, rng.normal(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        return lambda: values[0] * float(np.exp(rng.normal(0.0, values[1])))
+    if kind == "uniform" and len(values) == 2:
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "exponential" and len(values) == 1:
+        return lambda: rng.exponential(values[0])
+    raise ValueError(f"Invalid stub latency spec: {spec}")
+
+
+class _Latency:
+    def __init__(self, spec: str, seed: int):
+        self._sample = parse_latency(spec, np.random.default_rng(seed))
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            delay_ms = self._sample()
+        if delay_ms > 0:
+            # 실제 모델처럼 GIL을 잡지 않고 기다린다.
+            time.sleep(delay_ms / 1000)
+
+
+class StubDetector:
+    def __init__(self, latency_spec: str = STUB_DETECT_LATENCY_MS, seed: int = STUB_SEED):
+        self.latency = _Latency(latency_spec, seed)
+
+    def detect_faces(self, img: np.ndarray) -> List[FaceRegion]:
+        self.latency.wait()
+
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+        thumbnail = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+        if float(thumbnail.std()) < MIN_FACE_CONTRAST:
+            return []
+
+        # 밝기 무게중심 근처에 얼굴 상자를 둔다. 같은 프레임이면 항상 같은 상자가 나온다.
+        height, width = gray.shape[:2]
+        weights = thumbnail - thumbnail.min()
+        total = float(weights.sum()) or 1.0
+        grid_y, grid_x = np.mgrid[0:32, 0:32]
+        center_x = float((weights * grid_x).sum()) / total / 31 * width
+        center_y = float((weights * grid_y).sum()) / total / 31 * height
+
+        size = int(min(width, height) * FACE_SIZE_RATIO)
+        x = int(np.clip(center_x - size / 2, 0, width - size))
+        y = int(np.clip(center_y - size / 2, 0, height - size))
+        left_eye = (x + int(size * 0.65), y + int(size * 0.38))
+        right_eye = (x + int(size * 0.35), y + int(size * 0.38))
+        confidence = 0.9 + 0.09 * min(1.0, float(thumbnail.std()) / 64)
+        return [FaceRegion(x, y, size, size, left_eye, right_eye, confidence)]
+
+
+class StubRecognizer:
+    def __init__(self, latency_spec: str = STUB_EMBED_LATENCY_MS, seed: int = STUB_SEED):
+        self.latency = _Latency(latency_spec, seed + 1)
+        rng = np.random.default_rng(seed)
+        features = FEATURE_SIZE[0] * FEATURE_SIZE[1]
+        self.projection = (rng.standard_normal((features, EMBEDDING_DIM)) / KERNEL_BANDWIDTH).astype(np.float32)
+        self.phase = rng.uniform(0, 2 * np.pi, EMBEDDING_DIM).astype(np.float32)
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        # 배치당 한 번 지연을 주므로 배처의 묶음 효과도 그대로 측정된다.
+        self.latency.wait()
+
+        features = np.empty((len(batch), FEATURE_SIZE[0] * FEATURE_SIZE[1]), dtype=np.float32)
+        for i, face in enumerate(batch):
+            gray = np.asarray(face, dtype=np.float32).mean(axis=2)
+            features[i] = cv2.resize(gray, FEATURE_SIZE, interpolation=cv2.INTER_AREA).ravel()
+        features -= features.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.cos((features / norms) @ self.projection + self.phase)
+
+
+def synthetic_face(seed: int, size: tuple[int, int] = (480, 640)) -> bytes:
+    # 실제 얼굴 사진 없이 벤치마크와 테스트에 쓰는 합성 프레임. seed가 같으면 같은 바이트가 나온다.
+    # 실제 검출기는 얼굴로 보지 않을 수 있으므로 벤치마크는 검출률을 함께 기록한다.
+    rng = np.random.default_rng(seed)
+    height, width = size
+    img = np.full((height, width, 3), rng.integers(60, 120, 3), dtype=np.uint8)
+    img = cv2.add(img, (rng.random((height, width, 3)) * 25).astype(np.uint8))
+
+    center = (width // 2 + int(rng.integers(-40, 40)), height // 2 + int(rng.integers(-30, 30)))
+    axes = (int(width * 0.14), int(height * 0.26))
+    skin = tuple(int(v) for v in rng.integers((120, 140, 170), (170, 190, 230)))
+    cv2.ellipse(img, center, axes, 0, 0, 360, skin, -1)
+    for dx in (-axes[0] // 2, axes[0] // 2):
+        eye = (center[0] + dx, center[1] - axes[1] // 4)
+        cv2.ellipse(img, eye, (axes[0] // 5, axes[1] // 12), 0, 0, 360, (255, 255, 255), -1)
+        cv2.circle(img, eye, axes[1] // 16, (40, 30, 20), -1)
+    cv2.ellipse(img, (center[0], center[1] + axes[1] // 2), (axes[0] // 3, axes[1] // 10), 0, 0, 180, (60, 60, 150), 3)
+    cv2.line(img, center, (center[0], center[1] + axes[1] // 4), tuple(v - 40 for v in skin), 2)
+    return cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+
+class StubEngine(InferenceEngine):
+    # TensorFlow/모델 가중치 없이 API, DB, 캐시 계층을 부하 테스트하기 위한 결정적 엔진.
+    name = "stub"
+    detector_name = "stub"
+    detection_border = 0.0
+    recognizer_name = f"{MODEL_NAME}-stub"
+
+    def ensure_available(self) -> None:
+        pass
+
+    def load_detector(self) -> Any:
+        return StubDetector()
+
+    def load_recognizer(self) -> Any:
+        return StubRecognizer()
+
+    def represent(self, recognizer: Any, batch: np.ndarray) -> np.ndarray:
+        return recognizer.forward(batch)
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.config import TEMPLATE_CACHE_ENABLED, TEMPLATE_CACHE_MAX_USERS, TEMPLATE_CACHE_TTL_SECONDS
+from core.models import FaceEmbedding, User
+from services.face_matching import FaceTemplates
+
+
+class TemplateCache:
+    # 사용자별 정규화된 템플릿 행렬을 (face_version, 만료 시각)과 함께 보관하는 LRU 캐시.
+    def __init__(self, max_users: int = TEMPLATE_CACHE_MAX_USERS, ttl: float = TEMPLATE_CACHE_TTL_SECONDS):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[int, float, FaceTemplates]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int, version: int) -> Optional[FaceTemplates]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            cached_version, expires_at, templates = entry
+            if cached_version != version:
+                # 다른 워커가 등록/삭제해 DB의 버전이 올라간 경우
+                self.stale += 1
+                del self._entries[user_id]
+                return None
+            if expires_at <= now:
+                self.expired += 1
+                del self._entries[user_id]
+                return None
+
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return templates
+
+    def put(self, user_id: int, version: int, templates: FaceTemplates) -> None:
+        with self._lock:
+            self._entries[user_id] = (version, time.monotonic() + self.ttl, templates)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.stale + self.expired
+            return {
+                "enabled": TEMPLATE_CACHE_ENABLED,
+                "users": len(self._entries),
+                "maxUsers": self.max_users,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hitRate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+_cache = TemplateCache()
+
+
+def get_template_cache() -> TemplateCache:
+    return _cache
+
+
+def get_user_templates(db: Session, user: User) -> FaceTemplates:
+    if TEMPLATE_CACHE_ENABLED:
+        templates = _cache.get(user.id, user.face_version)
+        if templates is not None:
+            return templates
+
+    # 버전은 사용자 행을 읽은 시점의 값으로 저장한다. 그 사이 템플릿이 바뀌면 버전이 올라가 다음 조회에서 다시 읽는다.
+    version = user.face_version
+    rows = db.query(FaceEmbedding.id, FaceEmbedding.embedding).filter(FaceEmbedding.user_id == user.id).all()
+    templates = FaceTemplates.from_rows(rows)
+    if TEMPLATE_CACHE_ENABLED:
+        _cache.put(user.id, version, templates)
+    return templates
+
+
+def invalidate_user_templates(user: User) -> None:
+    # 커밋 전에 호출해서 템플릿 변경과 버전 증가가 같은 트랜잭션에 들어가게 한다.
+    user.face_version = User.face_version + 1
+    _cache.invalidate(user.id)
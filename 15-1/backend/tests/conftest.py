@@ -0,0 +1,68 @@
+import base64
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from cryptography.fernet import Fernet
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# core.config는 import 시점에 환경 변수를 읽으므로 앱 모듈을 불러오기 전에 설정한다.
+# 모델 가중치 없이 돌도록 stub 엔진을 쓰고, DB와 업로드는 임시 디렉터리에 둔다.
+_DATA_DIR = Path(tempfile.mkdtemp(prefix="faceauth-test-"))
+os.environ.update({
+    "INFERENCE_ENGINE": "stub",
+    "INFERENCE_WORKERS": "0",
+    "DB_PATH": str(_DATA_DIR / "db" / "test.db"),
+    "UPLOAD_DIR": str(_DATA_DIR / "uploads"),
+    "PROFILE_DIR": str(_DATA_DIR / "profiles"),
+    "PROFILE_SAMPLE_RATE": "0",
+    "ENCRYPTION_KEY": Fernet.generate_key().decode(),
+})
+
+from services.stub_engine import synthetic_face  # noqa: E402
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def face_image(seed: int) -> str:
+    # stub 엔진에서 seed가 같으면 같은 얼굴(유사도 1), 다르면 다른 얼굴로 판정된다.
+    return base64.b64encode(synthetic_face(seed)).decode()
+
+
+def signup(client, user_id: str, role: str = "user") -> dict:
+    response = client.post(
+        "/auth/signup",
+        json={"organizationType": "test", "name": user_id, "userId": user_id, "password": "pass1234"},
+    )
+    assert response.status_code == 201, response.text
+
+    response = client.post("/auth/login", json={"userId": user_id, "password": "pass1234"})
+    assert response.status_code == 200, response.text
+
+    if role != "user":
+        # 관리자는 /auth/login으로 로그인할 수 없으므로 토큰을 받은 뒤 역할을 바꾼다. 역할은 요청마다 DB에서 다시 읽는다.
+        from core.database import SessionLocal
+        from core.models import User
+
+        with SessionLocal() as db:
+            db.query(User).filter(User.user_id == user_id).update({"role": role})
+            db.commit()
+
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
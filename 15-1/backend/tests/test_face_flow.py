@@ -0,0 +1,84 @@
+import routers.access
+from conftest import face_image, signup
+
+
+def test_register_verify_check_in_identify(client, monkeypatch):
+    headers = signup(client, "alice")
+    admin_headers = signup(client, "kiosk", role="admin")
+    image = face_image(1)
+
+    response = client.post("/face/register-base64", json={"image": image}, headers=headers)
+    assert response.status_code == 201, response.text
+
+    preview = client.post("/face/verify-preview", json={"image": image}, headers=headers).json()
+    assert preview["detected"] and preview["verified"]
+    assert preview["ticket"]
+
+    other = client.post("/face/verify-preview", json={"image": face_image(2)}, headers=headers).json()
+    assert other["detected"] and not other["verified"]
+    assert other["ticket"] is None
+
+    # 티켓이 있으면 같은 프레임은 추론 없이 체크인된다.
+    def fail_pipeline(*args, **kwargs):
+        raise AssertionError("check-in with a valid ticket must not run the pipeline")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(routers.access, "run_face_pipeline", fail_pipeline)
+        response = client.post(
+            "/access/check-in", json={"image": image, "ticket": preview["ticket"]}, headers=headers
+        )
+    assert response.status_code == 201, response.text
+    assert response.json()["similarity"] >= 0.70
+
+    response = client.post("/access/check-in", json={"image": image}, headers=headers)
+    assert response.status_code == 201, response.text
+
+    response = client.post("/access/check-in", json={"image": face_image(2)}, headers=headers)
+    assert response.status_code == 401
+
+    response = client.post("/access/identify", json={"image": image, "checkIn": False}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["identified"]
+    assert result["candidates"][0]["userName"] == "alice"
+    assert result["access"] is None
+
+    history = client.get("/access/history", headers=headers).json()
+    assert history["total"] == 2
+
+
+def test_ticket_for_another_frame_is_not_reused(client):
+    headers = signup(client, "bob")
+    image = face_image(3)
+    assert client.post("/face/register-base64", json={"image": image}, headers=headers).status_code == 201
+
+    ticket = client.post("/face/verify-preview", json={"image": image}, headers=headers).json()["ticket"]
+    response = client.post(
+        "/access/check-in", json={"image": face_image(4), "ticket": ticket}, headers=headers
+    )
+    assert response.status_code == 401
+
+
+def test_check_in_without_registered_face(client):
+    headers = signup(client, "carol")
+    response = client.post("/access/check-in", json={"image": face_image(5)}, headers=headers)
+    assert response.status_code == 404
+
+
+def test_identify_requires_admin(client):
+    headers = signup(client, "dave")
+    response = client.post("/access/identify", json={"image": face_image(1)}, headers=headers)
+    assert response.status_code == 403
+
+
+def test_empty_image_is_rejected(client):
+    headers = signup(client, "erin")
+    assert client.post("/face/register-base64", json={"image": face_image(6)}, headers=headers).status_code == 201
+
+    for path in ("/face/register-base64", "/face/verify-base64", "/access/check-in"):
+        response = client.post(path, json={"image": ""}, headers=headers)
+        assert response.status_code == 400, (path, response.text)
+
+    response = client.post("/face/verify-preview", json={"image": ""}, headers=headers)
+    assert response.status_code == 200
+    assert not response.json()["detected"]
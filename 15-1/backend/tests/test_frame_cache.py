@@ -0,0 +1,33 @@
+import base64
+
+import cv2
+import numpy as np
+
+import services.face_pipeline as face_pipeline
+from conftest import face_image
+from services.frame_cache import get_frame_cache
+
+
+def reencode(image: bytes) -> bytes:
+    img = cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_COLOR)
+    return cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+
+
+def test_perceptual_hit_never_serves_an_embedding(client, monkeypatch):
+    monkeypatch.setattr(face_pipeline, "FRAME_CACHE_PERCEPTUAL", True)
+    cache = get_frame_cache()
+    image = base64.b64decode(face_image(7))
+    similar = reencode(image)
+
+    assert face_pipeline.run_face_pipeline(image).embedding is not None
+
+    hits = cache.perceptual_hits
+    detected = face_pipeline.run_face_pipeline(similar, embed=False)
+    assert detected.detected
+    assert detected.embedding is None
+    assert cache.perceptual_hits == hits + 1
+
+    # 임베딩이 필요한 요청은 비슷한 프레임의 결과를 쓰지 않고 새로 계산한다.
+    embedded = face_pipeline.run_face_pipeline(similar)
+    assert embedded.embedding is not None
+    assert cache.perceptual_hits == hits + 1
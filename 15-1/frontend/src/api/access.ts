@@ -2,6 +2,7 @@ import apiClient from './client'
 
 export interface AccessRequest {
   image: string
+  ticket?: string | null
 }
 
 export interface AccessResponse {
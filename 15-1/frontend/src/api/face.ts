@@ -51,6 +51,7 @@ export interface FaceVerifyPreviewResponse {
   detected: boolean
   similarity: number
   verified: boolean
+  ticket?: string | null
 }
 
 export const verifyFacePreview = async (
@@ -59,8 +59,8 @@ export const AccessModal = ({ isOpen, onClose, onSuccess, webcamRef }: AccessMod
     isOpen,
     capturedImage,
     webcamRef,
-    onAutoCapture: (imageSrc) => {
-      handleAutoCapture(imageSrc)
+    onAutoCapture: (imageSrc, ticket) => {
+      handleAutoCapture(imageSrc, ticket)
       previewSimilarity(imageSrc)
     },
     verifyFn: (image) => verifyFacePreview({ image }),
@@ -9,6 +9,7 @@ interface UseAccessProps {
 
 export const useAccess = ({ onSuccess, onClose }: UseAccessProps) => {
   const [capturedImage, setCapturedImage] = useState<string | null>(null)
+  const [ticket, setTicket] = useState<string | null>(null)
   const [isChecking, setIsChecking] = useState(false)
 
   const handleCheckIn = useCallback(async () => {
@@ -17,36 +18,43 @@ export const useAccess = ({ onSuccess, onClose }: UseAccessProps) => {
     setIsChecking(true)
     try {
       const base64Image = capturedImage.split(',')[1]
-      await checkIn({ image: base64Image })
+      await checkIn({ image: base64Image, ticket })
       toast.success('출입 기록 완료', { description: '얼굴 인증이 성공적으로 완료되었습니다.' })
       onSuccess()
       onClose()
       setCapturedImage(null)
+      setTicket(null)
     } catch (error: any) {
       toast.error('출입 기록 실패', {
         description: error.response?.data?.detail || '얼굴 인증에 실패했습니다.',
       })
       setCapturedImage(null)
+      setTicket(null)
     } finally {
       setIsChecking(false)
     }
-  }, [capturedImage, onSuccess, onClose])
+  }, [capturedImage, ticket, onSuccess, onClose])
 
   const handleCapture = useCallback((imageSrc: string) => {
     setCapturedImage(imageSrc)
+    setTicket(null)
   }, [])
 
   const handleRetake = useCallback(() => {
     setCapturedImage(null)
+    setTicket(null)
   }, [])
 
-  const handleAutoCapture = useCallback((imageSrc: string) => {
+  const handleAutoCapture = useCallback((imageSrc: string, previewTicket?: string | null) => {
+    // 미리보기에서 통과한 프레임의 티켓을 같이 보내면 서버가 추론을 다시 하지 않는다.
     setCapturedImage(imageSrc)
+    setTicket(previewTicket ?? null)
     toast.success('얼굴이 감지되어 촬영되었습니다.', { duration: 2000 })
   }, [])
 
   const resetCapture = useCallback(() => {
     setCapturedImage(null)
+    setTicket(null)
   }, [])
 
   return {
@@ -6,10 +6,10 @@ interface UseFaceDetectionProps {
   capturedImage: string | null;
   isChecking?: boolean;
   webcamRef: React.RefObject<Webcam | null>;
-  onAutoCapture: (imageSrc: string) => void;
+  onAutoCapture: (imageSrc: string, ticket?: string | null) => void;
   verifyFn: (
     image: string
-  ) => Promise<{ similarity: number; verified: boolean; detected?: boolean }>;
+  ) => Promise<{ similarity: number; verified: boolean; detected?: boolean; ticket?: string | null }>;
 }
 
 export const useFaceDetection = ({
@@ -63,7 +63,7 @@ export const useFaceDetection = ({
 
           if (consecutiveDetectionsRef.current >= 2) {
             console.log("Auto capturing...");
-            onAutoCapture(imageSrc);
+            onAutoCapture(imageSrc, response.ticket);
             consecutiveDetectionsRef.current = 0;
           }
         } else {